@@ -6,9 +6,17 @@ Measures three workloads for each backend and prints jobs/second:
 * addBulk -- ``queue.addBulk`` in batches
 * process -- a worker draining a pre-filled queue
 
+The ``postgres-unlogged`` backend runs the PostgreSQL workloads after
+``set_schema_durability`` has made the schema's tables ``UNLOGGED``; compare
+the two with ``--backends postgres,postgres-unlogged``.
+
+With ``--wal`` it also reports, for PostgreSQL, the WAL written per processed
+job and the share of HOT ``job`` row updates while jobs outlive several lock
+renewals and report progress, with and without the ``hotJobUpdates`` layout.
+
 Usage::
 
-    python benchmark_backends.py [--jobs N] [--concurrency C] [--backends redis,postgres]
+    python benchmark_backends.py [--jobs N] [--concurrency C] [--backends redis,postgres] [--wal]
 
 PostgreSQL connection: BULLMQ_PG_URL (default ``host=localhost dbname=bullmq_test``).
 """
@@ -26,6 +34,10 @@ PG_OPTS = {"backend": "postgres", "connection": PG_URL, "schema": "bullmq"}
 
 BATCH = 1000
 
+# WAL workload: each job holds its lock for about three renewals.
+WAL_LOCK_DURATION = 1000
+WAL_CONCURRENCY = 100
+
 
 async def _reset(backend: str) -> None:
     if backend == "redis":
@@ -40,6 +52,13 @@ async def _reset(backend: str) -> None:
         conn = await psycopg.AsyncConnection.connect(PG_URL, autocommit=True)
         await conn.execute("DROP SCHEMA IF EXISTS bullmq CASCADE")
         await conn.close()
+        if backend == "postgres-unlogged":
+            from bullmq.backends.postgres_connection import run_migrations, set_schema_durability
+
+            conn = await psycopg.AsyncConnection.connect(PG_URL)
+            await run_migrations(conn)
+            await set_schema_durability(conn)
+            await conn.close()
 
 
 def _opts(backend: str) -> dict:
@@ -120,6 +139,79 @@ async def bench_process(backend: str, n: int, concurrency: int) -> float:
     return n / elapsed
 
 
+async def _pg_wal_sample(conn) -> tuple:
+    cur = await conn.execute(
+        "SELECT pg_current_wal_lsn(), "
+        "(SELECT n_tup_upd FROM pg_stat_user_tables WHERE schemaname = 'bullmq' AND relname = 'job'), "
+        "(SELECT n_tup_hot_upd FROM pg_stat_user_tables WHERE schemaname = 'bullmq' AND relname = 'job')"
+    )
+    return await cur.fetchone()
+
+
+async def bench_process_wal(opts: dict, n: int) -> tuple:
+    """WAL bytes per processed job and the HOT share of ``job`` updates."""
+    import psycopg
+
+    queue = Queue("bench_wal", opts)
+    for base in range(0, n, BATCH):
+        jobs = [
+            {"name": "job", "data": {"i": i}, "opts": {"removeOnComplete": True}}
+            for i in range(base, min(base + BATCH, n))
+        ]
+        await queue.addBulk(jobs)
+
+    conn = await psycopg.AsyncConnection.connect(PG_URL, autocommit=True)
+    await asyncio.sleep(1)  # let the adds' table statistics reach pg_stat
+    start_lsn, start_upd, start_hot = await _pg_wal_sample(conn)
+
+    done = asyncio.get_running_loop().create_future()
+    processed = [0]
+
+    async def process(job: Job, token: str):
+        for step in range(3):
+            await asyncio.sleep(WAL_LOCK_DURATION / 2000)
+            await job.updateProgress(step)
+        processed[0] += 1
+        if processed[0] == n and not done.done():
+            done.set_result(None)
+        return 1
+
+    worker = Worker(
+        "bench_wal",
+        process,
+        {
+            **opts,
+            "concurrency": WAL_CONCURRENCY,
+            "lockDuration": WAL_LOCK_DURATION,
+            "removeOnComplete": True,
+        },
+    )
+    await done
+    await worker.close()
+    await queue.close()
+
+    await asyncio.sleep(1)
+    end_lsn, end_upd, end_hot = await _pg_wal_sample(conn)
+    cur = await conn.execute("SELECT pg_wal_lsn_diff(%s, %s)", (end_lsn, start_lsn))
+    wal_bytes = (await cur.fetchone())[0]
+    await conn.close()
+    updates = (end_upd or 0) - (start_upd or 0)
+    hot = (end_hot or 0) - (start_hot or 0)
+    return float(wal_bytes) / n, (hot / updates if updates else 0.0)
+
+
+async def run_wal(n: int) -> None:
+    print(f"\nWAL per processed job (postgres, {n} jobs, lock renewals + progress)")
+    header = f"{'layout':<18}{'WAL/job':>14}{'HOT updates':>14}"
+    print(header)
+    print("-" * len(header))
+    for layout, extra in (("default", {}), ("hotJobUpdates", {"hotJobUpdates": True})):
+        await _reset("postgres")
+        per_job, hot_share = await bench_process_wal({**PG_OPTS, **extra}, n)
+        print(f"{layout:<18}{per_job:>12,.0f} B{hot_share:>13.0%}")
+    await _reset("postgres")
+
+
 async def run_backend(backend: str, jobs: int, parallelism: int, concurrencies: list) -> dict:
     results = {}
     await _reset(backend)
@@ -143,6 +235,10 @@ async def main() -> None:
     parser.add_argument("--parallelism", type=int, default=50,
                         help="number of concurrent adders for the parallel-add workload")
     parser.add_argument("--backends", default="redis,postgres")
+    parser.add_argument("--wal", action="store_true",
+                        help="also measure PostgreSQL WAL per job with and without hotJobUpdates")
+    parser.add_argument("--wal-jobs", type=int, default=500,
+                        help="jobs processed by each WAL measurement")
     args = parser.parse_args()
 
     backends = [b.strip() for b in args.backends.split(",") if b.strip()]
@@ -174,6 +270,9 @@ async def main() -> None:
             row += f"{c / a:>9.2f}x"
         print(row)
 
+    if args.wal and "postgres" in backends:
+        await run_wal(args.wal_jobs)
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -8,12 +8,14 @@ __author__ = 'Taskforce.sh Inc.'
 __credits__ = 'Taskforce.sh Inc.'
 
 from bullmq.queue import Queue
+from bullmq.queue_registry import QueueRegistry
 from bullmq.job import Job
 from bullmq.flow_producer import FlowProducer
 from bullmq.worker import Worker
 from bullmq.lock_manager import LockManager
 from bullmq.job_scheduler import JobScheduler
+from bullmq.metrics import MetricsTime, downsample_metrics
 from bullmq.abort_controller import AbortController, AbortSignal, AbortError
 from bullmq.queue_events import QueueEvents
 from bullmq.queue_events_producer import QueueEventsProducer
-from bullmq.custom_errors import WaitingChildrenError, UnrecoverableError
+from bullmq.custom_errors import WaitingChildrenError, UnrecoverableError, BulkAddError
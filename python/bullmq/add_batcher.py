@@ -0,0 +1,94 @@
+"""
+Producer-side coalescing of `Queue.add` calls.
+
+When a Queue is created with the `addBatching` option, every `add` enqueues its
+job here instead of issuing its own `addStandardJob` EVALSHA / `add_job`
+statement. The pending jobs are sent together through the backend's bulk path
+(`addJobsChunked` with a single chunk) as soon as `maxJobs` are waiting or
+`maxDelay` milliseconds have passed since the first of them, and each caller's
+future resolves with its own job id (or its own error).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from bullmq.backend import Backend
+    from bullmq.job import Job
+
+
+class AddBatcher:
+    def __init__(self, backend: "Backend", max_jobs: int = 100, max_delay: float = 1):
+        """
+        @param backend: The queue backend the batches are sent through.
+        @param max_jobs: Flush as soon as this many jobs are pending.
+        @param max_delay: Flush at most this many milliseconds (fractions
+                          allowed) after the first pending job was added.
+        """
+        self.backend = backend
+        self.max_jobs = max(max_jobs, 1)
+        self.max_delay = max_delay / 1000
+        self._pending: list[tuple["Job", asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def add(self, job: "Job") -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((job, future))
+        if len(self._pending) >= self.max_jobs:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: list[tuple["Job", asyncio.Future]]) -> None:
+        jobs = [job for job, _ in batch]
+        try:
+            results = await self.backend.addJobsChunked(jobs, len(jobs), 1)
+        except Exception as err:
+            results = [err] * len(jobs)
+
+        # A job that cannot be serialized (ValueError / TypeError) fails the
+        # whole batch before anything is sent, so retry each job on its own
+        # rather than failing every caller in the batch.
+        failure = results[0] if results else None
+        if (
+            len(jobs) > 1
+            and isinstance(failure, (ValueError, TypeError))
+            and all(result is failure for result in results)
+        ):
+            results = []
+            for job in jobs:
+                try:
+                    results.append(await self.backend.addJob(job))
+                except Exception as err:
+                    results.append(err)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """
+        Sends the jobs still pending and waits for every batch in flight.
+        """
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
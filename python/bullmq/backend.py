@@ -18,13 +18,15 @@ Design notes
 ------------
 * The interface intentionally exposes **no connection or transaction type**: a
   concrete adapter owns its connection(s). Callers never thread a connection or
-  transaction through an operation.
+  transaction through an operation; the one opening is :meth:`Backend.withConnection`,
+  which binds a sibling backend to a caller-owned connection (e.g. to enqueue
+  inside the caller's own PostgreSQL transaction).
 """
 
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterator, Callable, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bullmq.job import Job
@@ -68,6 +70,17 @@ class Backend(ABC):
         backend's underlying connection(s). Used by :class:`FlowProducer`.
         """
 
+    @abstractmethod
+    def withConnection(self, connection: Any) -> "Backend":
+        """Return a sibling backend for this queue that runs its operations on
+        the caller-owned ``connection`` (or transaction) instead of its own.
+
+        Used by ``Queue.add`` / ``Queue.addBulk`` to enqueue atomically with
+        the caller's own writes. Closing the sibling never closes
+        ``connection``. Backends that cannot join a caller's transaction raise
+        ``NotImplementedError``.
+        """
+
     @property
     @abstractmethod
     def minimumBlockTimeout(self) -> float:
@@ -115,6 +128,25 @@ class Backend(ABC):
     async def addJobs(self, jobs: list["Job"]) -> list[str]:
         """Add many jobs in a single efficient operation. Returns the ids, in order."""
 
+    @abstractmethod
+    async def addJobsChunked(
+        self, jobs: list["Job"], chunk_size: int, max_inflight_chunks: int = 1
+    ) -> list[Any]:
+        """Add many jobs as independent chunks, up to ``max_inflight_chunks``
+        at a time.
+
+        Returns one entry per job, in order: its id, or the exception that
+        prevented adding it. A failure never aborts the other chunks.
+        """
+
+    @abstractmethod
+    async def ingestJobs(self, jobs: list["Job"]) -> None:
+        """Enqueue one chunk of a streamed bulk import (``Queue.addBulkStream``).
+
+        Optimized for throughput: ids are not reported back, and the chunk is
+        not atomic with the other chunks of the stream.
+        """
+
     @abstractmethod
     async def addFlow(self, entries: list[dict]) -> list[str]:
         """Atomically insert a flow (tree) of jobs that may span multiple queues.
@@ -289,6 +321,14 @@ class Backend(ABC):
     async def getJobData(self, job_id: str) -> Optional[dict]:
         """Return the stored data for a job, or ``None`` if it is missing."""
 
+    @abstractmethod
+    async def getJobsByIds(self, job_ids: list[str]) -> list[Optional[dict]]:
+        """Return the stored data for many jobs in a single round trip.
+
+        The result is aligned with ``job_ids``: each entry has the same shape
+        as :meth:`getJobData`, or is ``None`` when that job is missing.
+        """
+
     @abstractmethod
     async def getJobLogs(
         self, job_id: str, start: int = 0, end: int = -1, asc: bool = True
@@ -303,6 +343,19 @@ class Backend(ABC):
     async def getCounts(self, types: list) -> list:
         """Return the job counts across the given states/types, in order."""
 
+    @abstractmethod
+    async def getCountsForQueues(self, queue_names: list, types: list) -> list:
+        """Return the job counts of several queues (sharing this backend's
+        prefix/schema) in one round trip: one list per queue, aligned with
+        ``queue_names``, holding the counts of ``types`` in order."""
+
+    @abstractmethod
+    def listQueues(self, prefix: Optional[str] = None, page_size: int = 1000) -> AsyncIterator[str]:
+        """Stream the names of the queues that exist under ``prefix`` (this
+        backend's prefix by default; PostgreSQL queues are namespaced by the
+        schema instead), fetching ``page_size`` names per round trip. The
+        order is unspecified."""
+
     @abstractmethod
     async def getCountsPerPriority(self, priorities: list) -> list:
         """Return the number of jobs per priority, in order."""
@@ -321,22 +374,74 @@ class Backend(ABC):
     async def isPaused(self) -> bool:
         """Return whether the queue is currently paused."""
 
+    @abstractmethod
+    async def getMetrics(self, type: str, start: int = 0, end: int = -1) -> list:
+        """Return ``[meta, data, points]`` for the ``type`` ("completed" or
+        "failed") metrics: meta is ``[count, prevTS, prevCount]``, data the
+        per-minute points in ``[start, end]`` (newest first) and points the
+        number of stored points."""
+
     @abstractmethod
     async def getClientList(self) -> list[str]:
         """Return the raw worker/client list(s) for the queue's datastore."""
 
+    @abstractmethod
+    async def publishCancellation(self, job_id: str, reason: Optional[str] = None) -> None:
+        """Broadcast a request to cancel the active job ``job_id`` to every
+        worker of the queue (best effort: workers not listening miss it)."""
+
+    @abstractmethod
+    def listenCancellations(self) -> AsyncIterator[tuple[str, Optional[str]]]:
+        """Stream the ``(job_id, reason)`` cancellation requests published for
+        the queue from now on, until the iteration is closed."""
+
+    @abstractmethod
+    async def publishHeartbeat(self, worker_id: str, info: dict, ttl: int) -> None:
+        """Publish (or refresh) a worker's heartbeat record, live for ``ttl``
+        milliseconds unless refreshed."""
+
+    @abstractmethod
+    async def removeHeartbeat(self, worker_id: str) -> None:
+        """Remove a worker's heartbeat record (the worker is closing)."""
+
+    @abstractmethod
+    async def getHeartbeats(self) -> list[dict]:
+        """Return the live heartbeat records of the queue's workers, each
+        with its ``expiresAt`` (epoch ms)."""
+
     # ============================================================
     # Queue metadata & maintenance keys
     # ============================================================
 
     @abstractmethod
-    async def trimEvents(self, max_length: int) -> Any:
-        """Trim the event stream to an approximate maximum length."""
+    async def trimEvents(self, max_length: Optional[int], max_age: Optional[int] = None) -> Any:
+        """Trim the event stream to an approximate maximum length and, when
+        ``max_age`` (milliseconds) is given, drop the events older than that.
+        Returns the number of events removed."""
 
     @abstractmethod
     async def removeDeprecatedPriorityKey(self) -> Any:
         """Remove the deprecated priority helper key."""
 
+    # ============================================================
+    # Event stream
+    # ============================================================
+
+    @abstractmethod
+    async def publishEvent(self, fields: dict, max_events: int) -> str:
+        """Append an event (``fields["event"]`` names it) to the queue's event
+        stream, keeping roughly ``max_events`` entries where the datastore
+        caps the stream per call. Returns the new entry's id."""
+
+    @abstractmethod
+    async def readEvents(self, event_id: str, block_timeout: int) -> Any:
+        """Block (up to ``block_timeout`` milliseconds) for event stream entries
+        newer than ``event_id`` (``"$"``: only entries added from now on).
+
+        Returns the ``XREAD`` shape ``[(stream, [(entry_id, fields), ...])]``,
+        or a falsy value on timeout.
+        """
+
     # ============================================================
     # Worker blocking primitive
     # ============================================================
@@ -348,6 +453,17 @@ class Backend(ABC):
         Returns the raw marker entry on success, or a falsy value on timeout.
         """
 
+    @abstractmethod
+    async def waitAndClaim(self, token: str, opts: dict, block_timeout: float) -> list:
+        """Block (up to ``block_timeout`` seconds) until a job can be claimed, and claim it.
+
+        Fuses :meth:`waitForJob` and :meth:`moveToActive`: returns the same
+        ``[job_data, job_id, limit_until, delay_until]`` list as
+        :meth:`moveToActive`, with no job data when the wait timed out.
+        Backends setting the ``canWaitAndClaim`` capability claim directly on
+        wake-up, which is what ``Worker`` uses this for.
+        """
+
     # ============================================================
     # Job schedulers (repeatable job factories)
     # ============================================================
@@ -17,30 +17,60 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import time
 from typing import Any, Optional, TYPE_CHECKING
 
 import psycopg
+from psycopg.types.json import Jsonb
 
 from bullmq.backend import Backend
-from bullmq.backends.postgres_connection import PostgresConnection
+from bullmq.backends.postgres_connection import (
+    CANCEL_CHANNEL,
+    EVENTS_CHANNEL,
+    JOB_CHANNEL,
+    CallerConnection,
+    NotificationSubscription,
+    PostgresConnection,
+)
 from bullmq.custom_errors import UnrecoverableError
-from bullmq.postgres import sql_loader
+from bullmq.job import DecodedJobData
+from bullmq.utils import send_in_chunks
 
 if TYPE_CHECKING:
     from bullmq.job import Job
 
+logger = logging.getLogger(__name__)
+
 minimum_block_timeout = 0.001
 
 # Job states stored as the enum value in job.state; the high-level
 # classes sometimes use Redis list names ("wait", "paused") that map here.
 _STATE_ALIASES = {"wait": "waiting", "paused": "waiting"}
 
+# Column types of the bulk staging table, in ``copy_bulk_stage.sql`` order.
+_BULK_STAGE_TYPES = [
+    "int8", "text", "text", "jsonb", "jsonb", "int4", "int8", "int8", "int4", "text", "bool",
+]
+
+# Max events fetched per readEvents round trip.
+_EVENT_READ_BATCH = 100
+
+# Max events deleted per trim_events statement.
+_EVENT_TRIM_BATCH = 1000
+
+# Seconds between two automatic trims of a queue's events by one backend (the
+# counterpart of XADD MAXLEN ~ on the Redis add path).
+_EVENT_TRIM_INTERVAL = 10.0
+
+# Seconds finished-job metrics are buffered before being written.
+_METRICS_FLUSH_INTERVAL = 1.0
+
 # List-backed states in Redis (returned newest-first; reversed for ascending).
 _LIST_STATES = frozenset({"wait", "waiting", "active", "paused"})
 
 # Capabilities reported to the worker (Postgres can block for arbitrary ms).
-_CAPABILITIES = {"canBlockFor1Ms": True, "canDoubleTimeout": True}
+_CAPABILITIES = {"canBlockFor1Ms": True, "canDoubleTimeout": True, "canWaitAndClaim": True}
 
 # SQLSTATE the PL/pgSQL operation functions raise on domain errors; the DETAIL
 # carries the negative error code shared with the Redis backend.
@@ -78,6 +108,15 @@ def _bm_error(code: int, command: str, job_id=None, parent_key=None, state=None)
     return TypeError(f"Unknown code {code} error for {job_id}. {command}")
 
 
+def _raise_bm_error(err: "psycopg.Error", op, job_id=None, parent_key=None, state=None) -> None:
+    """Re-raise a BullMQ error signalled by the SQL (SQLSTATE ``BM001``, code
+    in the detail) as the matching Redis-backend exception; otherwise return."""
+    if op and getattr(err, "sqlstate", None) == _BULLMQ_SQLSTATE:
+        detail = err.diag.message_detail if err.diag else None
+        code = int(detail) if detail else 0
+        raise _bm_error(code, op, job_id, parent_key, state) from None
+
+
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
@@ -101,6 +140,23 @@ def _opt_str(value: Any) -> Optional[str]:
     return None if value is None else str(value)
 
 
+def _counts_from_row(row: dict) -> dict:
+    """Per-state counts of a get_counts row, keyed like the Redis states."""
+    waiting = _to_int(row.get("waiting"))
+    is_paused = str(row.get("paused")) == "1"
+    return {
+        "active": _to_int(row.get("active")),
+        "completed": _to_int(row.get("completed")),
+        "failed": _to_int(row.get("failed")),
+        "delayed": _to_int(row.get("delayed")),
+        "wait": 0 if is_paused else waiting,
+        "waiting": 0 if is_paused else waiting,
+        "prioritized": _to_int(row.get("prioritized")),
+        "waiting-children": _to_int(row.get("waiting-children")),
+        "paused": waiting if is_paused else 0,
+    }
+
+
 def _to_int(value: Any) -> int:
     if value is None:
         return 0
@@ -116,21 +172,25 @@ def _to_int(value: Any) -> int:
         return 0
 
 
-def _row_to_job_map(row: dict) -> dict:
-    """Map a ``job`` row into the Redis-hash-shaped dict ``Job.fromJSON``
-    consumes (JSON-string values for the object fields, string values for the
-    rest; ``None`` fields are dropped)."""
+def _row_to_job_map(row: dict) -> DecodedJobData:
+    """Map a ``job`` row into the dict ``Job.fromJSON`` consumes (string values
+    for the scalar fields; ``None`` fields are dropped).
+
+    psycopg already decodes the ``jsonb`` columns, so the object fields are
+    handed over as Python values in a :class:`~bullmq.job.DecodedJobData`
+    rather than re-encoded to JSON strings that ``Job.fromJSON`` would parse
+    straight back."""
     parent_id = row.get("parent_id")
     parent = (
-        _json({"id": parent_id, "queueKey": row.get("parent_queue") or ""})
+        {"id": parent_id, "queueKey": row.get("parent_queue") or ""}
         if parent_id is not None
         else None
     )
     mapped = {
         "name": row.get("name"),
-        "data": _json(row.get("data") if row.get("data") is not None else {}),
-        "opts": _json(row.get("opts") if row.get("opts") is not None else {}),
-        "progress": _json(row.get("progress") if row.get("progress") is not None else 0),
+        "data": row.get("data") if row.get("data") is not None else {},
+        "opts": row.get("opts") if row.get("opts") is not None else {},
+        "progress": row.get("progress") if row.get("progress") is not None else 0,
         "attemptsMade": str(row.get("attempts_made") or 0),
         "ats": str(row.get("attempts_started") or 0),
         "stc": str(row.get("stalled_count") or 0),
@@ -140,8 +200,8 @@ def _row_to_job_map(row: dict) -> dict:
         "processedOn": _opt_str(row.get("processed_at_ms")),
         "finishedOn": _opt_str(row.get("finished_at_ms")),
         "failedReason": row.get("failed_reason"),
-        "stacktrace": _json(row.get("stacktrace") if row.get("stacktrace") is not None else []),
-        "returnvalue": _json(row.get("return_value")),
+        "stacktrace": row.get("stacktrace") if row.get("stacktrace") is not None else [],
+        "returnvalue": row.get("return_value"),
         "parentKey": row.get("parent_key"),
         "parent": parent,
         "processedBy": row.get("processed_by"),
@@ -149,7 +209,29 @@ def _row_to_job_map(row: dict) -> dict:
         "deid": row.get("dedup_id"),
         "defa": row.get("deferred_failure"),
     }
-    return {k: v for k, v in mapped.items() if v is not None}
+    return DecodedJobData((k, v) for k, v in mapped.items() if v is not None)
+
+
+def _no_job_result(signal: dict) -> list:
+    """The ``moveToActive`` result when nothing was claimed, built from a
+    ``next_signal`` row: the rate-limit ttl if limited, else the next
+    delayed-job time."""
+    ttl = _to_int(signal.get("rate_limit_ttl"))
+    if ttl > 0:
+        return [None, "", ttl, 0]
+    return [None, "", 0, _to_int(signal.get("next_delay"))]
+
+
+def _event_fields(row: dict) -> dict:
+    """Flatten an ``event`` row into the field map of a Redis stream entry.
+
+    Values the SQL stored as strings (including the JSON-encoded ``data`` of
+    progress events and ``returnvalue`` of completed ones) pass through; other
+    JSON values are encoded the way a stream would hold them."""
+    fields = {"event": row["event"]}
+    for key, value in (row.get("data") or {}).items():
+        fields[key] = value if isinstance(value, str) else json.dumps(value, separators=(",", ":"))
+    return fields
 
 
 def _normalize_keep(remove_on: Any) -> tuple[bool, Optional[int], Optional[int]]:
@@ -208,6 +290,77 @@ def _scheduler_row_to_hash(row: dict) -> tuple[dict, Optional[int]]:
     return (fields, next_millis)
 
 
+class _MetricsBuffer:
+    """Finished-job metrics of one backend, aggregated in memory.
+
+    Jobs finishing in the same minute add up into one pending bucket per
+    kind, written by a single ``collect_metrics_batch`` upsert at most
+    ``_METRICS_FLUSH_INTERVAL`` seconds later (or on close). A job from a new
+    minute flushes the bucket first, so every upsert covers one minute and the
+    data points match per-job collection. Writes are best effort: a failed
+    upsert is logged and its bucket discarded, since writing an older minute
+    after a newer one would misplace the data point.
+    """
+
+    def __init__(self, backend: "PostgresBackend"):
+        self.backend = backend
+        self._pending: dict[str, dict] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set[asyncio.Task] = set()
+        # Keeps the upserts of one backend in order.
+        self._lock = asyncio.Lock()
+
+    def record(self, kind: str, timestamp: int, max_data_points: int) -> None:
+        bucket = self._pending.get(kind)
+        if bucket is not None and bucket["minute"] != timestamp // 60000:
+            self.flush()
+            bucket = None
+        if bucket is None:
+            bucket = self._pending[kind] = {
+                "minute": timestamp // 60000, "timestamp": timestamp, "count": 0,
+            }
+        bucket["count"] += 1
+        bucket["maxDataPoints"] = max_data_points
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                _METRICS_FLUSH_INTERVAL, self.flush
+            )
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        buckets, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._send(buckets))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, buckets: dict) -> None:
+        async with self._lock:
+            for kind, bucket in buckets.items():
+                try:
+                    await self.backend._run(
+                        "collect_metrics_batch",
+                        [
+                            self.backend.queue_name, kind, bucket["maxDataPoints"],
+                            bucket["timestamp"], bucket["count"],
+                        ],
+                    )
+                except Exception:
+                    logger.warning(
+                        "BullMQ: dropped the %s metrics of %d job(s) of queue %s",
+                        kind, bucket["count"], self.backend.queue_name, exc_info=True,
+                    )
+
+    async def close(self) -> None:
+        """Writes the pending buckets and waits for every write in flight."""
+        self.flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+
 class PostgresBackend(Backend):
     """PostgreSQL adapter implementing :class:`~bullmq.backend.Backend`."""
 
@@ -216,21 +369,40 @@ class PostgresBackend(Backend):
         name: str,
         connection: PostgresConnection,
         owns_connection: bool = True,
+        event_retention: Optional[dict] = None,
     ):
         self.queue_name = name
         self.connection = connection
         self.owns_connection = owns_connection
+        # The queue's `streams.events` options ({maxLen, maxAge}); unset
+        # fields fall back to the queue's meta and built-in defaults.
+        self.event_retention = event_retention or {}
+        self._trimmed_at: Optional[float] = None
+        self._trim_task: Optional[asyncio.Task] = None
+        self._metrics = _MetricsBuffer(self)
         self.schema = connection.schema
+        # With the jobCounters storage layout, counts come from job_counter.
+        self._counters = "jobCounters" in getattr(connection, "storage_layout", {})
         self._ready = False
+        self._job_subscription: Optional[NotificationSubscription] = None
+        self._events_subscription: Optional[NotificationSubscription] = None
+        # The event id '$' resolved to, kept until a read returns entries so
+        # events published between two timed-out reads are not skipped.
+        self._events_tail: Optional[int] = None
 
     async def _run(self, command: str, params: list, *, op=None, job_id=None, parent_key=None, state=None):
         try:
-            return await self.connection.run(sql_loader.load_command(command), params)
+            return await self.connection.run_command(command, params)
         except psycopg.Error as err:
-            if op and getattr(err, "sqlstate", None) == _BULLMQ_SQLSTATE:
-                detail = err.diag.message_detail if err.diag else None
-                code = int(detail) if detail else 0
-                raise _bm_error(code, op, job_id, parent_key, state) from None
+            _raise_bm_error(err, op, job_id, parent_key, state)
+            raise
+
+    async def _run_pipeline(self, commands: list, *, op=None, job_id=None, parent_key=None, state=None):
+        """Like :meth:`_run` for several commands sharing one pipeline flush."""
+        try:
+            return await self.connection.run_pipeline(commands)
+        except psycopg.Error as err:
+            _raise_bm_error(err, op, job_id, parent_key, state)
             raise
 
     # ============================================================
@@ -242,6 +414,14 @@ class PostgresBackend(Backend):
         self._ready = True
 
     async def close(self, force: bool = False) -> None:
+        await self._metrics.close()
+        if self._trim_task is not None:
+            task, self._trim_task = self._trim_task, None
+            await asyncio.gather(task, return_exceptions=True)
+        for subscription in (self._job_subscription, self._events_subscription):
+            if subscription is not None:
+                self.connection.unsubscribe(subscription)
+        self._job_subscription = self._events_subscription = None
         if self.owns_connection:
             await self.connection.close()
 
@@ -253,7 +433,19 @@ class PostgresBackend(Backend):
 
     def forQueue(self, queue_name: str, prefix: Optional[str] = None) -> "PostgresBackend":
         _validate_prefix(prefix)
-        return PostgresBackend(queue_name, self.connection, owns_connection=False)
+        return PostgresBackend(
+            queue_name,
+            self.connection,
+            owns_connection=False,
+            event_retention=self.event_retention,
+        )
+
+    def withConnection(self, connection: Any) -> "PostgresBackend":
+        return PostgresBackend(
+            self.queue_name,
+            CallerConnection(connection, self.connection),
+            owns_connection=False,
+        )
 
     @property
     def minimumBlockTimeout(self) -> float:
@@ -348,6 +540,7 @@ class PostgresBackend(Backend):
             job_id=job.id,
             parent_key=getattr(job, "parentKey", None),
         )
+        self._trim_events_soon()
         return str(result.first_map()["id"])
 
     async def addJobs(self, jobs: list["Job"]) -> list[str]:
@@ -363,14 +556,45 @@ class PostgresBackend(Backend):
         ids = [str(row[0]) for row in result.rows]
         for index, job_id in enumerate(ids):
             jobs[index].id = job_id
+        self._trim_events_soon()
         return ids
 
+    async def addJobsChunked(
+        self, jobs: list["Job"], chunk_size: int, max_inflight_chunks: int = 1
+    ) -> list[Any]:
+        # Each chunk is its own add_jobs_bulk/add_flow transaction on a pooled
+        # connection; a failing chunk fails only its own jobs.
+        return await send_in_chunks(jobs, chunk_size, max_inflight_chunks, self.addJobs)
+
+    async def ingestJobs(self, jobs: list["Job"]) -> None:
+        entries = [self._batch_entry(job, False) for job in jobs]
+        if any(
+            e["parentId"] is not None or e["parentQueue"] is not None or e["dedupId"] is not None
+            for e in entries
+        ):
+            await self.addJobs(jobs)
+            return
+        rows = [
+            (
+                index, e["id"], e["name"], Jsonb(e["data"], _jsonb), Jsonb(e["opts"], _jsonb),
+                e["priority"], e["delay"], e["timestamp"], e["attempts"],
+                e["schedulerId"], bool(e["lifo"]),
+            )
+            for index, e in enumerate(entries)
+        ]
+        await self.connection.copy_and_run(
+            "create_bulk_stage", "copy_bulk_stage", _BULK_STAGE_TYPES, rows,
+            "add_jobs_staged", [self.queue_name],
+        )
+        self._trim_events_soon()
+
     async def addFlow(self, entries: list[dict]) -> list[str]:
         batch = [self._batch_entry(e["job"], e.get("is_parent", False)) for e in entries]
         result = await self._run("add_flow", [_jsonb(batch)], op="addJob")
         ids = [str(row[0]) for row in result.rows]
         for index, job_id in enumerate(ids):
             entries[index]["job"].id = job_id
+        self._trim_events_soon()
         return ids
 
     # ============================================================
@@ -386,10 +610,7 @@ class PostgresBackend(Backend):
             row = rows_maps[0]
             return [_row_to_job_map(row), str(row["id"]), 0, 0]
         sig = (await self._run("next_signal", [self.queue_name, limiter_max, now])).first_map() or {}
-        ttl = _to_int(sig.get("rate_limit_ttl"))
-        if ttl > 0:
-            return [None, "", ttl, 0]
-        return [None, "", 0, _to_int(sig.get("next_delay"))]
+        return _no_job_result(sig)
 
     async def moveToActive(self, token: str, opts: dict) -> list:
         lock_duration = opts.get("lockDuration", 30000)
@@ -413,25 +634,23 @@ class PostgresBackend(Backend):
             name = opts.get("name")
             limiter_max, limiter_duration = self._limiter(opts)
             now = _now_ms()
-            result = await self._run(
+            result = await self._run_finished(
                 "move_to_completed_fetch",
                 [
                     self.queue_name, job.id, token, _jsonb(_return_value(return_value)),
                     finished_on, remove_all, keep_age, keep_count,
                     lock_duration, now, name, limiter_max, limiter_duration,
                 ],
-                op="moveToFinished", job_id=job.id, state="active",
+                "completed", finished_on, opts, job.id,
             )
-            await self._collect_metrics("completed", finished_on, opts)
             nxt = await self._next_job_result(result.maps(), limiter_max, now)
             return {"result": nxt, "finishedOn": finished_on}
-        await self._run(
+        await self._run_finished(
             "move_to_completed",
             [self.queue_name, job.id, token, _jsonb(_return_value(return_value)),
              finished_on, remove_all, keep_age, keep_count],
-            op="moveToFinished", job_id=job.id, state="active",
+            "completed", finished_on, opts, job.id,
         )
-        await self._collect_metrics("completed", finished_on, opts)
         return {"result": None, "finishedOn": finished_on}
 
     async def moveToFailed(
@@ -449,41 +668,43 @@ class PostgresBackend(Backend):
             name = opts.get("name")
             limiter_max, limiter_duration = self._limiter(opts)
             now = _now_ms()
-            result = await self._run(
+            result = await self._run_finished(
                 "move_to_failed_fetch",
                 [
                     self.queue_name, job.id, token, reason,
                     stacktrace, finished_on, remove_all, keep_age, keep_count,
                     lock_duration, now, name, limiter_max, limiter_duration,
                 ],
-                op="moveToFinished", job_id=job.id, state="active",
+                "failed", finished_on, opts, job.id,
             )
-            await self._collect_metrics("failed", finished_on, opts)
             nxt = await self._next_job_result(result.maps(), limiter_max, now)
             return {"result": nxt, "finishedOn": finished_on}
-        await self._run(
+        await self._run_finished(
             "move_to_failed",
             [self.queue_name, job.id, token, reason, stacktrace,
              finished_on, remove_all, keep_age, keep_count],
-            op="moveToFinished", job_id=job.id, state="active",
+            "failed", finished_on, opts, job.id,
         )
-        await self._collect_metrics("failed", finished_on, opts)
         return {"result": None, "finishedOn": finished_on}
 
-    async def _collect_metrics(self, kind: str, timestamp: int, opts: dict) -> None:
-        # Metrics are only tracked when configured (mirrors the Redis backend,
-        # which skips collection when no ``metrics.maxDataPoints`` is set), so
-        # the common path avoids an extra round-trip per finished job.
+    async def _run_finished(
+        self, command: str, params: list, kind: str, timestamp: int, opts: dict, job_id: str
+    ):
+        """Run a finishing transition, count it in the queue's metrics and
+        trim the queue's events in the background.
+
+        Metrics are only tracked when configured (mirrors the Redis backend,
+        which skips collection when no ``metrics.maxDataPoints`` is set). They
+        are buffered and written once per minute bucket and flush interval.
+        """
+        result = await self._run(
+            command, params, op="moveToFinished", job_id=job_id, state="active"
+        )
+        self._trim_events_soon()
         metrics = (opts or {}).get("metrics")
-        if not metrics:
-            return
-        max_data_points = metrics.get("maxDataPoints", 0) or 0
-        try:
-            await self._run(
-                "collect_metrics", [self.queue_name, kind, max_data_points, timestamp]
-            )
-        except Exception:
-            pass
+        if metrics:
+            self._metrics.record(kind, timestamp, metrics.get("maxDataPoints", 0) or 0)
+        return result
 
     async def moveToDelayed(
         self, job_id: str, timestamp: int, delay: int, token: str = "0", opts: dict = {}
@@ -623,12 +844,17 @@ class PostgresBackend(Backend):
         return None
 
     async def addLog(self, job_id: str, log_row: str, keep_logs: int = 0) -> int:
-        row = (await self._run("add_log", [self.queue_name, job_id, log_row])).first_map() or {}
-        count = _to_int(row.get("idx")) + 1
-        if keep_logs and count > keep_logs:
-            await self._run("trim_logs", [self.queue_name, job_id, count - keep_logs])
-            return keep_logs
-        return count
+        if not keep_logs:
+            row = (await self._run("add_log", [self.queue_name, job_id, log_row])).first_map() or {}
+            return _to_int(row.get("idx")) + 1
+        added, _ = await self._run_pipeline(
+            [
+                ("add_log", [self.queue_name, job_id, log_row]),
+                ("trim_logs_keep_last", [self.queue_name, job_id, keep_logs]),
+            ]
+        )
+        row = added.first_map() or {}
+        return min(_to_int(row.get("idx")) + 1, keep_logs)
 
     # ============================================================
     # Queue / job queries
@@ -653,6 +879,17 @@ class PostgresBackend(Backend):
             return None
         return _row_to_job_map(row)
 
+    async def getJobsByIds(self, job_ids: list[str]) -> list[Optional[dict]]:
+        if not job_ids:
+            return []
+        ids = [str(job_id) for job_id in job_ids]
+        result = await self._run("get_jobs_data", [self.queue_name, ids])
+        by_id = {str(row["id"]): row for row in result.maps()}
+        return [
+            _row_to_job_map(by_id[job_id]) if job_id in by_id else None
+            for job_id in ids
+        ]
+
     async def getJobLogs(self, job_id: str, start: int = 0, end: int = -1, asc: bool = True) -> dict:
         count = _to_int((await self._run("get_job_logs_count", [self.queue_name, job_id])).first_map().get("count"))
         frm = max(count + start, 0) if start < 0 else start
@@ -673,23 +910,36 @@ class PostgresBackend(Backend):
         return [lookup.get("wait" if t == "waiting" else t, 0) for t in types]
 
     async def _count_lookup(self) -> dict:
-        row = (await self._run("get_counts", [self.queue_name])).first_map() or {}
-        waiting = _to_int(row.get("waiting"))
-        is_paused = str(row.get("paused")) == "1"
-        return {
-            "active": _to_int(row.get("active")),
-            "completed": _to_int(row.get("completed")),
-            "failed": _to_int(row.get("failed")),
-            "delayed": _to_int(row.get("delayed")),
-            "wait": 0 if is_paused else waiting,
-            "waiting": 0 if is_paused else waiting,
-            "prioritized": _to_int(row.get("prioritized")),
-            "waiting-children": _to_int(row.get("waiting-children")),
-            "paused": waiting if is_paused else 0,
-        }
+        command = "get_counter_counts" if self._counters else "get_counts"
+        row = (await self._run(command, [self.queue_name])).first_map() or {}
+        return _counts_from_row(row)
+
+    async def getCountsForQueues(self, queue_names: list, types: list) -> list:
+        if not queue_names:
+            return []
+        command = "get_counter_counts_for_queues" if self._counters else "get_counts_for_queues"
+        result = await self._run(command, [list(queue_names)])
+        lookups = {m["queue"]: _counts_from_row(m) for m in result.maps()}
+        return [
+            [lookups.get(name, {}).get("wait" if t == "waiting" else t, 0) for t in types]
+            for name in queue_names
+        ]
+
+    async def listQueues(self, prefix: Optional[str] = None, page_size: int = 1000):
+        # Queues are namespaced by the schema; `prefix` has no meaning here.
+        after = ""
+        while True:
+            result = await self._run("list_queues", [after, page_size])
+            names = [m["queue"] for m in result.maps()]
+            for name in names:
+                yield name
+            if len(names) < page_size:
+                return
+            after = names[-1]
 
     async def getCountsPerPriority(self, priorities: list) -> list:
-        result = await self._run("get_counts_per_priority", [self.queue_name, list(priorities)])
+        command = "get_counter_counts_per_priority" if self._counters else "get_counts_per_priority"
+        result = await self._run(command, [self.queue_name, list(priorities)])
         return [_to_int(m.get("cnt")) for m in result.maps()]
 
     async def getRanges(self, types: list, start: int = 0, end: int = 1, asc: bool = False) -> list:
@@ -718,6 +968,48 @@ class PostgresBackend(Backend):
         row = (await self._run("get_queue_meta_field", [self.queue_name, "paused"])).first_map()
         return bool(row) and str(row.get("value")) == "1"
 
+    async def publishCancellation(self, job_id: str, reason: Optional[str] = None) -> None:
+        await self._run("cancel_job", [self.queue_name, job_id, reason])
+
+    async def listenCancellations(self):
+        # Rides on the process-wide LISTEN session; requests for the schema's
+        # other queues are skipped here.
+        subscription = await self.connection.subscribe(CANCEL_CHANNEL, keep_payloads=True)
+        try:
+            while True:
+                await subscription.wait(None)
+                for payload in subscription.take_payloads():
+                    request = json.loads(payload)
+                    if request.get("queue") == self.queue_name:
+                        yield request["jobId"], request.get("reason")
+        finally:
+            self.connection.unsubscribe(subscription)
+
+    async def publishHeartbeat(self, worker_id: str, info: dict, ttl: int) -> None:
+        now = _now_ms()
+        record = dict(info, expiresAt=now + ttl)
+        await self._run(
+            "worker_heartbeat", [self.queue_name, worker_id, now + ttl, _jsonb(record), now]
+        )
+
+    async def removeHeartbeat(self, worker_id: str) -> None:
+        await self._run("remove_worker_heartbeat", [self.queue_name, worker_id])
+
+    async def getHeartbeats(self) -> list[dict]:
+        try:
+            result = await self._run("get_worker_heartbeats", [self.queue_name, _now_ms()])
+        except psycopg.errors.UndefinedTable:
+            # No connection to this schema enabled the `workerRegistry`
+            # layout yet, so no worker has published a heartbeat.
+            return []
+        return [m["info"] for m in result.maps()]
+
+    async def getMetrics(self, type: str, start: int = 0, end: int = -1) -> list:
+        row = (await self._run("get_metrics", [self.queue_name, type, start, end])).first_map() or {}
+        meta = [_to_int(row.get("total")), _to_int(row.get("prev_ts")), _to_int(row.get("prev_count"))]
+        data = [_to_int(point) for point in row.get("data") or []]
+        return [meta, data, _to_int(row.get("points"))]
+
     async def getClientList(self) -> list[str]:
         result = await self._run("get_client_list", [])
         lines = "\n".join(f"name={m['application_name']}" for m in result.maps())
@@ -727,16 +1019,118 @@ class PostgresBackend(Backend):
     # Queue metadata & maintenance keys
     # ============================================================
 
-    async def trimEvents(self, max_length: int) -> Any:
-        return None
+    async def trimEvents(self, max_length: Optional[int], max_age: Optional[int] = None) -> Any:
+        """Delete the queue's events beyond ``max_length`` (``None``: the
+        queue's ``opts.maxLenEvents`` meta field, else 10000) and, with
+        ``max_age``, those older than that many milliseconds.
+
+        The length cutoff is resolved once, then the events below it are
+        deleted in a series of bounded ``trim_events`` batches, each its own
+        short statement, so trimming a large backlog never holds locks on
+        the event table for long.
+        """
+        min_created_at = _now_ms() - max_age if max_age else None
+        cutoff = await self._run("get_event_trim_cutoff", [self.queue_name, max_length])
+        max_id = cutoff.rows[0][0] if cutoff.rows else None
+        if max_id is None and min_created_at is None:
+            return 0
+        deleted = 0
+        while True:
+            result = await self._run(
+                "trim_events", [self.queue_name, max_id, min_created_at, _EVENT_TRIM_BATCH]
+            )
+            deleted += result.rowcount
+            if result.rowcount < _EVENT_TRIM_BATCH:
+                return deleted
+
+    def _trim_events_soon(self) -> None:
+        """Start a background trim of the queue's events, unless one ran in
+        the last ``_EVENT_TRIM_INTERVAL`` seconds; one at a time per backend.
+
+        Called whenever the backend writes jobs (and so events), so even a
+        short-lived producer trims once.
+        """
+        if isinstance(self.connection, CallerConnection):
+            # Never run background statements on a caller's transaction.
+            return
+        if self._trim_task is not None and not self._trim_task.done():
+            return
+        now = time.monotonic()
+        if self._trimmed_at is not None and now - self._trimmed_at < _EVENT_TRIM_INTERVAL:
+            return
+        self._trimmed_at = now
+        self._trim_task = asyncio.ensure_future(self._auto_trim_events())
+
+    async def _auto_trim_events(self) -> None:
+        try:
+            await self.trimEvents(
+                self.event_retention.get("maxLen"), self.event_retention.get("maxAge")
+            )
+            # With eventPartitions, also roll the partitions forward and drop
+            # the expired ones (throttled per connection).
+            await self.connection.maintain_storage()
+        except Exception:
+            # The next interval retries; publish_event keeps its own coarse
+            # cap meanwhile.
+            logger.warning(
+                "BullMQ: could not trim the events of queue %s", self.queue_name, exc_info=True
+            )
 
     async def removeDeprecatedPriorityKey(self) -> Any:
         return None
 
+    # ============================================================
+    # Event stream
+    # ============================================================
+
+    async def publishEvent(self, fields: dict, max_events: int) -> str:
+        # The event table is trimmed by publish_event itself, to the queue's
+        # opts.maxLenEvents, so max_events has no per-call meaning here.
+        data = {k: v for k, v in fields.items() if k != "event"}
+        result = await self._run("publish_event", [self.queue_name, fields.get("event"), _jsonb(data)])
+        return str((result.first_map() or {}).get("id"))
+
+    async def readEvents(self, event_id: str, block_timeout: int) -> Any:
+        """Read events newer than ``event_id`` from the ``event`` table.
+
+        When none are pending, sleeps on the queue's ``bullmq_events``
+        subscription and reads again once woken or after ``block_timeout``
+        milliseconds. The re-read on timeout also picks up events whose
+        NOTIFY ``publish_event`` coalesced away under concurrency.
+        """
+        if self._events_subscription is None:
+            self._events_subscription = await self.connection.subscribe(EVENTS_CHANNEL, self.queue_name)
+        if event_id != "$":
+            cursor = _to_int(event_id)
+        elif self._events_tail is not None:
+            cursor = self._events_tail
+        else:
+            row = (await self._run("read_events_max", [self.queue_name])).first_map() or {}
+            cursor = self._events_tail = _to_int(row.get("max"))
+
+        rows = await self._read_events(cursor)
+        if not rows:
+            await self._events_subscription.wait(max(block_timeout or 5000, 1) / 1000)
+            rows = await self._read_events(cursor)
+        if not rows:
+            return None
+        self._events_tail = None
+        return [("events", [(str(row["id"]), _event_fields(row)) for row in rows])]
+
+    async def _read_events(self, cursor: int) -> list[dict]:
+        result = await self._run("read_events", [self.queue_name, cursor, _EVENT_READ_BATCH])
+        return result.maps()
+
     # ============================================================
     # Worker blocking primitive
     # ============================================================
 
+    async def _job_notifications(self) -> NotificationSubscription:
+        """This queue's subscription to the shared job channel, made on first use."""
+        if self._job_subscription is None:
+            self._job_subscription = await self.connection.subscribe(JOB_CHANNEL, self.queue_name)
+        return self._job_subscription
+
     async def _has_waiting_job(self) -> bool:
         row = (await self._run("has_waiting_job", [self.queue_name])).first_map() or {}
         return bool(row.get("present"))
@@ -754,7 +1148,7 @@ class PostgresBackend(Backend):
         expires first, returns the same marker with a future score timestamp
         so ``Worker`` can keep sleeping until the next due time.
         """
-        listen_conn = await self.connection.ensure_job_channel()
+        jobs = await self._job_notifications()
 
         marker = ["bullmq_jobs", self.queue_name, 0]
         if await self._has_waiting_job():
@@ -768,10 +1162,12 @@ class PostgresBackend(Backend):
             base_ms = min(due_in, base_ms)
 
         deadline = time.monotonic() + base_ms / 1000
-        # A NOTIFY on the shared channel wakes us instantly; a short poll of the
-        # claimable-job probe is a robust fallback (delivery of a NOTIFY that
-        # fires between waits is not guaranteed to reach a blocked reader).
-        poll = 0.25
+        # The subscription stays registered between waits, so a NOTIFY sent
+        # while we were busy is latched and seen by the next wait. Only a
+        # NOTIFY for this queue (or the hub re-establishing its connection,
+        # after which notifications may have been missed) triggers a probe;
+        # other queues' payloads and plain timeouts cost no query, so an idle
+        # worker puts no load on the server.
         while True:
             remaining = deadline - time.monotonic()
             if remaining <= 0:
@@ -781,21 +1177,35 @@ class PostgresBackend(Backend):
                         return marker
                     return ["bullmq_jobs", self.queue_name, _now_ms() + due_in]
                 return None
-            wait = min(poll, remaining)
-            checked_waiting_job = False
-            try:
-                async for notify in listen_conn.notifies(timeout=wait, stop_after=1):
-                    payload = notify.payload
-                    if payload == self.queue_name:
-                        checked_waiting_job = True
-                        if await self._has_waiting_job():
-                            return marker
-            except psycopg.Error:
-                await self.connection.reset_job_channel()
-                listen_conn = await self.connection.ensure_job_channel()
-            if not checked_waiting_job and await self._has_waiting_job():
+            if await jobs.wait(remaining) and await self._has_waiting_job():
                 return marker
 
+    async def waitAndClaim(self, token: str, opts: dict, block_timeout: float) -> list:
+        """Wait for claimable work and claim it in the same step.
+
+        Every wake-up (the initial check, a NOTIFY for this queue, a reconnect
+        and the end of the wait window) goes straight to a ``SKIP LOCKED``
+        claim instead of probing ``has_waiting_job`` first. When many workers
+        wake for a single job the winner returns it, and the others find
+        nothing to claim and go back to waiting without any further query.
+        """
+        jobs = await self._job_notifications()
+
+        deadline = _now_ms() + max(round(block_timeout * 1000), 1)
+        while True:
+            result = await self.moveToActive(token, opts)
+            job_data, _job_id, limit_until, delay_until = result
+            if job_data or limit_until > 0:
+                return result
+
+            # Due delayed jobs are promoted by the claim itself, so waking at
+            # the next due time is enough to pick them up.
+            wake_at = min(deadline, delay_until) if delay_until else deadline
+            remaining = (wake_at - _now_ms()) / 1000
+            if remaining <= 0:
+                return result
+            await jobs.wait(remaining)
+
     # ============================================================
     # Job schedulers (repeatable job factories)
     # ============================================================
@@ -922,7 +1332,8 @@ def create_postgres_backend(
     """Backend factory: build a :class:`PostgresBackend` for ``name``."""
     _validate_prefix(opts.get("prefix"))
     connection = PostgresConnection(opts)
-    return PostgresBackend(name, connection)
+    event_retention = (opts.get("streams") or {}).get("events")
+    return PostgresBackend(name, connection, event_retention=event_retention)
 
 
 def _return_value(value: Any) -> Any:
@@ -2,25 +2,55 @@
 
 Owns:
 
-* an async connection used for regular queries (serialized behind a lock), and
-* a dedicated, long-lived ``LISTEN`` connection used by the blocking
-  "wait for job" primitive (lazily established).
+* a ``psycopg_pool`` connection pool used for regular queries (shared by every
+  backend derived through ``forQueue``), and
+* a subscription to the process-wide :class:`NotificationHub`, the single
+  ``LISTEN`` connection per conninfo and schema that wakes the blocking
+  "wait for job" primitive of every backend in the process (lazily
+  established).
 
 The connection-level ``schema`` is the namespace for all queues (the SQL-native
 replacement for the Redis key ``prefix``). It is pinned on every connection's
 ``search_path`` so the ``.sql`` command files reference unqualified, portable
 names.
+
+The first connection to a conninfo and schema in a process probes the
+migration ledger without locking; only a pending migration (or a storage
+layout to apply) takes the advisory lock and a dedicated session. Later
+connections to the same schema skip the step entirely.
+
+The pool is sized by the optional ``pool`` option (``minSize``, ``maxSize`` and
+``maxIdle``, the latter in seconds). Bundled commands run as server-side
+prepared statements unless ``prepareStatements`` is ``False`` (e.g. behind a
+transaction-pooling PgBouncer). ``eventPartitions``, ``hotJobUpdates``,
+``jobCounters`` and ``workerRegistry`` opt into the storage layouts described
+in :mod:`.postgres_storage`. Making the tables ``UNLOGGED`` is
+an explicit step, :func:`set_schema_durability`, never run on connect.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import re
-from typing import Any, Optional
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, TypeVar
 
 import psycopg
+from psycopg.sql import SQL, Identifier
 from psycopg.conninfo import make_conninfo
-
+from psycopg.pq import TransactionStatus
+from psycopg_pool import AsyncConnectionPool, PoolClosed
+
+from bullmq.backends.postgres_storage import (
+    apply_layout,
+    durability_option,
+    maintain_event_partitions,
+    set_durability,
+    storage_layout,
+)
 from bullmq.postgres import sql_loader
 
 DEFAULT_SCHEMA = "bullmq"
@@ -32,28 +62,70 @@ MIGRATION_ADVISORY_LOCK_KEY = 0x42554C4C  # 1112493644
 # Lowest supported PostgreSQL major version.
 MINIMUM_POSTGRES_VERSION = 13
 
-# The shared ``.sql`` command files use native ``$1`` numbered placeholders;
-# psycopg binds ``%s``. This rewrites ``$N`` to ``%s`` (preserving occurrence
-# order and repeats) and escapes any literal ``%``.
-_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+# Query pool sizing defaults (overridable through the ``pool`` option).
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_POOL_MAX_IDLE = 600.0
+
+# Upper bound on server-side prepared statements kept per pooled connection;
+# comfortably above the number of bundled commands.
+PREPARED_STATEMENTS_MAX = 256
+
+# NOTIFY channel the job-producing SQL functions signal, with the queue name as
+# payload.
+JOB_CHANNEL = "bullmq_jobs"
+
+# NOTIFY channel ``publish_event`` signals, with the queue name as payload.
+EVENTS_CHANNEL = "bullmq_events"
+
+# NOTIFY channel ``cancel_job`` signals, with a JSON ``{queue, jobId, reason}``
+# payload.
+CANCEL_CHANNEL = "bullmq_cancel"
+
+# Seconds between attempts to re-establish a dropped LISTEN connection.
+LISTEN_RECONNECT_DELAY = 1.0
+
+# Minimum seconds between two storage maintenance passes of one connection.
+STORAGE_MAINTENANCE_INTERVAL = 60.0
 
-# ``--`` line comments (the command files describe their ``$N`` params in a
-# header comment, which must not be mistaken for real placeholders).
-_LINE_COMMENT_RE = re.compile(r"--[^\n]*")
+# (conninfo, schema, storage layout) combinations this process has seen at
+# the latest migration with their layout applied. Connections to them skip the
+# migration step entirely.
+_CURRENT_SCHEMAS: set[tuple[str, str, str]] = set()
+
+# Errors of a statement that may have run against a schema dropped since it
+# was cached as current. Only InvalidSchemaName says so for sure; the others
+# are also raised by genuine mistakes, so they count only once a probe finds
+# the migration ledger gone.
+_MISSING_SCHEMA_ERRORS = (
+    psycopg.errors.InvalidSchemaName,
+    psycopg.errors.UndefinedTable,
+    psycopg.errors.UndefinedFunction,
+)
+
+T = TypeVar("T")
 
 
 def _to_pyformat(sql: str, params: list) -> tuple[str, list]:
-    sql = _LINE_COMMENT_RE.sub("", sql)
-    out: list[str] = []
-    new_params: list = []
-    last = 0
-    for match in _PLACEHOLDER_RE.finditer(sql):
-        out.append(sql[last:match.start()].replace("%", "%%"))
-        out.append("%s")
-        new_params.append(params[int(match.group(1)) - 1])
-        last = match.end()
-    out.append(sql[last:].replace("%", "%%"))
-    return "".join(out), new_params
+    query, order = sql_loader.to_pyformat(sql)
+    if order is None:
+        return query, list(params)
+    return query, [params[index] for index in order]
+
+
+def _bind_command(name: str, params: list) -> tuple[str, list]:
+    query, order = sql_loader.load_pyformat_command(name)
+    if order is None:
+        return query, params
+    return query, [params[index] for index in order]
+
+
+async def _read_result(cur: "psycopg.AsyncCursor") -> "PgResult":
+    if cur.description:
+        columns = [d.name for d in cur.description]
+        rows = await cur.fetchall()
+        return PgResult(columns, rows, cur.rowcount)
+    return PgResult([], [], cur.rowcount)
 
 
 class UnsupportedPostgresVersionError(Exception):
@@ -92,6 +164,37 @@ def quote_schema_name(schema: str) -> str:
     return f'"{schema}"'
 
 
+def _check_server_version(server_num: int) -> None:
+    major = server_num // 10000
+    if major < MINIMUM_POSTGRES_VERSION:
+        raise UnsupportedPostgresVersionError(
+            f"BullMQ: the PostgreSQL backend requires server version "
+            f"{MINIMUM_POSTGRES_VERSION} or newer (server reports major {major})."
+        )
+
+
+async def probe_schema_version(
+    conn: "psycopg.AsyncConnection", schema: str = DEFAULT_SCHEMA, skip_version_check: bool = False
+) -> int:
+    """Read the migration version of ``schema`` without taking any lock.
+
+    Returns 0 when the schema or its migration ledger does not exist yet.
+    Also checks the server version unless ``skip_version_check``.
+    """
+    quoted = quote_schema_name(schema)
+    cur = await conn.execute(
+        "SELECT current_setting('server_version_num')::int, to_regclass(%s) IS NOT NULL",
+        (f"{quoted}.migration",),
+    )
+    server_num, has_ledger = await cur.fetchone()
+    if not skip_version_check:
+        _check_server_version(server_num)
+    if not has_ledger:
+        return 0
+    cur = await conn.execute(f"SELECT COALESCE(MAX(version), 0)::int FROM {quoted}.migration")
+    return (await cur.fetchone())[0]
+
+
 async def run_migrations(
     conn: "psycopg.AsyncConnection", schema: str = DEFAULT_SCHEMA, skip_version_check: bool = False
 ) -> int:
@@ -104,13 +207,7 @@ async def run_migrations(
     async with conn.cursor() as cur:
         if not skip_version_check:
             await cur.execute("SELECT current_setting('server_version_num')")
-            server_num = int((await cur.fetchone())[0])
-            major = server_num // 10000
-            if major < MINIMUM_POSTGRES_VERSION:
-                raise UnsupportedPostgresVersionError(
-                    f"BullMQ: the PostgreSQL backend requires server version "
-                    f"{MINIMUM_POSTGRES_VERSION} or newer (server reports major {major})."
-                )
+            _check_server_version(int((await cur.fetchone())[0]))
 
         await cur.execute(
             "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
@@ -140,13 +237,308 @@ async def run_migrations(
     return current
 
 
+async def apply_storage_layout(
+    conn: "psycopg.AsyncConnection",
+    schema: str,
+    layout: dict,
+    wait: bool = True,
+) -> bool:
+    """Apply the opt-in storage layouts of ``schema`` that are not in place yet.
+
+    Runs in one transaction under the migration advisory lock. With
+    ``wait=False`` it gives up (returning ``False``) when another session
+    holds that lock, instead of queueing behind it.
+    """
+    quoted = quote_schema_name(schema)
+    lock = "pg_advisory_xact_lock" if wait else "pg_try_advisory_xact_lock"
+    async with conn.transaction():
+        async with conn.cursor() as cur:
+            await cur.execute(
+                f"SELECT {lock}(%s, hashtext(%s))", (MIGRATION_ADVISORY_LOCK_KEY, schema)
+            )
+            if not wait and not (await cur.fetchone())[0]:
+                return False
+            await cur.execute(f"SET LOCAL search_path TO {quoted}")
+            await apply_layout(cur, layout)
+    return True
+
+
+async def set_schema_durability(
+    conn: "psycopg.AsyncConnection", schema: str = DEFAULT_SCHEMA, durability: str = "unlogged"
+) -> list[str]:
+    """Make the job, dependency, log and event tables of ``schema``
+    ``UNLOGGED`` (``durability="unlogged"``) or ``LOGGED`` again.
+
+    An explicit administration step, like :func:`run_migrations`: no
+    connection ever runs it. Each switch rewrites the table under an
+    exclusive lock, so run it while the schema is idle.
+
+    Unlogged tables skip the WAL, but PostgreSQL truncates them after a crash
+    or an immediate shutdown and never replicates them to standbys: every
+    job, dependency, log and event of the schema is lost then. Returns the
+    tables that were switched.
+    """
+    durability = durability_option(durability)
+    quoted = quote_schema_name(schema)
+    async with conn.transaction():
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                (MIGRATION_ADVISORY_LOCK_KEY, schema),
+            )
+            await cur.execute(f"SET LOCAL search_path TO {quoted}")
+            return await set_durability(cur, durability)
+
+
+async def maintain_schema_storage(
+    conn: "psycopg.AsyncConnection", schema: str, event_partitions: dict
+) -> bool:
+    """Create the upcoming ``event`` partitions (``UNLOGGED`` when ``job``
+    is) and drop the expired ones.
+
+    Runs in one transaction under the migration advisory lock, and gives up
+    (returning ``False``) when another session holds it.
+    """
+    quoted = quote_schema_name(schema)
+    async with conn.transaction():
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT pg_try_advisory_xact_lock(%s, hashtext(%s))",
+                (MIGRATION_ADVISORY_LOCK_KEY, schema),
+            )
+            if not (await cur.fetchone())[0]:
+                return False
+            await cur.execute(f"SET LOCAL search_path TO {quoted}")
+            await cur.execute("SELECT relpersistence = 'u' FROM pg_class WHERE oid = 'job'::regclass")
+            unlogged = (await cur.fetchone())[0]
+            await maintain_event_partitions(
+                cur, event_partitions, int(time.time() * 1000), unlogged=unlogged
+            )
+    return True
+
+
+class NotificationSubscription:
+    """A waiter's view of one ``(channel, payload)`` pair on a :class:`NotificationHub`.
+
+    Notifications are latched rather than queued: one that arrives while the
+    owner is busy elsewhere makes the next :meth:`wait` return immediately,
+    however many were sent meanwhile. The hub also wakes every subscription
+    after re-establishing a dropped connection, since notifications may have
+    been missed while it was down.
+
+    A subscription made with ``keep_payloads`` also collects the payloads of
+    the notifications that woke it, for :meth:`take_payloads`.
+    """
+
+    def __init__(
+        self, hub: "NotificationHub", channel: str, payload: Optional[str], keep_payloads: bool = False
+    ):
+        self.hub = hub
+        self.channel = channel
+        self.payload = payload
+        self._event = asyncio.Event()
+        self._payloads: Optional[list[str]] = [] if keep_payloads else None
+
+    def _wake(self, payload: Optional[str] = None) -> None:
+        if self._payloads is not None and payload is not None:
+            self._payloads.append(payload)
+        self._event.set()
+
+    def take_payloads(self) -> list[str]:
+        """The payloads received since the last call, oldest first."""
+        payloads = self._payloads or []
+        if self._payloads is not None:
+            self._payloads = []
+        return payloads
+
+    async def wait(self, timeout: Optional[float]) -> bool:
+        """Wait up to ``timeout`` seconds (``None``: no limit); ``True`` if
+        woken, ``False`` on timeout."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+    def close(self) -> None:
+        self.hub._unsubscribe(self)
+
+
+class NotificationHub:
+    """One ``LISTEN`` connection per conninfo and schema, shared process-wide.
+
+    Every :class:`PostgresConnection` with the same conninfo and schema in an
+    event loop shares a hub, so a process running hundreds of workers holds
+    one listening server session instead of one per worker. A single reader
+    task drains the connection's notifications and wakes the subscriptions
+    registered for each channel and payload (a ``None`` payload matches any).
+
+    When the connection drops, the reader reconnects, re-issues every
+    ``LISTEN`` and wakes all subscriptions so their owners re-check state.
+    Hubs are reference counted through :meth:`acquire` and :meth:`release`
+    and close with their last user.
+    """
+
+    _hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, key: tuple, conninfo: str, options: str):
+        self.key = key
+        self.conninfo = conninfo
+        self.options = options
+        self.refcount = 0
+        self._conn: Optional[psycopg.AsyncConnection] = None
+        self._channels: set[str] = set()
+        self._subscriptions: dict[str, dict[Optional[str], set[NotificationSubscription]]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    @classmethod
+    def acquire(cls, conninfo: str, schema: str, options: str) -> "NotificationHub":
+        hubs = cls._hubs.setdefault(asyncio.get_running_loop(), {})
+        key = (conninfo, schema)
+        hub = hubs.get(key)
+        if hub is None:
+            hub = hubs[key] = cls(key, conninfo, options)
+        hub.refcount += 1
+        return hub
+
+    async def release(self) -> None:
+        self.refcount -= 1
+        if self.refcount > 0:
+            return
+        hubs = self._hubs.get(asyncio.get_running_loop(), {})
+        if hubs.get(self.key) is self:
+            del hubs[self.key]
+        await self.close()
+
+    async def subscribe(
+        self, channel: str, payload: Optional[str] = None, keep_payloads: bool = False
+    ) -> NotificationSubscription:
+        """Register a subscription, ``LISTEN``-ing on ``channel`` first if needed.
+
+        Returns once the server delivers the channel's notifications to the
+        hub, so nothing sent after this returns can be missed.
+        """
+        subscription = NotificationSubscription(self, channel, payload, keep_payloads)
+        self._subscriptions.setdefault(channel, {}).setdefault(payload, set()).add(subscription)
+        try:
+            if channel not in self._channels or self._conn is None or self._conn.closed:
+                await self._listen(channel)
+        except BaseException:
+            subscription.close()
+            raise
+        return subscription
+
+    def _unsubscribe(self, subscription: NotificationSubscription) -> None:
+        by_payload = self._subscriptions.get(subscription.channel, {})
+        waiters = by_payload.get(subscription.payload)
+        if waiters is not None:
+            waiters.discard(subscription)
+            if not waiters:
+                del by_payload[subscription.payload]
+
+    async def _listen(self, channel: str) -> None:
+        async with self._lock:
+            # notifies() holds the connection lock while it waits, so pause the
+            # reader to issue the LISTEN; notifications arriving meanwhile are
+            # backlogged by psycopg and read when it resumes.
+            await self._stop_reader()
+            try:
+                conn = await self._connection()
+                if channel not in self._channels:
+                    await conn.execute(SQL("LISTEN {}").format(Identifier(channel)))
+                    self._channels.add(channel)
+            finally:
+                if self._conn is not None and not self._closed:
+                    self._reader = asyncio.ensure_future(self._read())
+
+    async def _connection(self) -> psycopg.AsyncConnection:
+        if self._conn is not None and not self._conn.closed:
+            return self._conn
+        reconnecting = self._conn is not None
+        conn = await psycopg.AsyncConnection.connect(
+            self.conninfo, autocommit=True, options=self.options
+        )
+        try:
+            for channel in self._channels:
+                await conn.execute(SQL("LISTEN {}").format(Identifier(channel)))
+        except BaseException:
+            await conn.close()
+            raise
+        self._conn = conn
+        if reconnecting:
+            self._wake_all()
+        return conn
+
+    async def _read(self) -> None:
+        while not self._closed:
+            try:
+                conn = await self._connection()
+                async for notify in conn.notifies():
+                    self._dispatch(notify.channel, notify.payload)
+            except (psycopg.Error, OSError):
+                await self._drop_connection()
+                await asyncio.sleep(LISTEN_RECONNECT_DELAY)
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        by_payload = self._subscriptions.get(channel)
+        if not by_payload:
+            return
+        for key in (payload, None):
+            for subscription in by_payload.get(key, ()):
+                subscription._wake(payload)
+
+    def _wake_all(self) -> None:
+        for by_payload in self._subscriptions.values():
+            for waiters in by_payload.values():
+                for subscription in waiters:
+                    subscription._wake()
+
+    async def _drop_connection(self) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        # Keep the (closed) connection around so the next connect knows it is
+        # a reconnect and wakes the subscriptions.
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def _stop_reader(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is None or reader.done():
+            return
+        reader.cancel()
+        try:
+            await reader
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self) -> None:
+        self._closed = True
+        await self._stop_reader()
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+        self._channels.clear()
+        self._subscriptions.clear()
+
+
 class PostgresConnection:
-    """Owns a Postgres connection + a lazily-established dedicated LISTEN connection."""
+    """Owns a Postgres query pool + a subscription to the shared LISTEN hub."""
 
     def __init__(self, opts: dict = {}):
         connection = opts.get("connection", {})
         self.schema = opts.get("schema", DEFAULT_SCHEMA)
         self.skip_version_check = opts.get("skipVersionCheck", False)
+        self.prepare_statements = opts.get("prepareStatements", True)
+        self.storage_layout = storage_layout(opts)
         quoted = quote_schema_name(self.schema)
 
         if isinstance(connection, str):
@@ -166,15 +558,30 @@ class PostgresConnection:
                 params["password"] = connection["password"]
             self.conninfo = make_conninfo(**params)
 
+        pool_opts = opts.get("pool") or {}
+        self.pool_min_size = pool_opts.get("minSize", DEFAULT_POOL_MIN_SIZE)
+        self.pool_max_size = max(
+            pool_opts.get("maxSize", DEFAULT_POOL_MAX_SIZE), self.pool_min_size
+        )
+        self.pool_max_idle = pool_opts.get("maxIdle", DEFAULT_POOL_MAX_IDLE)
+
         # Pin search_path so the .sql files use unqualified, portable names.
         self._options = f"-c search_path={quoted}"
-        self._conn: Optional[psycopg.AsyncConnection] = None
-        self._conn_lock = asyncio.Lock()
+        self._pool: Optional[AsyncConnectionPool] = None
+        # application_name last applied to each pooled connection, so a rename
+        # reaches connections opened before it on their next checkout.
+        self._pool_names: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
         self._ready = False
         self._ready_lock = asyncio.Lock()
-        self._listen_conn: Optional[psycopg.AsyncConnection] = None
-        self._job_channel_listening = False
+        self._hub: Optional[NotificationHub] = None
+        self._subscriptions: set[NotificationSubscription] = set()
         self._application_name: Optional[str] = None
+        self._storage_maintained_at: Optional[float] = None
+        self._pool_lock = asyncio.Lock()
+        self._closed = False
+        self._schema_key = (
+            self.conninfo, self.schema, json.dumps(self.storage_layout, sort_keys=True)
+        )
 
     async def wait_until_ready(self) -> None:
         if self._ready:
@@ -182,101 +589,323 @@ class PostgresConnection:
         async with self._ready_lock:
             if self._ready:
                 return
-            # Migrations need a single dedicated (non-autocommit) session so the
-            # advisory lock and the DDL share one transaction.
-            migration_conn = await psycopg.AsyncConnection.connect(
-                self.conninfo, autocommit=False
-            )
-            try:
-                await run_migrations(migration_conn, self.schema, self.skip_version_check)
-            finally:
-                await migration_conn.close()
+            if self._schema_key not in _CURRENT_SCHEMAS:
+                await self._migrate()
+                _CURRENT_SCHEMAS.add(self._schema_key)
             self._ready = True
 
-    async def _get_conn(self) -> "psycopg.AsyncConnection":
-        if self._conn is None or self._conn.closed:
-            self._conn = await psycopg.AsyncConnection.connect(
-                self.conninfo, autocommit=True, options=self._options
-            )
-        return self._conn
-
-    async def run(self, sql: str, params: list) -> PgResult:
+    async def _migrate(self) -> None:
+        # A lock-free probe on a pooled connection settles the common case of
+        # a current schema without any layout to apply.
+        pool = await self._open_pool()
+        async with pool.connection() as conn:
+            version = await probe_schema_version(conn, self.schema, self.skip_version_check)
+        if version >= sql_loader.latest_migration_version() and not self.storage_layout:
+            return
+        # Migrations need a single dedicated (non-autocommit) session so the
+        # advisory lock and the DDL share one transaction.
+        migration_conn = await psycopg.AsyncConnection.connect(
+            self.conninfo, autocommit=False
+        )
+        try:
+            await run_migrations(migration_conn, self.schema, skip_version_check=True)
+            if self.storage_layout:
+                await apply_storage_layout(migration_conn, self.schema, self.storage_layout)
+        finally:
+            await migration_conn.close()
+
+    async def _get_pool(self) -> AsyncConnectionPool:
         if not self._ready:
             await self.wait_until_ready()
+        return await self._open_pool()
+
+    async def _open_pool(self) -> AsyncConnectionPool:
+        if self._pool is not None:
+            return self._pool
+        async with self._pool_lock:
+            if self._closed:
+                raise PoolClosed("the BullMQ connection is closed")
+            if self._pool is None:
+                pool = AsyncConnectionPool(
+                    self.conninfo,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    max_idle=self.pool_max_idle,
+                    kwargs={"autocommit": True, "options": self._options},
+                    configure=self._configure_connection,
+                    open=False,
+                )
+                await pool.open()
+                if self._closed:
+                    # Closed while the pool was opening: nothing will close it later.
+                    await pool.close()
+                    raise PoolClosed("the BullMQ connection is closed")
+                self._pool = pool
+        return self._pool
+
+    async def _configure_connection(self, conn: "psycopg.AsyncConnection") -> None:
+        # search_path comes with the connect options; the client name may be
+        # set at any time, so it is (re)applied per pooled connection.
+        conn.prepared_max = PREPARED_STATEMENTS_MAX
+        if self._application_name:
+            await self._apply_application_name(conn)
+
+    async def _apply_application_name(self, conn: "psycopg.AsyncConnection") -> None:
+        name = self._application_name
+        await conn.execute("SELECT set_config('application_name', %s, false)", (name,))
+        self._pool_names[conn] = name
+
+    async def run(self, sql: str, params: list) -> PgResult:
+        """Run an ad-hoc ``$N``-parameterized statement."""
         query, query_params = _to_pyformat(sql, params)
-        # A single connection per backend, serialized by a lock. Concurrency
-        # across queues/workers comes from their separate connections; the
-        # blocking wait uses its own dedicated connection (see below), so it
-        # never holds this lock.
-        async with self._conn_lock:
-            conn = await self._get_conn()
+        return await self._execute(
+            query, query_params, None if self.prepare_statements else False
+        )
+
+    async def run_command(self, name: str, params: list) -> PgResult:
+        """Run a bundled command by name as a prepared statement.
+
+        The translated text comes from the loader's per-command cache, so no
+        SQL is parsed here.
+        """
+        query, query_params = _bind_command(name, params)
+        return await self._execute(query, query_params, self.prepare_statements)
+
+    async def run_pipeline(self, commands: list[tuple[str, list]]) -> list[PgResult]:
+        """Run several bundled commands on one connection in pipeline mode.
+
+        The statements share a single network flush and, up to the pipeline's
+        closing sync, one implicit transaction: the first failure is raised and
+        the whole batch is rolled back. Results come back in ``commands`` order.
+        """
+        async def pipeline(conn: "psycopg.AsyncConnection") -> list[PgResult]:
+            cursors = [conn.cursor() for _ in commands]
+            try:
+                async with conn.pipeline():
+                    for cur, (name, params) in zip(cursors, commands):
+                        query, query_params = _bind_command(name, params)
+                        await cur.execute(query, query_params, prepare=self.prepare_statements)
+                return [await _read_result(cur) for cur in cursors]
+            finally:
+                for cur in cursors:
+                    await cur.close()
+
+        return await self._on_pooled(pipeline)
+
+    async def copy_and_run(
+        self,
+        setup_command: str,
+        copy_command: str,
+        types: list[str],
+        rows: Sequence[tuple],
+        name: str,
+        params: list,
+    ) -> PgResult:
+        """Stream ``rows`` through a binary ``COPY`` and run a command on them.
+
+        In one transaction on one pooled connection: run the (unprepared)
+        ``setup_command``, feed ``rows`` to the ``COPY ... FROM STDIN (FORMAT
+        binary)`` in ``copy_command`` with the given column ``types``, then run
+        the bundled command ``name`` as usual. ``rows`` is sent again if the
+        schema has to be migrated first.
+        """
+        query, query_params = _bind_command(name, params)
+
+        async def copy_and_execute(conn: "psycopg.AsyncConnection") -> PgResult:
+            async with conn.transaction():
+                async with conn.cursor() as cur:
+                    await cur.execute(sql_loader.load_command(setup_command))
+                    async with cur.copy(sql_loader.load_command(copy_command)) as copy:
+                        copy.set_types(types)
+                        for row in rows:
+                            await copy.write_row(row)
+                    await cur.execute(query, query_params, prepare=self.prepare_statements)
+                    return await _read_result(cur)
+
+        return await self._on_pooled(copy_and_execute)
+
+    async def _execute(
+        self, query: str, params: list, prepare: Optional[bool]
+    ) -> PgResult:
+        async def execute(conn: "psycopg.AsyncConnection") -> PgResult:
             async with conn.cursor() as cur:
-                await cur.execute(query, query_params)
-                if cur.description:
-                    columns = [d.name for d in cur.description]
-                    rows = await cur.fetchall()
-                    return PgResult(columns, rows, cur.rowcount)
-                return PgResult([], [], cur.rowcount)
-
-    async def listen_connection(self) -> "psycopg.AsyncConnection":
-        """The dedicated autocommit connection used for LISTEN/NOTIFY waits."""
-        if self._listen_conn is None or self._listen_conn.closed:
-            self._listen_conn = await psycopg.AsyncConnection.connect(
-                self.conninfo, autocommit=True, options=self._options
+                await cur.execute(query, params, prepare=prepare)
+                return await _read_result(cur)
+
+        return await self._on_pooled(execute)
+
+    async def _on_pooled(self, operation: Callable[["psycopg.AsyncConnection"], Awaitable[T]]) -> T:
+        """Run ``operation`` on a pooled connection.
+
+        If the schema is gone (dropped since this process cached it as
+        current), migrate again and retry once; the failed statement had no
+        effect. Any other error is raised as is.
+        """
+        try:
+            async with self._checkout() as conn:
+                return await operation(conn)
+        except _MISSING_SCHEMA_ERRORS as error:
+            if not isinstance(error, psycopg.errors.InvalidSchemaName):
+                async with self._checkout() as conn:
+                    if await probe_schema_version(conn, self.schema, skip_version_check=True):
+                        raise
+            _CURRENT_SCHEMAS.discard(self._schema_key)
+            self._ready = False
+        async with self._checkout() as conn:
+            return await operation(conn)
+
+    @asynccontextmanager
+    async def _checkout(self) -> AsyncIterator["psycopg.AsyncConnection"]:
+        pool = await self._get_pool()
+        # Statements run concurrently on pooled connections; the blocking wait
+        # sleeps on the shared notification hub, so it never holds a pool slot.
+        async with pool.connection() as conn:
+            if self._application_name and self._pool_names.get(conn) != self._application_name:
+                await self._apply_application_name(conn)
+            yield conn
+
+    async def maintain_storage(self) -> bool:
+        """Create the upcoming event partitions and drop the ones past the
+        ``eventPartitions`` retention.
+
+        A no-op without ``eventPartitions``, and cheap to call often: the
+        work runs at most every ``STORAGE_MAINTENANCE_INTERVAL`` seconds per
+        connection and is skipped while another session migrates or
+        maintains the schema.
+        Returns whether a pass ran.
+        """
+        if "eventPartitions" not in self.storage_layout:
+            return False
+        now = time.monotonic()
+        if (
+            self._storage_maintained_at is not None
+            and now - self._storage_maintained_at < STORAGE_MAINTENANCE_INTERVAL
+        ):
+            return False
+        self._storage_maintained_at = now
+        async with self._checkout() as conn:
+            return await maintain_schema_storage(
+                conn, self.schema, self.storage_layout["eventPartitions"]
             )
-            if self._application_name:
-                await self._listen_conn.execute(
-                    "SELECT set_config('application_name', %s, false)",
-                    (self._application_name,),
-                )
-            self._job_channel_listening = False
-        return self._listen_conn
-
-    async def ensure_job_channel(self) -> "psycopg.AsyncConnection":
-        """Return the LISTEN connection after subscribing to ``bullmq_jobs`` once."""
-        conn = await self.listen_connection()
-        if not self._job_channel_listening:
-            await conn.execute("LISTEN bullmq_jobs")
-            self._job_channel_listening = True
-        return conn
 
-    async def reset_job_channel(self) -> None:
-        """Drop the LISTEN connection so the next wait re-establishes it."""
-        if self._listen_conn is not None:
-            try:
-                await self._listen_conn.close()
-            except Exception:
-                pass
-        self._listen_conn = None
-        self._job_channel_listening = False
+    async def subscribe(
+        self, channel: str, payload: Optional[str] = None, keep_payloads: bool = False
+    ) -> NotificationSubscription:
+        """Subscribe to ``channel`` (optionally one payload) on the shared hub."""
+        if self._hub is None:
+            self._hub = NotificationHub.acquire(self.conninfo, self.schema, self._options)
+        subscription = await self._hub.subscribe(channel, payload, keep_payloads)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: NotificationSubscription) -> None:
+        self._subscriptions.discard(subscription)
+        subscription.close()
 
     async def set_application_name(self, name: str) -> None:
         if not name:
             return
         self._application_name = name
-        if not self._ready:
-            await self.wait_until_ready()
-        async with self._conn_lock:
-            conn = await self._get_conn()
-            async with conn.cursor() as cur:
-                await cur.execute("SELECT set_config('application_name', %s, false)", (name,))
-        if self._listen_conn is not None and not self._listen_conn.closed:
-            await self._listen_conn.execute(
-                "SELECT set_config('application_name', %s, false)",
-                (name,),
-            )
+        try:
+            pool = await self._get_pool()
+            # Name one pooled session right away so discovery sees the client;
+            # the others pick the name up on their next checkout.
+            async with pool.connection() as conn:
+                await self._apply_application_name(conn)
+        except PoolClosed:
+            # A client closed before it got to name itself has nothing to name.
+            if not self._closed:
+                raise
 
     async def close(self) -> None:
-        if self._listen_conn is not None:
-            try:
-                await self._listen_conn.close()
-            except Exception:
-                pass
-            self._listen_conn = None
-            self._job_channel_listening = False
-        if self._conn is not None:
+        self._closed = True
+        for subscription in self._subscriptions:
+            subscription.close()
+        self._subscriptions.clear()
+        if self._hub is not None:
+            hub, self._hub = self._hub, None
+            await hub.release()
+        if self._pool is not None:
             try:
-                await self._conn.close()
+                await self._pool.close()
             except Exception:
                 pass
-            self._conn = None
+            self._pool = None
+
+
+class CallerConnection:
+    """Runs bundled commands on a caller-owned connection or transaction.
+
+    Backs :meth:`PostgresBackend.withConnection` (the transactional outbox):
+    the statements join whatever transaction the caller has open, so the job
+    rows commit or roll back with the caller's own writes, and the wakeup
+    ``NOTIFY`` they issue is only delivered on commit. On an autocommit
+    connection with no transaction open, each batch of statements runs in a
+    transaction of its own. The caller owns the connection; :meth:`close`
+    leaves it untouched, and no statement is prepared on it.
+
+    The caller's ``search_path`` need not include the BullMQ schema: each batch
+    of statements is pipelined between a transaction-local switch to the
+    schema and a restore of the caller's own path, in a single round trip.
+    """
+
+    def __init__(self, connection: Any, owner: PostgresConnection):
+        if isinstance(connection, psycopg.AsyncTransaction):
+            connection = connection.connection
+        self.conn: psycopg.AsyncConnection = connection
+        self.owner = owner
+        self.schema = owner.schema
+        self.storage_layout = owner.storage_layout
+
+    async def wait_until_ready(self) -> None:
+        # Migrations run on the owner's own session, never in the caller's
+        # transaction.
+        await self.owner.wait_until_ready()
+
+    async def run(self, sql: str, params: list) -> PgResult:
+        query, query_params = _to_pyformat(sql, params)
+        (result,) = await self._run_statements([(query, query_params)])
+        return result
+
+    async def run_command(self, name: str, params: list) -> PgResult:
+        (result,) = await self.run_pipeline([(name, params)])
+        return result
+
+    async def run_pipeline(self, commands: list[tuple[str, list]]) -> list[PgResult]:
+        return await self._run_statements(
+            [_bind_command(name, params) for name, params in commands]
+        )
+
+    async def _run_statements(self, statements: list[tuple[str, list]]) -> list[PgResult]:
+        await self.wait_until_ready()
+        cursors = [self.conn.cursor() for _ in statements]
+        try:
+            async with AsyncExitStack() as stack:
+                # The search_path switch is transaction-local: on an
+                # autocommit connection outside a transaction it would end
+                # with its own statement, so open one for the batch.
+                if (
+                    self.conn.autocommit
+                    and self.conn.info.transaction_status == TransactionStatus.IDLE
+                ):
+                    await stack.enter_async_context(self.conn.transaction())
+                await stack.enter_async_context(self.conn.pipeline())
+                await self.conn.execute(
+                    "SELECT set_config('bullmq.caller_search_path', current_setting('search_path'), true), "
+                    "set_config('search_path', concat_ws(', ', %s, NULLIF(current_setting('search_path'), '')), true)",
+                    (quote_schema_name(self.schema),),
+                )
+                # Never prepare on the caller's connection: the statements
+                # would outlive this call in a session the caller owns.
+                for cur, (query, params) in zip(cursors, statements):
+                    await cur.execute(query, params, prepare=False)
+                await self.conn.execute(
+                    "SELECT set_config('search_path', current_setting('bullmq.caller_search_path'), true)"
+                )
+            return [await _read_result(cur) for cur in cursors]
+        finally:
+            for cur in cursors:
+                await cur.close()
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,421 @@
+"""Opt-in physical layouts and storage upkeep for the Postgres backend's tables.
+
+The bundled migrations create every table as a plain, logged heap. The helpers
+here reshape some of them afterwards, keeping their names, columns and
+defaults, so the command files and the PL/pgSQL functions keep working
+unchanged. Each helper runs on a cursor inside a transaction that already
+holds the schema's migration advisory lock and has ``search_path`` pinned to
+the schema (see :func:`~bullmq.backends.postgres_connection.apply_storage_layout`).
+
+``eventPartitions`` turns ``event`` into a table range-partitioned by
+``created_at_ms``, one partition per day, with a ``DEFAULT`` partition that
+catches any row outside them, so inserts never fail. The existing rows stay
+where they are, in the ``event_legacy`` partition. Connecting only converts
+the table and creates its first partitions; :func:`maintain_event_partitions`
+then keeps a few partitions ready ahead of time and, with the option's
+``retention``, drops whole partitions instead of deleting rows. It runs from
+the periodic storage maintenance of the connections with the option, so rows
+land in the ``DEFAULT`` partition while no such connection runs. Per-queue trimming
+(``trimEvents`` and ``publish_event``'s own cap) still deletes rows, and
+every runtime's commands work on either layout.
+
+``hotJobUpdates`` lets lock renewals and progress updates of active jobs be
+HOT (heap-only) updates, which skip every index and write far less WAL. A
+HOT update needs free space on the row's page and no change to any indexed
+column, so it lowers ``job``'s fillfactor and replaces ``job_active_idx``
+(whose ``locked_until_ms`` column every renewal changed) with an index on
+``queue`` alone. The stalled-job scan then filters the lock expiry over the
+queue's active rows, which are few. A lower fillfactor only applies to pages
+written from then on. Every runtime's queries keep working on either index.
+
+``jobCounters`` keeps per-queue job counts by state (and, for waiting jobs,
+by priority) in a ``job_counter`` table maintained by triggers on ``job``, so
+the connection's ``getCounts`` and ``getCountsPerPriority`` sum a handful of
+rows instead of counting jobs. The triggers count every job transition,
+whichever runtime makes it; only the Python clients with the option read the
+counters. Each session adds to one of ``JOB_COUNTER_SHARDS`` rows per queue
+and state (picked by its backend pid), so concurrent transitions rarely wait
+on each other, and the table stays bounded however many sessions come and go.
+Enabling it counts the existing jobs once while holding off writes to ``job``.
+
+:func:`set_durability` makes the job, dependency, log and event tables (and
+``job_counter``) ``UNLOGGED`` for fire-and-forget queues, or ``LOGGED`` again.
+It is an explicit administration step
+(:func:`~bullmq.backends.postgres_connection.set_schema_durability`), never
+run while connecting: either switch rewrites the tables under an exclusive
+lock. Unlogged writes skip the WAL, but PostgreSQL truncates unlogged tables
+after a crash or an immediate shutdown, and standbys never see their rows:
+every job, dependency, log and event of the schema is lost then. Event
+partitions created later follow the ``job`` table's durability.
+
+``workerRegistry`` creates the ``worker_heartbeat`` table the workers'
+heartbeats (``heartbeatInterval``) are written to and ``get_workers`` reads.
+It is always ``UNLOGGED``: heartbeats are rewritten every few seconds and are
+worthless after a crash. A connection whose options set ``heartbeatInterval``
+enables it implicitly.
+
+``eventPartitions``, ``hotJobUpdates``, ``jobCounters`` and ``workerRegistry`` are one-way: turning them off later
+leaves the schema as it is.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+from psycopg.sql import SQL, Identifier, Literal
+
+# Range covered by one ``event`` partition: one day, in ms.
+EVENT_PARTITION_INTERVAL = 86_400_000
+
+# Partitions kept ready beyond the one covering "now".
+DEFAULT_EVENT_PARTITIONS_AHEAD = 3
+
+EVENT_PARTITION_PREFIX = "event_p"
+EVENT_DEFAULT_PARTITION = "event_default"
+# The rows of a table that was not partitioned yet, attached as the partition
+# covering everything before the first interval.
+EVENT_LEGACY_PARTITION = "event_legacy"
+
+# Free space (100 - fillfactor %) left on each job page for HOT updates.
+DEFAULT_JOB_FILLFACTOR = 80
+
+# Tables :func:`set_durability` switches. A logged table may not reference
+# an unlogged one, so the tables referencing ``job`` come first: ``job`` turns
+# unlogged last and logged first. Tables that do not exist are skipped.
+DURABILITY_TABLES = ("job_counter", "job_log", "job_dependency", "event", "job")
+
+# Counter rows each queue, state and priority is spread over.
+JOB_COUNTER_SHARDS = 16
+
+# A job row's counter priority: waiting jobs count per priority, the others
+# per state only.
+_COUNTER_PRIORITY = "CASE WHEN {0}state = 'waiting' THEN {0}priority ELSE 0 END"
+
+# Adds the signed counts of a ``delta (queue, state, priority, n)`` row set to
+# the session's shard, locking the counter rows in key order.
+_COUNTER_UPSERT = f"""
+  INSERT INTO job_counter AS c (queue, state, priority, shard, n)
+  SELECT queue, state, priority, pg_backend_pid() % {JOB_COUNTER_SHARDS}, SUM(n) FROM delta
+   GROUP BY queue, state, priority
+  HAVING SUM(n) <> 0
+   ORDER BY queue, state, priority
+  ON CONFLICT (queue, state, priority, shard) DO UPDATE SET n = c.n + EXCLUDED.n"""
+
+
+def _counter_trigger_function(name: str, delta: str) -> str:
+    return f"""
+CREATE FUNCTION {name}() RETURNS trigger
+LANGUAGE plpgsql
+SET search_path FROM CURRENT
+AS $$
+BEGIN
+  WITH delta AS ({delta}){_COUNTER_UPSERT};
+  RETURN NULL;
+END;
+$$"""
+
+
+_JOB_COUNTER_DDL = (
+    """
+CREATE TABLE job_counter (
+  queue    text      NOT NULL,
+  state    job_state NOT NULL,
+  priority integer   NOT NULL,  -- 0 unless state = 'waiting'
+  shard    integer   NOT NULL,
+  n        bigint    NOT NULL,
+  PRIMARY KEY (queue, state, priority, shard)
+)""",
+    _counter_trigger_function(
+        "job_counter_inserted",
+        f"SELECT queue, state, {_COUNTER_PRIORITY.format('')} AS priority, 1 AS n FROM new_rows",
+    ),
+    _counter_trigger_function(
+        "job_counter_deleted",
+        f"SELECT queue, state, {_COUNTER_PRIORITY.format('')} AS priority, -1 AS n FROM old_rows",
+    ),
+    _counter_trigger_function(
+        "job_counter_updated",
+        f"SELECT OLD.queue AS queue, OLD.state AS state, "
+        f"{_COUNTER_PRIORITY.format('OLD.')} AS priority, -1 AS n "
+        f"UNION ALL SELECT NEW.queue, NEW.state, {_COUNTER_PRIORITY.format('NEW.')}, 1",
+    ),
+    # CREATE TRIGGER holds off every write to ``job`` until the transaction
+    # commits, so the backfill below counts exactly what the triggers
+    # continue from.
+    "CREATE TRIGGER job_counter_insert AFTER INSERT ON job "
+    "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION job_counter_inserted()",
+    "CREATE TRIGGER job_counter_delete AFTER DELETE ON job "
+    "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION job_counter_deleted()",
+    # Row-level, and only for transitions: lock renewals and progress
+    # updates never reach it.
+    "CREATE TRIGGER job_counter_update AFTER UPDATE OF queue, state, priority ON job FOR EACH ROW "
+    "WHEN (OLD.queue IS DISTINCT FROM NEW.queue OR OLD.state IS DISTINCT FROM NEW.state "
+    "OR OLD.priority IS DISTINCT FROM NEW.priority) EXECUTE FUNCTION job_counter_updated()",
+    "INSERT INTO job_counter (queue, state, priority, shard, n) "
+    f"SELECT queue, state, {_COUNTER_PRIORITY.format('')}, 0, COUNT(*) FROM job GROUP BY 1, 2, 3",
+)
+
+_WORKER_HEARTBEAT_DDL = """
+CREATE UNLOGGED TABLE IF NOT EXISTS worker_heartbeat (
+  queue         text   NOT NULL,
+  id            text   NOT NULL,
+  expires_at_ms bigint NOT NULL,
+  info          jsonb  NOT NULL,
+  PRIMARY KEY (queue, id)
+)"""
+
+# Upper bound of a range partition, as rendered by pg_get_expr.
+_UPPER_BOUND_RE = re.compile(r"TO \('?(-?\d+|MAXVALUE)'?\)")
+
+
+def event_partition_options(value: Any) -> dict:
+    """Normalize the ``eventPartitions`` connection option.
+
+    ``True`` enables daily partitions; a dict may set ``retention`` (ms of
+    events kept; ``None``, the default, keeps all) and ``premake``
+    (partitions created ahead of the current one).
+    """
+    opts = value if isinstance(value, dict) else {}
+    retention = opts.get("retention")
+    if retention is not None and int(retention) < 0:
+        raise ValueError("BullMQ: eventPartitions.retention must be a positive number of milliseconds.")
+    return {
+        "interval": EVENT_PARTITION_INTERVAL,
+        "retention": int(retention) if retention else None,
+        "premake": max(int(opts.get("premake", DEFAULT_EVENT_PARTITIONS_AHEAD)), 0),
+    }
+
+
+def hot_job_update_options(value: Any) -> Optional[dict]:
+    """Normalize the ``hotJobUpdates`` connection option.
+
+    ``True`` uses ``DEFAULT_JOB_FILLFACTOR``; a dict may set ``fillfactor``
+    (10-100). Falsy leaves the ``job`` table as the migrations created it.
+    """
+    if not value:
+        return None
+    opts = value if isinstance(value, dict) else {}
+    fillfactor = int(opts.get("fillfactor") or DEFAULT_JOB_FILLFACTOR)
+    if not 10 <= fillfactor <= 100:
+        raise ValueError("BullMQ: hotJobUpdates.fillfactor must be between 10 and 100.")
+    return {"fillfactor": fillfactor}
+
+
+def durability_option(value: Any) -> str:
+    """Validate a durability (``"logged"`` or ``"unlogged"``)."""
+    if value not in ("logged", "unlogged"):
+        raise ValueError("BullMQ: durability must be 'logged' or 'unlogged'.")
+    return value
+
+
+def storage_layout(opts: dict) -> dict:
+    """The opt-in layouts requested by a connection's options, normalized
+    and keyed by option name (empty when none is)."""
+    layout = {}
+    hot_job_updates = hot_job_update_options(opts.get("hotJobUpdates"))
+    if hot_job_updates:
+        layout["hotJobUpdates"] = hot_job_updates
+    if opts.get("jobCounters"):
+        layout["jobCounters"] = True
+    if opts.get("eventPartitions"):
+        layout["eventPartitions"] = event_partition_options(opts["eventPartitions"])
+    if opts.get("workerRegistry") or opts.get("heartbeatInterval"):
+        layout["workerRegistry"] = True
+    return layout
+
+
+async def apply_layout(cur: Any, layout: dict) -> None:
+    """Create every layout in ``layout`` that is not in place yet.
+
+    Only runs DDL; the upkeep of the event partitions is
+    :func:`maintain_event_partitions`'s.
+    """
+    if "hotJobUpdates" in layout:
+        await tune_job_table(cur, layout["hotJobUpdates"])
+    if "jobCounters" in layout:
+        await create_job_counters(cur)
+    if "eventPartitions" in layout:
+        await partition_event_table(cur, layout["eventPartitions"])
+    if "workerRegistry" in layout:
+        await cur.execute(_WORKER_HEARTBEAT_DDL)
+
+
+async def create_job_counters(cur: Any) -> bool:
+    """Create ``job_counter`` and its triggers, counting the existing jobs;
+    ``False`` if they already exist."""
+    await cur.execute("SELECT to_regclass('job_counter') IS NULL")
+    if not (await cur.fetchone())[0]:
+        return False
+    for statement in _JOB_COUNTER_DDL:
+        await cur.execute(statement)
+    return True
+
+
+async def tune_job_table(cur: Any, options: dict) -> bool:
+    """Set ``job``'s fillfactor and swap ``job_active_idx`` for its
+    lock-free replacement; ``False`` if both were already in place."""
+    changed = False
+    setting = f"fillfactor={options['fillfactor']}"
+    await cur.execute(
+        "SELECT %s = ANY(COALESCE(reloptions, '{}')) FROM pg_class WHERE oid = 'job'::regclass",
+        (setting,),
+    )
+    if not (await cur.fetchone())[0]:
+        await cur.execute(
+            SQL("ALTER TABLE job SET (fillfactor = {})").format(Literal(options["fillfactor"]))
+        )
+        changed = True
+
+    await cur.execute("SELECT to_regclass('job_active_idx') IS NOT NULL")
+    if (await cur.fetchone())[0]:
+        await cur.execute(
+            "CREATE INDEX IF NOT EXISTS job_active_queue_idx ON job (queue) WHERE state = 'active'"
+        )
+        await cur.execute("DROP INDEX job_active_idx")
+        changed = True
+    return changed
+
+
+async def set_durability(cur: Any, durability: str) -> list[str]:
+    """Make the ``DURABILITY_TABLES`` (each partition, for a partitioned
+    ``event``) ``durability``; returns the tables that were switched."""
+    persistence = "u" if durability == "unlogged" else "p"
+    tables = DURABILITY_TABLES if durability == "unlogged" else DURABILITY_TABLES[::-1]
+    switched: list[str] = []
+    for table in tables:
+        await cur.execute(
+            "SELECT c.relname::text FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relpersistence <> %s AND (c.oid = to_regclass(%s) "
+            "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s)))",
+            (persistence, table, table),
+        )
+        for (name,) in await cur.fetchall():
+            await cur.execute(
+                SQL("ALTER TABLE {} SET {}").format(Identifier(name), SQL(durability.upper()))
+            )
+            switched.append(name)
+    return switched
+
+
+def _interval_start(ms: int, interval: int) -> int:
+    return ms - ms % interval
+
+
+async def partition_event_table(cur: Any, options: dict) -> bool:
+    """Convert ``event`` into a partitioned table with its first ``premake``
+    partitions; ``False`` if it already is.
+
+    The existing rows stay where they are: the old table is renamed and
+    attached as the partition for everything before the next interval. The
+    new partitions keep its durability.
+    """
+    await cur.execute(
+        "SELECT relkind::text, relpersistence = 'u' FROM pg_class WHERE oid = 'event'::regclass"
+    )
+    kind, unlogged = await cur.fetchone()
+    if kind == "p":
+        return False
+
+    interval = options["interval"]
+    await cur.execute(
+        "SELECT GREATEST((extract(epoch FROM clock_timestamp()) * 1000)::bigint, "
+        "COALESCE(MAX(created_at_ms), 0)) FROM event"
+    )
+    boundary = _interval_start((await cur.fetchone())[0], interval) + interval
+
+    await cur.execute(SQL("ALTER TABLE event RENAME TO {}").format(Identifier(EVENT_LEGACY_PARTITION)))
+    # The partitioned parent's key needs the partition column; the legacy
+    # table gets a matching index when attached.
+    await cur.execute(
+        SQL("ALTER TABLE {} DROP CONSTRAINT event_pkey").format(Identifier(EVENT_LEGACY_PARTITION))
+    )
+    await cur.execute(
+        SQL(
+            "CREATE TABLE event (LIKE {} INCLUDING DEFAULTS, PRIMARY KEY (queue, id, created_at_ms)) "
+            "PARTITION BY RANGE (created_at_ms)"
+        ).format(Identifier(EVENT_LEGACY_PARTITION))
+    )
+    await cur.execute(
+        SQL("ALTER TABLE event ATTACH PARTITION {} FOR VALUES FROM (MINVALUE) TO ({})").format(
+            Identifier(EVENT_LEGACY_PARTITION), Literal(boundary)
+        )
+    )
+    await cur.execute(
+        SQL("CREATE {}TABLE {} PARTITION OF event DEFAULT").format(
+            SQL("UNLOGGED " if unlogged else ""), Identifier(EVENT_DEFAULT_PARTITION)
+        )
+    )
+    for i in range(options["premake"]):
+        lower = boundary + i * interval
+        await _create_event_partition(cur, lower, lower + interval, unlogged)
+    return True
+
+
+async def _event_partitions(cur: Any) -> dict[str, Optional[int]]:
+    """Range partitions of ``event`` by name, with their exclusive upper bound
+    (``None`` for ``MAXVALUE``)."""
+    await cur.execute(
+        "SELECT c.relname::text, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'event'::regclass"
+    )
+    partitions: dict[str, Optional[int]] = {}
+    for name, bound in await cur.fetchall():
+        match = _UPPER_BOUND_RE.search(bound or "")
+        if match is None:
+            continue  # the DEFAULT partition
+        upper = match.group(1)
+        partitions[name] = None if upper == "MAXVALUE" else int(upper)
+    return partitions
+
+
+async def _create_event_partition(cur: Any, lower: int, upper: int, unlogged: bool) -> str:
+    name = f"{EVENT_PARTITION_PREFIX}{lower}"
+    await cur.execute(
+        SQL("CREATE {}TABLE {} (LIKE event INCLUDING DEFAULTS)").format(
+            SQL("UNLOGGED " if unlogged else ""), Identifier(name)
+        )
+    )
+    # Rows that fell into the DEFAULT partition for this range move over
+    # first, or attaching would fail its constraint check.
+    await cur.execute(
+        SQL(
+            "WITH moved AS (DELETE FROM {} WHERE created_at_ms >= {} AND created_at_ms < {} "
+            "RETURNING *) INSERT INTO {} SELECT * FROM moved"
+        ).format(Identifier(EVENT_DEFAULT_PARTITION), Literal(lower), Literal(upper), Identifier(name))
+    )
+    await cur.execute(
+        SQL("ALTER TABLE event ATTACH PARTITION {} FOR VALUES FROM ({}) TO ({})").format(
+            Identifier(name), Literal(lower), Literal(upper)
+        )
+    )
+    return name
+
+
+async def maintain_event_partitions(
+    cur: Any, options: dict, now_ms: int, unlogged: bool = False
+) -> tuple[list[str], list[str]]:
+    """Create the partitions due ahead of ``now_ms`` (``UNLOGGED`` with
+    ``unlogged``) and drop those past the retention window. Returns the
+    created and the dropped partition names."""
+    interval = options["interval"]
+    partitions = await _event_partitions(cur)
+
+    created: list[str] = []
+    bounds = [upper for upper in partitions.values() if upper is not None]
+    lower = max([_interval_start(now_ms, interval)] + bounds)
+    horizon = _interval_start(now_ms, interval) + (options["premake"] + 1) * interval
+    if None not in partitions.values():
+        while lower < horizon:
+            created.append(await _create_event_partition(cur, lower, lower + interval, unlogged))
+            lower += interval
+
+    dropped: list[str] = []
+    if options["retention"]:
+        cutoff = now_ms - options["retention"]
+        for name, upper in partitions.items():
+            if upper is not None and upper <= cutoff:
+                await cur.execute(SQL("DROP TABLE {}").format(Identifier(name)))
+                dropped.append(name)
+    return created, dropped
@@ -17,8 +17,12 @@ blocking wait, ...) itself.
 from __future__ import annotations
 
 import asyncio
+import json
+import time
 from typing import Any, Optional, TYPE_CHECKING
 
+from redis.asyncio import ConnectionPool, Redis
+
 from bullmq.backend import Backend
 from bullmq.redis_connection import RedisConnection
 from bullmq.scripts import Scripts
@@ -26,6 +30,7 @@ from bullmq.utils import (
     is_redis_cluster,
     get_cluster_nodes,
     get_node_client,
+    send_in_chunks,
 )
 
 if TYPE_CHECKING:
@@ -34,6 +39,11 @@ if TYPE_CHECKING:
 # Smallest meaningful block timeout (seconds) when the server supports 1ms blocks.
 minimum_block_timeout = 0.001
 
+# Milliseconds the worker heartbeat hash outlives its last heartbeat. Each
+# record carries its own expiry; this only reclaims the key once every worker
+# of the queue is gone.
+_HEARTBEATS_KEY_TTL = 86_400_000
+
 # States stored in a Redis sorted set (looked up by score) vs. a list.
 _ZSET_STATES = frozenset(
     {"completed", "failed", "delayed", "waiting-children", "prioritized"}
@@ -54,6 +64,11 @@ def _array_to_dict(arr) -> dict:
     return out
 
 
+def _glob_escape(value: str) -> str:
+    """Escape the ``MATCH`` glob metacharacters of a literal key part."""
+    return "".join(f"\\{c}" if c in "*?[]\\" else c for c in value)
+
+
 class RedisBackend(Backend):
     """Redis adapter implementing :class:`~bullmq.backend.Backend`."""
 
@@ -132,6 +147,12 @@ class RedisBackend(Backend):
             owns_connection=False,
         )
 
+    def withConnection(self, connection: Any) -> "RedisBackend":
+        raise NotImplementedError(
+            "Enqueueing on a caller-provided connection is only supported by the "
+            "PostgreSQL backend"
+        )
+
     @property
     def minimumBlockTimeout(self) -> float:
         return (
@@ -180,6 +201,39 @@ class RedisBackend(Backend):
             jobs[index].id = job_id
         return job_ids
 
+    async def addJobsChunked(
+        self, jobs: list["Job"], chunk_size: int, max_inflight_chunks: int = 1
+    ) -> list[Any]:
+        async def send(chunk: list["Job"]) -> list[Any]:
+            # No MULTI: each addJob script is atomic on its own, so other
+            # clients' commands interleave between them and a failing job
+            # comes back as its own error instead of aborting the chunk.
+            async with self.connection.conn.pipeline(transaction=False) as pipe:
+                for job in chunk:
+                    await self.scripts.addJob(job, pipe)
+                results = await pipe.execute(raise_on_error=False)
+            # Pipelined scripts return their error codes instead of raising,
+            # so map them the way Scripts.addJob does for a single add.
+            return [
+                self.scripts.finishedErrors({
+                    "code": result,
+                    "parentKey": job.parentKey,
+                    "command": "addJob",
+                })
+                if type(result) == int and result < 0 else result
+                for job, result in zip(chunk, results)
+            ]
+
+        return await send_in_chunks(jobs, chunk_size, max_inflight_chunks, send)
+
+    async def ingestJobs(self, jobs: list["Job"]) -> None:
+        # A plain (non-MULTI) pipeline: each addJob script is atomic on its
+        # own, and other clients' commands can interleave between them.
+        async with self.connection.conn.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                await self.scripts.addJob(job, pipe)
+            await pipe.execute()
+
     async def addFlow(self, entries: list[dict]) -> list[str]:
         async with self.connection.conn.pipeline(transaction=True) as pipe:
             for entry in entries:
@@ -350,6 +404,15 @@ class RedisBackend(Backend):
         raw = await self.connection.conn.hgetall(self.toKey(job_id))
         return raw if raw else None
 
+    async def getJobsByIds(self, job_ids: list[str]) -> list[Optional[dict]]:
+        if not job_ids:
+            return []
+        pipe = self.connection.conn.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(self.toKey(job_id))
+        raws = await pipe.execute()
+        return [raw if raw else None for raw in raws]
+
     async def getJobLogs(
         self, job_id: str, start: int = 0, end: int = -1, asc: bool = True
     ) -> dict:
@@ -371,6 +434,76 @@ class RedisBackend(Backend):
     async def getCounts(self, types: list) -> list:
         return await self.scripts.getCounts(types)
 
+    async def getCountsForQueues(self, queue_names: list, types: list) -> list:
+        if not queue_names:
+            return []
+        args = ["wait" if t == "waiting" else t for t in types]
+        get_counts = self.connection.commands["getCounts"]
+        # One non-transactional pipeline; on a cluster, redis-py groups the
+        # calls by the slot of each queue's prefix and sends one batch per node.
+        pipe = self.connection.conn.pipeline(transaction=False)
+        for name in queue_names:
+            get_counts(
+                keys=[self.scripts.queue_keys.toKey(name, "")], args=args, client=pipe
+            )
+        return await pipe.execute()
+
+    async def listQueues(self, prefix: Optional[str] = None, page_size: int = 1000):
+        prefix = self.prefix if prefix is None else prefix
+        match = f"{_glob_escape(prefix)}:*:meta"
+        client = self.connection.conn
+        if is_redis_cluster(client):
+            # Replicas hold copies of their primary's keys; scan primaries only.
+            clients = [
+                get_node_client(node) for node in get_cluster_nodes(client)
+                if getattr(node, "server_type", "primary") == "primary"
+            ]
+        else:
+            clients = [client]
+
+        # Every node is scanned concurrently. Pages go through a bounded queue
+        # so the scans never run far ahead of a slow consumer.
+        pages: asyncio.Queue = asyncio.Queue(maxsize=2 * len(clients) or 1)
+        done = object()
+
+        async def scan(node_client):
+            try:
+                cursor = 0
+                while True:
+                    cursor, keys = await node_client.execute_command(
+                        "SCAN", cursor, "MATCH", match, "COUNT", page_size
+                    )
+                    if keys:
+                        await pages.put(keys)
+                    if int(cursor) == 0:
+                        break
+            except Exception as err:
+                await pages.put(err)
+                return
+            await pages.put(done)
+
+        # SCAN may return a key more than once while the keyspace rehashes.
+        seen = set()
+        tasks = [asyncio.ensure_future(scan(node_client)) for node_client in clients]
+        try:
+            pending = len(tasks)
+            while pending:
+                page = await pages.get()
+                if page is done:
+                    pending -= 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                for key in page:
+                    if isinstance(key, bytes):
+                        key = key.decode()
+                    if key not in seen:
+                        seen.add(key)
+                        yield key[len(prefix) + 1:-len(":meta")]
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def getCountsPerPriority(self, priorities: list) -> list:
         return await self.scripts.getCountsPerPriority(priorities)
 
@@ -388,6 +521,15 @@ class RedisBackend(Backend):
         )
         return paused_key_exists == 1
 
+    async def getMetrics(self, type: str, start: int = 0, end: int = -1) -> list:
+        metrics_key = self.toKey(f"metrics:{type}")
+        data_key = self.toKey(f"metrics:{type}:data")
+        pipe = self.connection.conn.pipeline(transaction=True)
+        pipe.hmget(metrics_key, "count", "prevTS", "prevCount")
+        pipe.lrange(data_key, start, end)
+        pipe.llen(data_key)
+        return await pipe.execute()
+
     async def getClientList(self) -> list[str]:
         client = self.connection.conn
         if is_redis_cluster(client):
@@ -397,6 +539,60 @@ class RedisBackend(Backend):
             ]
         return [await self._client_list(client)]
 
+    async def publishCancellation(self, job_id: str, reason: Optional[str] = None) -> None:
+        message = json.dumps({"jobId": job_id, "reason": reason}, separators=(",", ":"))
+        await self.connection.conn.publish(self.toKey("cancel"), message)
+
+    async def listenCancellations(self):
+        # Pub/sub takes a connection of its own; the blocking connection is
+        # busy with BZPOPMIN.
+        client = self.connection.conn
+        channel = self.toKey("cancel")
+        node_client = None
+        if not hasattr(client, "pubsub"):
+            # redis-py's async cluster client has no pub/sub, but a PUBLISH
+            # reaches every node of the cluster: subscribe on the primary the
+            # client's slot map currently routes the channel name to.
+            node = client.get_node_from_key(channel)
+            node_client = client = Redis.from_pool(ConnectionPool(
+                connection_class=node.connection_class, **node.connection_kwargs
+            ))
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                request = json.loads(message["data"])
+                yield request["jobId"], request.get("reason")
+        finally:
+            await pubsub.aclose()
+            if node_client is not None:
+                await node_client.aclose()
+
+    async def publishHeartbeat(self, worker_id: str, info: dict, ttl: int) -> None:
+        key = self.toKey("workers")
+        record = dict(info, expiresAt=int(time.time() * 1000) + ttl)
+        pipe = self.connection.conn.pipeline(transaction=True)
+        pipe.hset(key, worker_id, json.dumps(record, separators=(",", ":")))
+        pipe.pexpire(key, max(ttl, _HEARTBEATS_KEY_TTL))
+        await pipe.execute()
+
+    async def removeHeartbeat(self, worker_id: str) -> None:
+        await self.connection.conn.hdel(self.toKey("workers"), worker_id)
+
+    async def getHeartbeats(self) -> list[dict]:
+        # Read only: deleting the expired records here could race a worker
+        # refreshing its own. They go with removeHeartbeat or the key's TTL.
+        records = await self.connection.conn.hgetall(self.toKey("workers"))
+        now = int(time.time() * 1000)
+        live = []
+        for _, raw in sorted(records.items()):
+            record = json.loads(raw)
+            if record.get("expiresAt", 0) > now:
+                live.append(record)
+        return live
+
     async def _client_list(self, client) -> str:
         if hasattr(client, "client_list"):
             return await client.client_list()
@@ -406,14 +602,35 @@ class RedisBackend(Backend):
     # Queue metadata & maintenance keys
     # ============================================================
 
-    async def trimEvents(self, max_length: int) -> Any:
-        return await self.connection.conn.xtrim(
-            self.keys["events"], maxlen=max_length, approximate="~"
-        )
+    async def trimEvents(self, max_length: Optional[int], max_age: Optional[int] = None) -> Any:
+        # XTRIM takes one strategy per call: MAXLEN for the length and MINID
+        # (stream ids start with the entry's millisecond timestamp) for the age.
+        deleted = 0
+        if max_length is not None:
+            deleted += await self.connection.conn.xtrim(
+                self.keys["events"], maxlen=max_length, approximate="~"
+            )
+        if max_age:
+            deleted += await self.connection.conn.xtrim(
+                self.keys["events"], minid=int(time.time() * 1000) - max_age, approximate="~"
+            )
+        return deleted
 
     async def removeDeprecatedPriorityKey(self) -> Any:
         return await self.connection.conn.delete(self.toKey("priority"))
 
+    # ============================================================
+    # Event stream
+    # ============================================================
+
+    async def publishEvent(self, fields: dict, max_events: int) -> str:
+        return await self.conn.xadd(
+            self.keys["events"], fields, maxlen=max_events, approximate=True
+        )
+
+    async def readEvents(self, event_id: str, block_timeout: int) -> Any:
+        return await self.conn.xread({self.keys["events"]: event_id}, block=block_timeout)
+
     # ============================================================
     # Worker blocking primitive
     # ============================================================
@@ -421,6 +638,18 @@ class RedisBackend(Backend):
     async def waitForJob(self, block_timeout: float) -> Any:
         return await self.bclient.bzpopmin(self.keys["marker"], block_timeout)
 
+    async def waitAndClaim(self, token: str, opts: dict, block_timeout: float) -> list:
+        # The marker pop and the claim are separate round trips on Redis, so
+        # this just chains them the way Worker.getNextJob does.
+        marker = await self.waitForJob(block_timeout)
+        block_until = 0
+        if marker:
+            [_key, member, score] = marker
+            block_until = int(score) if member else 0
+        if block_until <= 0 or block_until <= int(time.time() * 1000):
+            return await self.moveToActive(token, opts)
+        return [None, "", 0, block_until]
+
     # ============================================================
     # Job schedulers (repeatable job factories)
     # ============================================================
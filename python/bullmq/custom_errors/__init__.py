@@ -1,2 +1,3 @@
+from bullmq.custom_errors.bulk_add_error import BulkAddError
 from bullmq.custom_errors.unrecoverable_error import UnrecoverableError
 from bullmq.custom_errors.waiting_children_error import WaitingChildrenError
@@ -0,0 +1,9 @@
+class BulkAddError(Exception):
+    "Raised when some jobs of a chunked addBulk could not be added"
+
+    def __init__(self, message: str, jobs: list, errors: dict):
+        super().__init__(message)
+        # Every Job of the call, in input order (failed ones have no id).
+        self.jobs = jobs
+        # Input index -> exception, for each job that could not be added.
+        self.errors = errors
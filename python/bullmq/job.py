@@ -24,6 +24,17 @@ optsDecodeMap = {
 optsEncodeMap = {v: k for k, v in optsDecodeMap.items()}
 
 
+class DecodedJobData(dict):
+    """
+    Raw job fields whose JSON-valued entries (data, opts, progress,
+    returnvalue, stacktrace and parent) already hold decoded Python values.
+
+    Backends whose datastore hands back structured values (e.g. the Postgres
+    jsonb columns psycopg decodes) return this instead of a Redis-hash-shaped
+    map, so Job.fromJSON can skip a redundant encode/decode round trip.
+    """
+
+
 class Job:
     """
     This class represents a Job in the queue. Normally job are implicitly created when
@@ -294,13 +305,21 @@ class Job:
         @param json: the plain object containing the job.
         @param jobId: an optional job id (overrides the id coming from the JSON object)
         """
-        data = json.loads(rawData.get("data", '{}'))
-        opts = optsFromJSON(json.loads(rawData.get("opts", '{}')))
+        decoded = isinstance(rawData, DecodedJobData)
+
+        def load(field: str, default: Any) -> Any:
+            value = rawData.get(field)
+            if value is None:
+                return default
+            return value if decoded else json.loads(value)
+
+        data = load("data", {})
+        opts = optsFromJSON(load("opts", {}))
 
         job = Job(queue, rawData.get("name"), data, opts)
         job.id = jobId or rawData.get("id", b'').decode("utf-8")
 
-        job.progress = json.loads(rawData.get("progress",  '0'))
+        job.progress = load("progress", 0)
         job.delay = int(rawData.get("delay", "0"))
         job.timestamp = int(rawData.get("timestamp", "0"))
 
@@ -327,16 +346,18 @@ class Job:
             job.deferredFailure = rawData.get("defa")
 
         returnvalue = rawData.get("returnvalue")
-        if type(returnvalue) == str:
+        if decoded:
+            job.returnvalue = returnvalue
+        elif type(returnvalue) == str:
             job.returnvalue = getReturnValue(returnvalue)
 
-        job.stacktrace = json.loads(rawData.get("stacktrace", "[]"))
+        job.stacktrace = load("stacktrace", [])
 
         if rawData.get("parentKey"):
             job.parentKey = rawData.get("parentKey")
 
         if rawData.get("parent"):
-            job.parent = json.loads(rawData.get("parent"))
+            job.parent = load("parent", None)
 
         return job
 
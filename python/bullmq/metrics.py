@@ -0,0 +1,47 @@
+from enum import IntEnum
+
+
+class MetricsTime(IntEnum):
+    """
+    Common metrics resolutions, in minutes (the granularity of the stored
+    data points).
+    """
+    ONE_MINUTE = 1
+    FIVE_MINUTES = 5
+    FIFTEEN_MINUTES = 15
+    THIRTY_MINUTES = 30
+    ONE_HOUR = 60
+    ONE_WEEK = 60 * 24 * 7
+    TWO_WEEKS = 60 * 24 * 7 * 2
+    ONE_MONTH = 60 * 24 * 7 * 2 * 4
+
+
+def downsample_metrics(metrics: dict, minutes: int) -> dict:
+    """
+    Rolls up the per-minute points returned by ``Queue.getMetrics`` into
+    buckets of ``minutes`` minutes (e.g. ``MetricsTime.ONE_HOUR``).
+
+    The newest point covers the minute before ``meta.prevTS``, so buckets are
+    aligned to wall-clock boundaries (whole hours for 60) and the newest and
+    oldest buckets may be partial. Without a ``prevTS`` the points are simply
+    grouped in runs of ``minutes``. Data stays newest first and ``count``
+    becomes the number of buckets.
+    """
+    if minutes < 1:
+        raise ValueError("minutes must be a positive number")
+
+    data = metrics.get("data") or []
+    prev_ts = metrics.get("meta", {}).get("prevTS") or 0
+    # Minute index (since the epoch) of the newest point.
+    newest = prev_ts // 60000 - 1 if prev_ts else minutes - 1
+
+    buckets = []
+    current = None
+    for offset, point in enumerate(data):
+        bucket = (newest - offset) // minutes
+        if bucket != current:
+            buckets.append(0)
+            current = bucket
+        buckets[-1] += point
+
+    return {"meta": dict(metrics.get("meta", {})), "data": buckets, "count": len(buckets)}
@@ -11,11 +11,17 @@ read straight from ``src/postgres`` so there is never a duplicate to keep in
 sync. In a published wheel that source tree is absent, so the files bundled next
 to this module (copied at build time by ``copy_scripts.sh``, git-ignored like
 the Redis ``.lua`` scripts) are used instead.
+
+The files use native ``$1`` numbered placeholders while psycopg binds ``%s``;
+:func:`load_pyformat_command` caches each command's translated text so the hot
+path never parses SQL in Python.
 """
 
 from __future__ import annotations
 
 import os
+import re
+from typing import Optional
 
 _MODULE_DIR = os.path.dirname(os.path.realpath(__file__))
 _MAX_ANCESTOR_DEPTH = 8
@@ -47,8 +53,15 @@ _COMMANDS_DIR = os.path.join(_SQL_ROOT, "commands")
 _MIGRATIONS_DIR = os.path.join(_SQL_ROOT, "migrations")
 
 _command_cache: dict[str, str] = {}
+_pyformat_cache: dict[str, tuple[str, Optional[tuple[int, ...]]]] = {}
 _migration_cache: dict[str, str] = {}
 
+_PLACEHOLDER_RE = re.compile(r"\$(\d+)")
+
+# ``--`` line comments (the command files describe their ``$N`` params in a
+# header comment, which must not be mistaken for real placeholders).
+_LINE_COMMENT_RE = re.compile(r"--[^\n]*")
+
 
 def load_command(name: str) -> str:
     """Load a runtime command's SQL by name (without the ``.sql`` extension)."""
@@ -64,6 +77,36 @@ def load_command(name: str) -> str:
     return sql
 
 
+def to_pyformat(sql: str) -> tuple[str, Optional[tuple[int, ...]]]:
+    """Rewrite ``$N`` placeholders to ``%s`` (escaping any literal ``%``).
+
+    Returns the query and, for each ``%s`` in order, the zero-based index of
+    the parameter it binds — or ``None`` when that is simply ``0, 1, 2, ...``
+    so callers can pass their parameter list through untouched.
+    """
+    sql = _LINE_COMMENT_RE.sub("", sql)
+    out: list[str] = []
+    order: list[int] = []
+    last = 0
+    for match in _PLACEHOLDER_RE.finditer(sql):
+        out.append(sql[last:match.start()].replace("%", "%%"))
+        out.append("%s")
+        order.append(int(match.group(1)) - 1)
+        last = match.end()
+    out.append(sql[last:].replace("%", "%%"))
+    identity = order == list(range(len(order)))
+    return "".join(out), None if identity else tuple(order)
+
+
+def load_pyformat_command(name: str) -> tuple[str, Optional[tuple[int, ...]]]:
+    """Load a runtime command already translated by :func:`to_pyformat`."""
+    translated = _pyformat_cache.get(name)
+    if translated is None:
+        translated = to_pyformat(load_command(name))
+        _pyformat_cache[name] = translated
+    return translated
+
+
 def load_migration(file: str) -> str:
     """Load a migration's SQL from its ``.sql`` file."""
     sql = _migration_cache.get(file)
@@ -83,3 +126,9 @@ def migration_files() -> list[str]:
     return sorted(
         f for f in os.listdir(_MIGRATIONS_DIR) if f.endswith(".sql")
     )
+
+
+def latest_migration_version() -> int:
+    """Return the version of the newest bundled migration (0 if none)."""
+    files = migration_files()
+    return int(files[-1].split("_", 1)[0]) if files else 0
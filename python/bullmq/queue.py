@@ -1,11 +1,36 @@
-import asyncio
+from collections.abc import AsyncIterable, Iterable
 from typing import Union
 
 from bullmq.event_emitter import EventEmitter
-from bullmq.types import QueueBaseOptions, RetryJobsOptions, JobOptions, PromoteJobsOptions
-from bullmq.utils import extract_result
+from bullmq.types import QueueBaseOptions, RetryJobsOptions, JobOptions, PromoteJobsOptions, AddBulkOptions
+from bullmq.custom_errors import BulkAddError
 from bullmq.backends import RedisBackend, create_backend
 from bullmq.job import Job
+from bullmq.add_batcher import AddBatcher
+
+
+def sanitize_job_types(types):
+    current_types = list(types)
+
+    if len(types) > 0:
+        set_res = set(current_types)
+        list_res = (list(set_res))
+
+        return list_res
+    return [
+        'active',
+        'completed',
+        'delayed',
+        'failed',
+        'prioritized',
+        'waiting',
+        'waiting-children'
+    ]
+
+
+async def _as_async_iterable(items: Iterable):
+    for item in items:
+        yield item
 
 
 class Queue(EventEmitter):
@@ -33,44 +58,136 @@ class Queue(EventEmitter):
         self.keys = self.backend.keys
         self.qualifiedName = self.backend.qualifiedName
         self._job_scheduler = None
+        batching = opts.get("addBatching")
+        self._add_batcher = AddBatcher(
+            self.backend, batching.get("maxJobs", 100), batching.get("maxDelay", 1)
+        ) if batching is not None else None
 
     def toKey(self, type: str):
         return self.backend.toKey(type)
 
-    async def add(self, name: str, data, opts: JobOptions = {}):
+    async def add(self, name: str, data, opts: JobOptions = {}, connection=None):
         """
         Adds a new job to the queue.
 
         @param name: Name of the job to be added to the queue,.
         @param data: Arbitrary data to append to the job.
         @param opts: Job options that affects how the job is going to be processed.
+        @param connection: PostgreSQL only: a psycopg AsyncConnection (or
+            AsyncTransaction) of the caller's to add the job on. The job then
+            commits or rolls back with the caller's transaction, and workers
+            are only woken up once it commits.
         """
         merged_opts = {**self.jobsOpts, **(opts or {})}
 
         job = Job(self, name, data, merged_opts)
-        job_id = await self.backend.addJob(job)
+        if connection is not None:
+            job_id = await self.backend.withConnection(connection).addJob(job)
+        elif self._add_batcher is not None:
+            job_id = await self._add_batcher.add(job)
+        else:
+            job_id = await self.backend.addJob(job)
         job.id = job_id
         return job
 
-    async def addBulk(self, jobs: list[dict[str, Union[dict, str]]]):
+    async def addBulk(
+        self,
+        jobs: list[dict[str, Union[dict, str]]],
+        opts: AddBulkOptions = {},
+        connection=None,
+    ):
         """
         Adds an array of jobs to the queue. This method may be faster than adding
         one job at a time in a sequence
+
+        By default the whole array is added atomically. With a chunkSize (and
+        not atomic) it is sent as independent chunks, up to maxInflightChunks
+        at a time; jobs that could not be added are reported together in a
+        BulkAddError once every chunk has been sent.
+
+        With a (PostgreSQL only) caller connection, as in add, the jobs are
+        added atomically inside the caller's transaction and chunking options
+        are ignored.
         """
-        job_instances = []
-        for job in jobs:
-            current_job_opts = {**self.jobsOpts, **(job.get("opts") or {})}
-            job_instances.append(Job(
-                queue=self,
-                name=job.get("name"),
-                data=job.get("data"),
-                opts=current_job_opts,
-                job_id=current_job_opts.get("jobId")
-            ))
-
-        await self.backend.addJobs(job_instances)
+        for option in ("chunkSize", "maxInflightChunks"):
+            value = opts.get(option)
+            if value is not None and (type(value) is not int or value < 1):
+                raise ValueError(f"BullMQ: {option} must be a positive integer")
+
+        job_instances = [self._bulkJob(job) for job in jobs]
+
+        if connection is not None:
+            await self.backend.withConnection(connection).addJobs(job_instances)
+            return job_instances
+
+        chunk_size = opts.get("chunkSize")
+        if not chunk_size or opts.get("atomic"):
+            await self.backend.addJobs(job_instances)
+            return job_instances
+
+        results = await self.backend.addJobsChunked(
+            job_instances, chunk_size, opts.get("maxInflightChunks", 1)
+        )
+        errors = {}
+        for index, (job, result) in enumerate(zip(job_instances, results)):
+            if isinstance(result, Exception):
+                errors[index] = result
+            else:
+                job.id = result
+        if errors:
+            raise BulkAddError(
+                f"{len(errors)} of {len(job_instances)} jobs could not be added",
+                job_instances,
+                errors,
+            )
         return job_instances
 
+    async def addBulkStream(
+        self,
+        jobs: Union[AsyncIterable[dict], Iterable[dict]],
+        chunk_size: int = 10000,
+    ) -> int:
+        """
+        Adds a (possibly huge) stream of jobs to the queue, chunk by chunk, for
+        imports too large to hold in memory or to send as one addBulk.
+
+        On Postgres each chunk is loaded with a binary COPY and moved into the
+        queue with one set-based statement; on Redis each chunk is sent as one
+        (non-transactional) pipeline. Chunks are not atomic with each other and
+        the ids of the added jobs are not returned.
+
+        @param jobs: An iterable or async iterable of dicts with the same shape
+            as the addBulk entries (name, data, opts).
+        @param chunk_size: How many jobs to send per round trip.
+        @returns: The number of jobs consumed from the stream.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than 0")
+
+        count = 0
+        chunk = []
+        stream = jobs if isinstance(jobs, AsyncIterable) else _as_async_iterable(jobs)
+        async for job in stream:
+            chunk.append(self._bulkJob(job))
+            if len(chunk) >= chunk_size:
+                await self.backend.ingestJobs(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            await self.backend.ingestJobs(chunk)
+            count += len(chunk)
+        return count
+
+    def _bulkJob(self, job: dict) -> Job:
+        current_job_opts = {**self.jobsOpts, **(job.get("opts") or {})}
+        return Job(
+            queue=self,
+            name=job.get("name"),
+            data=job.get("data"),
+            opts=current_job_opts,
+            job_id=current_job_opts.get("jobId")
+        )
+
     def pause(self):
         """
         Pauses the processing of this queue globally.
@@ -186,12 +303,49 @@ class Queue(EventEmitter):
         """
         return await self.client.hdel(self.keys["meta"], "max", "duration")
 
+    async def getMetrics(self, type: str, start: int = 0, end: int = -1):
+        """
+        Get queue metrics related to the queue.
+
+        The metrics are represented as a list of job counts per unit of time
+        (1 minute), newest first. Use `downsample_metrics` for coarser
+        resolutions.
+
+        @param type: "completed" or "failed".
+        @param start: Start point of the metrics, where 0 is the newest point.
+        @param end: End point of the metrics, where -1 is the oldest point.
+
+        @returns: An object with the metrics meta (count, prevTS, prevCount),
+        the data points and the total number of stored points.
+        """
+        meta, data, count = await self.backend.getMetrics(type, start, end)
+
+        return {
+            "meta": {
+                "count": int(meta[0] or 0),
+                "prevTS": int(meta[1] or 0),
+                "prevCount": int(meta[2] or 0),
+            },
+            "data": [int(point or 0) for point in data],
+            "count": int(count or 0),
+        }
+
     async def get_workers(self):
         """
         Get the worker list related to the queue. i.e. all the known
         workers that are available to process jobs for this queue.
+
+        With the `workerRegistry` option, the workers started with
+        `heartbeatInterval` are read from the queue's worker registry in a
+        single call, with their live counters. Otherwise (or when none is
+        registered) the workers are found by their client names in CLIENT LIST.
         Note: Some Redis providers do not support CLIENT LIST.
         """
+        if self.opts.get("workerRegistry"):
+            heartbeats = await self.backend.getHeartbeats()
+            if heartbeats:
+                return heartbeats
+
         client_name_prefix = self.backend.clientName()
 
         def matcher(name: str):
@@ -317,13 +471,21 @@ class Queue(EventEmitter):
             if cursor is None or cursor == 0 or cursor == "0":
                 break
 
-    def trimEvents(self, maxLength: int):
+    def trimEvents(self, maxLength: int = None, maxAge: int = None):
         """
-        Trim the event stream to an approximately maxLength.
+        Trim the event stream to an approximately maxLength, dropping events
+        older than maxAge milliseconds as well when given. Both default to the
+        queue's `streams.events` options.
 
         @param maxLength:
+        @param maxAge:
         """
-        return self.backend.trimEvents(maxLength)
+        events = (self.opts.get("streams") or {}).get("events") or {}
+        if maxLength is None:
+            maxLength = events.get("maxLen")
+        if maxAge is None:
+            maxAge = events.get("maxAge")
+        return self.backend.trimEvents(maxLength, maxAge)
 
     def removeDeprecatedPriorityKey(self):
         """
@@ -436,34 +598,44 @@ class Queue(EventEmitter):
             return jobs
 
         job_ids = await self.backend.getRanges(current_types, start, end, asc)
-        tasks = [asyncio.create_task(Job.fromId(self, i)) for i in job_ids]
-        job_set, _ = await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
-        return [extract_result(job_task, self.emit) for job_task in job_set]
+        return await self.getJobsByIds(job_ids)
 
-    def sanitizeJobTypes(self, types):
-        current_types = list(types)
-
-        if len(types) > 0:
-            set_res = set(current_types)
-            list_res = (list(set_res))
+    async def getJobsByIds(self, job_ids: list[str]):
+        """
+        Returns the jobs with the given ids, fetched in a single round trip.
 
-            return list_res
+        @param job_ids: The ids of the jobs to fetch.
+        @returns: A list aligned with `job_ids`, with None for missing jobs.
+        """
+        raw_jobs = await self.backend.getJobsByIds(job_ids)
         return [
-            'active',
-            'completed',
-            'delayed',
-            'failed',
-            'prioritized',
-            'waiting',
-            'waiting-children'
+            Job.fromJSON(self, raw_data, job_id) if raw_data else None
+            for job_id, raw_data in zip(job_ids, raw_jobs)
         ]
 
+    def sanitizeJobTypes(self, types):
+        return sanitize_job_types(types)
+
     async def close(self):
         """
         Close the queue instance.
         """
+        if self._add_batcher is not None:
+            await self._add_batcher.close()
         return await self.backend.close()
 
+    async def cancelJob(self, job_id: str, reason: str = None):
+        """
+        Ask the workers of this queue to cancel the active job `job_id`.
+
+        The request is broadcast (Redis pub/sub, PostgreSQL NOTIFY) and the
+        worker holding the job aborts its `AbortSignal` within milliseconds,
+        like `Worker.cancelJob` on that worker would. Cancellation is best
+        effort and cooperative: only processors declared with a `signal`
+        parameter are cancelled, and a job that is not active is unaffected.
+        """
+        await self.backend.publishCancellation(job_id, reason)
+
     def remove(self, job_id: str, opts: dict = {}):
         return self.backend.remove(job_id, opts.get("removeChildren", True))
 
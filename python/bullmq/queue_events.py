@@ -4,12 +4,14 @@ QueueEvents — consume the global event stream of a BullMQ queue.
 Port of `src/classes/queue-events.ts`. The queue's Lua scripts and the
 worker XADD-publish lifecycle events (added/active/completed/failed/...)
 to a Redis stream at `{prefix}:{queueName}:events`. `QueueEvents`
-subscribes to that stream with a blocking XREAD and re-emits each
-entry through a Python `EventEmitter` so callers can wire listeners
-in a way that mirrors the Node API.
+reads that stream through its backend's `readEvents` (a blocking XREAD
+on Redis) and re-emits each entry through a Python `EventEmitter` so
+callers can wire listeners in a way that mirrors the Node API. With
+`backend: "postgres"` the stream is the `event` table, read by id
+cursor whenever a LISTEN/NOTIFY wakeup arrives.
 
 Key design points:
-- The consumer must own a dedicated Redis connection. A blocking
+- The consumer must own a dedicated backend. A blocking
   `XREAD BLOCK` ties up the underlying socket, so reusing it for
   other commands would deadlock.
 - Two emissions per event, mirroring Node: a generic channel
@@ -25,12 +27,10 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Optional, Union
-
-import redis.asyncio as redis
+from typing import Optional
 
+from bullmq.backends import RedisBackend, create_backend
 from bullmq.event_emitter import EventEmitter
-from bullmq.queue_keys import QueueKeys
 from bullmq.redis_connection import RedisConnection
 from bullmq.types.queue_events_options import QueueEventsOptions
 from bullmq.utils import isRedisVersionLowerThan
@@ -69,24 +69,21 @@ class QueueEvents(EventEmitter):
         self.opts = opts
         self.prefix = opts.get("prefix", "bull")
 
-        connection_opts: Union[dict, str, redis.Redis] = opts.get(
-            "connection", {}
-        )
-        # `RedisConnection` calls `register_script` for every BullMQ
-        # Lua script on construction. We don't use any of them here,
-        # but `register_script` in redis-py only computes/caches the
-        # SHA client-side -- there's no `SCRIPT LOAD` round-trip until
-        # someone actually calls `EVALSHA`. The extra work is therefore
-        # local, bounded, and dominated by the connection setup itself.
-        self.redisConnection = RedisConnection(
-            connection_opts,
-            skipVersionCheck=opts.get("skipVersionCheck", False),
+        # On Redis the backend's `RedisConnection` calls
+        # `register_script` for every BullMQ Lua script on construction.
+        # We don't use any of them here, but `register_script` in
+        # redis-py only computes/caches the SHA client-side -- there's
+        # no `SCRIPT LOAD` round-trip until someone actually calls
+        # `EVALSHA`. The extra work is therefore local, bounded, and
+        # dominated by the connection setup itself.
+        self.backend = create_backend(name, opts)
+        self.redisConnection = (
+            self.backend.connection if isinstance(self.backend, RedisBackend) else None
         )
-        self.client = self.redisConnection.conn
+        self.client = getattr(self.backend, "conn", None)
 
-        queue_keys = QueueKeys(self.prefix)
-        self.keys = queue_keys.getKeys(name)
-        self.qualifiedName = queue_keys.getQueueQualifiedName(name)
+        self.keys = self.backend.keys
+        self.qualifiedName = self.backend.qualifiedName
 
         self.running = False
         self.closing = False
@@ -126,14 +123,15 @@ class QueueEvents(EventEmitter):
         # Validate Redis supports Streams (>= 5.0). `skipVersionCheck=True`
         # bypasses the INFO round-trip for cases where the caller knows
         # the server is compatible.
-        version = await self.redisConnection.getRedisVersion()
-        if version and isRedisVersionLowerThan(
-            version, RedisConnection.minimum_version
-        ):
-            raise RuntimeError(
-                f"Redis version {version} is below the minimum required "
-                f"({RedisConnection.minimum_version}) for QueueEvents."
-            )
+        if self.redisConnection is not None:
+            version = await self.redisConnection.getRedisVersion()
+            if version and isRedisVersionLowerThan(
+                version, RedisConnection.minimum_version
+            ):
+                raise RuntimeError(
+                    f"Redis version {version} is below the minimum required "
+                    f"({RedisConnection.minimum_version}) for QueueEvents."
+                )
 
         self.running = True
         try:
@@ -143,17 +141,14 @@ class QueueEvents(EventEmitter):
 
     async def _consume_events(self) -> None:
         """Block on the events stream and re-emit each entry."""
-        key = self.keys["events"]
         last_id = self.opts.get("lastEventId") or "$"
-        # redis-py's xread takes block in ms with decode_responses on,
-        # matching ioredis' BLOCK argument.
+        # The block timeout stays in ms, matching ioredis' BLOCK
+        # argument.
         block_ms = int(self.opts.get("blockingTimeout", 10000))
 
         while not self.closing:
             try:
-                data = await self.client.xread(
-                    {key: last_id}, block=block_ms
-                )
+                data = await self.backend.readEvents(last_id, block_ms)
             except asyncio.CancelledError:
                 raise
             except Exception as err:
@@ -171,7 +166,8 @@ class QueueEvents(EventEmitter):
                 # re-check the closing flag so close() stays responsive.
                 continue
 
-            # redis-py returns: [(stream_name, [(id, {field: value, ...}), ...])]
+            # Backends return the redis-py XREAD shape:
+            # [(stream_name, [(id, {field: value, ...}), ...])]
             _, entries = data[0]
             for entry_id, fields in entries:
                 last_id = entry_id
@@ -211,7 +207,7 @@ class QueueEvents(EventEmitter):
 
     async def close(self) -> None:
         """
-        Stop consuming events and release the Redis connection.
+        Stop consuming events and release the backend's connection.
         Idempotent: subsequent calls are no-ops. Works for both
         `autorun=True` (we own the task) and `autorun=False` (the
         caller spawned `events.run()` themselves — `run` auto-registers
@@ -231,9 +227,10 @@ class QueueEvents(EventEmitter):
             and not task.done()
             and task is not asyncio.current_task()
         ):
-            # XREAD BLOCK is parked on the socket; cancel forces it to
-            # unwind. We swallow CancelledError because that's exactly
-            # what we asked for.
+            # The blocking read is parked on the socket (or on a
+            # notification wait); cancel forces it to unwind. We
+            # swallow CancelledError because that's exactly what we
+            # asked for.
             task.cancel()
             try:
                 await task
@@ -245,6 +242,6 @@ class QueueEvents(EventEmitter):
                 pass
 
         try:
-            await self.redisConnection.close()
+            await self.backend.close()
         finally:
             self.closed = True
@@ -4,16 +4,16 @@ QueueEventsProducer — publish custom events to a queue's event stream.
 Port of `src/classes/queue-events-producer.ts`. Useful for surfacing
 application-level lifecycle events on the same stream that
 `QueueEvents` consumes, so dashboards and progress UIs see them
-uniformly with the framework-emitted events.
+uniformly with the framework-emitted events. Events go through the
+backend's `publishEvent`, so `backend: "postgres"` appends them to the
+`event` table that a Postgres `QueueEvents` reads.
 """
 
 from __future__ import annotations
 
-from typing import Optional, Union
+from typing import Optional
 
-import redis.asyncio as redis
-
-from bullmq.queue_keys import QueueKeys
+from bullmq.backends import RedisBackend, create_backend
 from bullmq.redis_connection import RedisConnection
 from bullmq.types.queue_events_options import QueueEventsProducerOptions
 from bullmq.utils import isRedisVersionLowerThan
@@ -36,18 +36,14 @@ class QueueEventsProducer:
         self.opts = opts
         self.prefix = opts.get("prefix", "bull")
 
-        connection_opts: Union[dict, str, redis.Redis] = opts.get(
-            "connection", {}
-        )
-        self.redisConnection = RedisConnection(
-            connection_opts,
-            skipVersionCheck=opts.get("skipVersionCheck", False),
+        self.backend = create_backend(name, opts)
+        self.redisConnection = (
+            self.backend.connection if isinstance(self.backend, RedisBackend) else None
         )
-        self.client = self.redisConnection.conn
+        self.client = getattr(self.backend, "conn", None)
 
-        queue_keys = QueueKeys(self.prefix)
-        self.keys = queue_keys.getKeys(name)
-        self.qualifiedName = queue_keys.getQueueQualifiedName(name)
+        self.keys = self.backend.keys
+        self.qualifiedName = self.backend.qualifiedName
 
         self.closing = False
         # Cached on first publishEvent() so we don't pay the INFO
@@ -57,7 +53,7 @@ class QueueEventsProducer:
     async def _validate_redis_version(self) -> None:
         """Lazily ensure the connected Redis supports Streams (>= 5.0).
         Honours `skipVersionCheck` via the underlying RedisConnection."""
-        if self._version_validated:
+        if self._version_validated or self.redisConnection is None:
             return
         version = await self.redisConnection.getRedisVersion()
         if version and isRedisVersionLowerThan(
@@ -98,16 +94,11 @@ class QueueEventsProducer:
                 continue
             fields[k] = v
 
-        await self.client.xadd(
-            self.keys["events"],
-            fields,
-            maxlen=maxEvents,
-            approximate=True,
-        )
+        await self.backend.publishEvent(fields, maxEvents)
 
     async def close(self) -> None:
-        """Close the underlying Redis connection."""
+        """Close the underlying backend connection."""
         if self.closing:
             return
         self.closing = True
-        await self.redisConnection.close()
+        await self.backend.close()
@@ -0,0 +1,112 @@
+"""
+Read-only view over many queues that share a prefix (Redis) or schema
+(PostgreSQL), for dashboards that poll hundreds of queues at once.
+
+Queues are discovered with ``listQueues``. Counts for every queue are fetched
+in one round trip on a single connection, and identical requests made within
+``cache_ttl`` milliseconds (or while one is still in flight) share the same
+result. Every caller gets its own copy of it.
+"""
+
+import asyncio
+import time
+
+from bullmq.backends import create_backend
+from bullmq.queue import sanitize_job_types
+from bullmq.types import QueueBaseOptions
+
+# Snapshots kept at most; the oldest are dropped first.
+_CACHE_MAX_ENTRIES = 1000
+
+
+class QueueRegistry:
+    """
+    Instantiate a QueueRegistry object
+    """
+
+    def __init__(self, opts: QueueBaseOptions = {}, cache_ttl: float = 0):
+        """
+        @param opts: The same connection options (and `prefix` / `backend`)
+                     the queues were created with.
+        @param cache_ttl: Milliseconds a snapshot is reused for identical
+                          requests. 0 disables caching.
+        """
+        self.opts = opts
+        self.prefix = opts.get("prefix", "bull")
+        self.cache_ttl = cache_ttl / 1000
+        self.backend = create_backend("", opts)
+        self._cache: dict = {}
+
+    async def getJobCountsForQueues(self, names, *types):
+        """
+        Returns the job counts of every given queue, for each type specified
+        or every list/set by default.
+
+        @returns: An object, key (queue name) and value (an object, key (type)
+        and value (count))
+        """
+        names = list(dict.fromkeys(names))
+        current_types = sanitize_job_types(types)
+        cache_key = (tuple(names), tuple(current_types))
+
+        cached = self._cache.get(cache_key)
+        if cached is not None and (cached[0] is None or cached[0] > time.monotonic()):
+            return _copy_counts(await asyncio.shield(cached[1]))
+
+        future = asyncio.ensure_future(self._fetch(names, current_types))
+        self._store(cache_key, None, future)
+        try:
+            result = await asyncio.shield(future)
+        except BaseException:
+            if self._cache.get(cache_key, (None, None))[1] is future:
+                del self._cache[cache_key]
+            raise
+        if self.cache_ttl > 0:
+            self._store(cache_key, time.monotonic() + self.cache_ttl, future)
+        elif self._cache.get(cache_key, (None, None))[1] is future:
+            del self._cache[cache_key]
+        return _copy_counts(result)
+
+    def _store(self, cache_key: tuple, expires_at, future: asyncio.Future) -> None:
+        # Drops the expired snapshots, then the oldest ones beyond the cap.
+        now = time.monotonic()
+        for key in [k for k, (expiry, _) in self._cache.items() if expiry is not None and expiry <= now]:
+            del self._cache[key]
+        self._cache.pop(cache_key, None)
+        self._cache[cache_key] = (expires_at, future)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
+
+    async def _fetch(self, names: list, types: list) -> dict:
+        responses = await self.backend.getCountsForQueues(names, types)
+        return {
+            name: {t: val or 0 for t, val in zip(types, counts)}
+            for name, counts in zip(names, responses)
+        }
+
+    async def listQueues(self, prefix: str = None):
+        """
+        Stream the names of the queues that exist under `prefix` (the
+        registry's prefix by default), without blocking the datastore: Redis
+        is walked with incremental SCANs on every cluster node in parallel,
+        PostgreSQL in keyset-paginated pages of the schema's queues.
+        """
+        async for name in self.backend.listQueues(prefix):
+            yield name
+
+    def clearCache(self):
+        """
+        Drop the cached snapshots.
+        """
+        self._cache.clear()
+
+    async def close(self):
+        """
+        Close the registry connection.
+        """
+        self._cache.clear()
+        return await self.backend.close()
+
+
+def _copy_counts(counts: dict) -> dict:
+    return {name: dict(by_type) for name, by_type in counts.items()}
@@ -4,9 +4,15 @@ from bullmq.types.job_options import JobOptions
 from bullmq.types.deduplication_options import DeduplicationOptions
 from bullmq.types.promote_jobs_options import PromoteJobsOptions
 from bullmq.types.queue_events_options import QueueEventsOptions, QueueEventsProducerOptions
-from bullmq.types.queue_options import QueueBaseOptions
+from bullmq.types.queue_options import (
+    QueueBaseOptions,
+    AddBatchingOptions,
+    EventStreamOptions,
+    StreamsOptions,
+)
 from bullmq.types.worker_options import WorkerOptions
 from bullmq.types.retry_jobs_options import RetryJobsOptions
+from bullmq.types.add_bulk_options import AddBulkOptions
 from bullmq.types.repeat_options import (
     RepeatOptions,
     JobSchedulerJson,
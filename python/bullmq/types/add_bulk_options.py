@@ -0,0 +1,25 @@
+from typing import TypedDict
+
+
+class AddBulkOptions(TypedDict, total=False):
+    """
+    Options for the addBulk method.
+    """
+
+    chunkSize: int
+    """
+    Send the jobs in independent chunks of this size instead of one atomic
+    batch, so a big import never blocks the datastore for its whole length.
+    """
+
+    maxInflightChunks: int
+    """
+    How many chunks may be in flight at once (over pooled connections).
+    Default 1.
+    """
+
+    atomic: bool
+    """
+    Add all the jobs in one atomic batch (the default when chunkSize is not
+    given), ignoring chunkSize.
+    """
@@ -4,6 +4,53 @@ import redis.asyncio as redis
 from bullmq.types.job_options import JobOptions
 
 
+class AddBatchingOptions(TypedDict, total=False):
+    """
+    Options for coalescing concurrent Queue.add calls into bulk adds.
+    """
+
+    maxJobs: int
+    """
+    Send the pending jobs as soon as this many are waiting.
+
+    @default 100
+    """
+
+    maxDelay: float
+    """
+    Milliseconds (fractions allowed) a job may wait for others to join its
+    batch.
+
+    @default 1
+    """
+
+
+class EventStreamOptions(TypedDict, total=False):
+    """
+    Retention of a queue's event stream.
+    """
+
+    maxLen: int
+    """
+    Approximate number of the most recent events kept.
+
+    @default 10000
+    """
+
+    maxAge: int
+    """
+    Milliseconds after which events are dropped. No age limit by default.
+    """
+
+
+class StreamsOptions(TypedDict, total=False):
+    """
+    Options for the queue's streams.
+    """
+
+    events: EventStreamOptions
+
+
 class QueueBaseOptions(TypedDict, total=False):
     """
     Options for the Queue class.
@@ -39,3 +86,24 @@ class QueueBaseOptions(TypedDict, total=False):
     @deprecated This option has no effect and will be removed in a future release.
     @default False
     """
+
+    streams: StreamsOptions
+    """
+    Event stream retention used by trimEvents and, on the PostgreSQL backend,
+    by the automatic trimming that runs as jobs are added.
+    """
+
+    addBatching: AddBatchingOptions
+    """
+    Opt in to coalescing concurrent add calls into bulk adds. Each call still
+    resolves with its own job.
+    """
+
+    workerRegistry: bool
+    """
+    Make get_workers read the heartbeat records of the workers started with
+    `heartbeatInterval` instead of CLIENT LIST. On PostgreSQL it also enables
+    the `workerRegistry` storage layout.
+
+    @default False
+    """
@@ -59,6 +59,18 @@ class WorkerOptions(TypedDict, total=False):
     @default lockDuration / 2
     """
 
+    heartbeatInterval: int
+    """
+    Milliseconds between the heartbeats the worker publishes to the queue's
+    worker registry (id, name, concurrency, active jobs, processed counters),
+    which `Queue.get_workers` reads instead of CLIENT LIST when the queue has
+    the `workerRegistry` option. A worker that
+    misses three heartbeats drops out of the registry. On PostgreSQL it also
+    enables the `workerRegistry` storage layout. 0 disables heartbeats.
+
+    @default 0
+    """
+
     prefix: str
     """
     Prefix for all queue keys.
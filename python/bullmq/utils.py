@@ -1,6 +1,7 @@
+import asyncio
 import json
 import traceback
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import semver
 
@@ -92,3 +93,31 @@ def get_node_client(node: Any) -> Any:
         if hasattr(node, attr):
             return getattr(node, attr)
     return node
+
+
+async def send_in_chunks(
+    items: list[Any],
+    chunk_size: int,
+    max_inflight_chunks: int,
+    send: Callable[[list[Any]], Awaitable[list[Any]]],
+) -> list[Any]:
+    """
+    Splits ``items`` into chunks of ``chunk_size`` and awaits ``send`` for each
+    chunk, keeping at most ``max_inflight_chunks`` in flight.
+
+    ``send`` returns one result per item of its chunk; if it raises, every item
+    of that chunk gets the exception as its result instead. The results are
+    returned flattened, aligned with ``items``.
+    """
+    semaphore = asyncio.Semaphore(max(max_inflight_chunks, 1))
+
+    async def send_chunk(chunk: list[Any]) -> list[Any]:
+        async with semaphore:
+            try:
+                return await send(chunk)
+            except Exception as err:
+                return [err] * len(chunk)
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+    return [result for chunk_results in results for result in chunk_results]
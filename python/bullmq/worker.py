@@ -15,6 +15,7 @@ from bullmq.types import WorkerOptions
 from bullmq.utils import extract_result
 
 import asyncio
+import contextlib
 import errno
 import functools
 import inspect
@@ -22,6 +23,8 @@ import re
 import traceback
 import time
 import math
+import os
+import socket
 
 maximum_block_timeout = 10
 # 1 millisecond is chosen because the granularity of our timestamps are milliseconds.
@@ -34,6 +37,9 @@ minimum_block_timeout = 0.001
 # Node.js implementation for the same purpose.
 short_retry_delay = 0.1
 
+# A worker's heartbeat record outlives this many missed heartbeats.
+heartbeat_ttl_factor = 3
+
 # Errnos that indicate a transient/retryable network failure. Used by
 # Worker.isConnectionError to classify bare OSErrors raised before the
 # redis client has a chance to wrap them.
@@ -142,6 +148,11 @@ class Worker(EventEmitter):
             f":w:{self.workerName}" if self.workerName else ""
         )
         self._client_name_set = False
+        self.heartbeatTimer = None
+        self.cancellationListener = None
+        self.startedAt = int(time.time() * 1000)
+        self.completedCount = 0
+        self.failedCount = 0
 
         self.lockManager = LockManager(
             self,
@@ -162,8 +173,17 @@ class Worker(EventEmitter):
         await self._ensure_client_names()
 
         self.lockManager.start()
+        # Only processors that take an AbortSignal can be cancelled, so only
+        # their workers listen for `Queue.cancelJob` requests.
+        if self._processor_wants_signal:
+            self.cancellationListener = asyncio.ensure_future(self.listenCancellations())
         self.stalledCheckTimer = Timer(self.opts.get(
             "stalledInterval") / 1000, self.runStalledJobsCheck, self.emit)
+        heartbeat_interval = self.opts.get("heartbeatInterval") or 0
+        if heartbeat_interval > 0:
+            await self.publishHeartbeat()
+            self.heartbeatTimer = Timer(
+                heartbeat_interval / 1000, self.publishHeartbeat, self.emit)
         self.running = True
         jobs = []
 
@@ -213,11 +233,14 @@ class Worker(EventEmitter):
             # lock renewal task and stalled-check timer would keep hitting
             # Redis after run() has given up.
             self.running = False
-            if self.stalledCheckTimer is not None:
-                try:
-                    self.stalledCheckTimer.stop()
-                except Exception:
-                    pass
+            for timer in (self.stalledCheckTimer, self.heartbeatTimer):
+                if timer is not None:
+                    try:
+                        timer.stop()
+                    except Exception:
+                        pass
+            if self.cancellationListener is not None:
+                self.cancellationListener.cancel()
             await self.lockManager.close()
 
     async def getNextJob(self, token: str):
@@ -228,7 +251,14 @@ class Worker(EventEmitter):
         """
         await self._ensure_client_names()
         job_instance = None
-        if not self.waiting and self.drained:
+        if not self.waiting and self.drained and self.backend.capabilities.get("canWaitAndClaim", False):
+            self.waiting = self.waitAndClaim(token)
+
+            try:
+                job_instance = await self.waiting
+            finally:
+                self.waiting = None
+        elif not self.waiting and self.drained:
             self.waiting = self.waitForJob()
 
             try:
@@ -330,11 +360,37 @@ class Worker(EventEmitter):
         )
 
     async def waitForJob(self) -> int:
+        result = await self._blockingWait(self.backend.waitForJob)
+        if result:
+            [_key, member, score] = result
+
+            if member:
+                return int(score)
+            else:
+                return 0
+        return 0
+
+    async def waitAndClaim(self, token: str):
+        """
+        Blocks until a job can be claimed and claims it in the same step, for
+        backends advertising the ``canWaitAndClaim`` capability. Saves the
+        separate moveToActive round trip after every wake-up, and a worker
+        that loses the race for a job keeps waiting instead of probing again.
+        """
+        result = await self._blockingWait(
+            lambda block_timeout: self.backend.waitAndClaim(token, self.opts, block_timeout)
+        )
+        job_data, id, limit_until, delay_until = result
+        self.blockUntil = 0
+
+        return await self.nextJobFromJobData(job_data, id, limit_until, delay_until, token)
+
+    async def _blockingWait(self, wait: Callable):
         block_timeout = self.getBlockTimeout(self.blockUntil)
         block_timeout = block_timeout if self.backend.capabilities.get("canDoubleTimeout", False) else math.ceil(block_timeout)
 
         try:
-            result = await self.backend.waitForJob(block_timeout)
+            return await wait(block_timeout)
         except (asyncio.CancelledError, KeyboardInterrupt, SystemExit):
             # Cooperative cancellation must propagate immediately;
             # adding a sleep here would defeat the cancel signal.
@@ -354,14 +410,6 @@ class Worker(EventEmitter):
             ):
                 await asyncio.sleep(short_retry_delay)
             raise
-        if result:
-            [_key, member, score] = result
-
-            if member:
-                return int(score)
-            else:
-                return 0
-        return 0
 
     async def _ensure_client_names(self):
         if self._client_name_set:
@@ -418,6 +466,7 @@ class Worker(EventEmitter):
                 await self.backend.moveToCompleted(job, result, job.opts.get("removeOnComplete", False), token, fetch_next=False)
                 job.returnvalue = result
                 job.attemptsMade = job.attemptsMade + 1
+            self.completedCount += 1
             self.emit("completed", job, result)
         except WaitingChildrenError:
             return
@@ -426,6 +475,7 @@ class Worker(EventEmitter):
                 if not self.forceClosing:
                     await job.moveToFailed(err, token)
 
+                self.failedCount += 1
                 self.emit("failed", job, err)
             except Exception as err:
                 self.emit("error", err, job)
@@ -561,6 +611,45 @@ class Worker(EventEmitter):
         except Exception as e:
             self.emit('error', e)
 
+    async def listenCancellations(self):
+        """
+        Abort the signals of the jobs `Queue.cancelJob` is called for, until
+        the worker closes. A dropped subscription is re-established after
+        `runRetryDelay`.
+        """
+        while not self.closing:
+            try:
+                async for job_id, reason in self.backend.listenCancellations():
+                    self.lockManager.cancel_job(job_id, reason)
+            except Exception as e:
+                self.emit('error', e)
+                await asyncio.sleep(self.opts.get("runRetryDelay") / 1000)
+
+    async def publishHeartbeat(self):
+        """
+        Publish this worker's heartbeat record to the queue's worker registry.
+        """
+        interval = self.opts.get("heartbeatInterval") or 0
+        info = {
+            "id": self.id,
+            "name": self.name,
+            "rawname": self.clientName,
+            "workerName": self.workerName,
+            "hostname": socket.gethostname(),
+            "pid": os.getpid(),
+            "concurrency": self.opts.get("concurrency"),
+            "active": len(self.jobs),
+            "completed": self.completedCount,
+            "failed": self.failedCount,
+            "startedAt": self.startedAt,
+            "updatedAt": int(time.time() * 1000),
+        }
+        try:
+            await self.backend.publishHeartbeat(
+                self.id, info, interval * heartbeat_ttl_factor)
+        except Exception as e:
+            self.emit('error', e)
+
     async def close(self, force: bool = False):
         """
         Closes the worker and related redis connections.
@@ -582,6 +671,19 @@ class Worker(EventEmitter):
 
         await self.lockManager.close()
 
+        if self.cancellationListener is not None:
+            self.cancellationListener.cancel()
+            # Let it close its subscription before the connection goes away.
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.cancellationListener
+
+        if self.heartbeatTimer is not None:
+            self.heartbeatTimer.stop()
+            try:
+                await self.backend.removeHeartbeat(self.id)
+            except Exception as err:
+                self.emit('error', err)
+
         try:
             await self.backend.close(force=force)
         except Exception as err:
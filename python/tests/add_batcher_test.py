@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from bullmq.add_batcher import AddBatcher
+
+
+def _job(name):
+    return SimpleNamespace(name=name)
+
+
+class TestAddBatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_concurrent_adds_into_one_batch(self):
+        backend = SimpleNamespace(
+            addJobsChunked=AsyncMock(side_effect=lambda jobs, size, inflight: [j.name for j in jobs]),
+        )
+        batcher = AddBatcher(backend, max_jobs=10, max_delay=5)
+
+        ids = await asyncio.gather(*(batcher.add(_job(f"id-{i}")) for i in range(3)))
+
+        self.assertEqual(ids, ["id-0", "id-1", "id-2"])
+        backend.addJobsChunked.assert_awaited_once()
+        self.assertEqual(backend.addJobsChunked.await_args.args[1:], (3, 1))
+
+    async def test_flushes_when_max_jobs_is_reached(self):
+        backend = SimpleNamespace(
+            addJobsChunked=AsyncMock(side_effect=lambda jobs, size, inflight: [j.name for j in jobs]),
+        )
+        batcher = AddBatcher(backend, max_jobs=2, max_delay=60000)
+
+        ids = await asyncio.wait_for(
+            asyncio.gather(*(batcher.add(_job(f"id-{i}")) for i in range(4))), 1
+        )
+
+        self.assertEqual(ids, ["id-0", "id-1", "id-2", "id-3"])
+        self.assertEqual(backend.addJobsChunked.await_count, 2)
+
+    async def test_each_caller_gets_its_own_error(self):
+        err = ValueError("bad job")
+        backend = SimpleNamespace(
+            addJobsChunked=AsyncMock(return_value=[err, err]),
+            addJob=AsyncMock(side_effect=[err, "id-1"]),
+        )
+        batcher = AddBatcher(backend, max_jobs=2)
+
+        results = await asyncio.gather(
+            batcher.add(_job("a")), batcher.add(_job("b")), return_exceptions=True
+        )
+
+        self.assertIs(results[0], err)
+        self.assertEqual(results[1], "id-1")
+
+    async def test_rejected_job_in_batch_raises(self):
+        err = TypeError("Missing key for parent job bull:parents:missing. addJob")
+        backend = SimpleNamespace(
+            addJobsChunked=AsyncMock(return_value=["id-0", err]),
+            addJob=AsyncMock(),
+        )
+        batcher = AddBatcher(backend, max_jobs=2)
+
+        results = await asyncio.gather(
+            batcher.add(_job("a")), batcher.add(_job("b")), return_exceptions=True
+        )
+
+        self.assertEqual(results[0], "id-0")
+        self.assertIs(results[1], err)
+        backend.addJob.assert_not_awaited()
+
+    async def test_close_sends_pending_jobs(self):
+        backend = SimpleNamespace(addJobsChunked=AsyncMock(return_value=["1"]))
+        batcher = AddBatcher(backend, max_jobs=10, max_delay=60000)
+
+        pending = asyncio.ensure_future(batcher.add(_job("a")))
+        await asyncio.sleep(0)
+        await batcher.close()
+
+        self.assertEqual(await pending, "1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,7 @@ import os
 import redis.asyncio as redis
 
 from asyncio import Future
-from bullmq import Queue, Job, Worker
+from bullmq import Queue, Job, Worker, BulkAddError
 from uuid import uuid4
 
 queueName = ""
@@ -70,5 +70,93 @@ class TestJob(unittest.IsolatedAsyncioTestCase):
         await queue.close()
         await worker.close()
 
+    async def test_add_bulk_stream(self):
+        queue = Queue(queueName, {"prefix": prefix})
+
+        async def jobs():
+            for idx in range(5):
+                yield {"name": "test", "data": {"idx": idx}}
+
+        count = await queue.addBulkStream(jobs(), chunk_size=2)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(await queue.getJobCountByTypes("waiting"), 5)
+        waiting = await queue.getJobs(["waiting"])
+        self.assertEqual(sorted(job.data["idx"] for job in waiting), [0, 1, 2, 3, 4])
+
+        await queue.close()
+
+    async def test_add_bulk_in_chunks(self):
+        queue = Queue(queueName, {"prefix": prefix})
+
+        jobs = await queue.addBulk(
+            [{"name": "test", "data": {"idx": idx}} for idx in range(7)],
+            {"chunkSize": 3, "maxInflightChunks": 2},
+        )
+
+        self.assertEqual(len(jobs), 7)
+        self.assertTrue(all(job.id for job in jobs))
+        self.assertEqual(await queue.getJobCountByTypes("waiting"), 7)
+
+        await queue.close()
+
+    async def test_add_bulk_rejects_invalid_chunk_options(self):
+        queue = Queue(queueName, {"prefix": prefix})
+
+        for opts in ({"chunkSize": 0}, {"chunkSize": 2.5}, {"chunkSize": 2, "maxInflightChunks": -1}):
+            with self.assertRaisesRegex(ValueError, "must be a positive integer"):
+                await queue.addBulk([{"name": "test", "data": {}}], opts)
+
+        self.assertEqual(await queue.getJobCountByTypes("waiting"), 0)
+
+        await queue.close()
+
+    async def test_add_bulk_in_chunks_reports_failed_jobs(self):
+        queue = Queue(queueName, {"prefix": prefix})
+
+        with self.assertRaises(BulkAddError) as raised:
+            await queue.addBulk(
+                [
+                    {"name": "test", "data": {"idx": 0}},
+                    {"name": "test", "data": {"idx": float("nan")}},
+                    {"name": "test", "data": {"idx": 2}},
+                ],
+                {"chunkSize": 1},
+            )
+
+        self.assertEqual(list(raised.exception.errors), [1])
+        self.assertIsNotNone(raised.exception.jobs[0].id)
+        self.assertIsNotNone(raised.exception.jobs[2].id)
+        self.assertEqual(await queue.getJobCountByTypes("waiting"), 2)
+
+        await queue.close()
+
+    async def test_add_bulk_in_chunks_reports_missing_parent(self):
+        queue = Queue(queueName, {"prefix": prefix})
+        parent_id = uuid4().hex
+
+        with self.assertRaises(BulkAddError) as raised:
+            await queue.addBulk(
+                [
+                    {"name": "test", "data": {"idx": 0}},
+                    {"name": "test", "data": {"idx": 1}, "opts": {
+                        "parent": {
+                            "id": parent_id,
+                            "queue": f"{prefix}{queueName}"
+                        }
+                    }},
+                ],
+                {"chunkSize": 2},
+            )
+
+        self.assertEqual(list(raised.exception.errors), [1])
+        error = raised.exception.errors[1]
+        self.assertIsInstance(error, TypeError)
+        self.assertEqual(str(error), f"Missing key for parent job {prefix}{queueName}:{parent_id}. addJob")
+        self.assertIsNotNone(raised.exception.jobs[0].id)
+        self.assertEqual(await queue.getJobCountByTypes("waiting"), 1)
+
+        await queue.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,8 @@
 When ``BULLMQ_TEST_BACKEND=postgres`` is set, the existing test-suite is run
 against the PostgreSQL backend instead of Redis:
 
-* every ``Queue`` / ``Worker`` / ``FlowProducer`` is transparently built on the
+* every ``Queue`` / ``Worker`` / ``FlowProducer`` / ``QueueEvents`` /
+  ``QueueEventsProducer`` / ``QueueRegistry`` is transparently built on the
   Postgres adapter (by patching the ``create_backend`` the classes import), and
 * the schema is wiped before each test so job-id sequences restart at 1 (the
   Postgres analogue of the Redis suite's ``flushdb`` between tests).
@@ -46,6 +47,10 @@ _REDIS_ONLY_TESTS = {
     "test_trim_events_manually_with_custom_prefix",
     "test_drain_count_added_unprocessed_jobs",
     "test_obliterate_with_force_true_should_succeed_with_active_jobs",
+    # The Postgres add functions do not check that a parent exists.
+    "test_add_bulk_in_chunks_reports_missing_parent",
+    # Caller-owned connections are a Postgres feature; Redis rejects them.
+    "test_add_on_caller_connection_requires_postgres",
 }
 
 
@@ -92,4 +97,7 @@ def _pg_backend(monkeypatch):
     monkeypatch.setattr("bullmq.queue.create_backend", _pg_create_backend)
     monkeypatch.setattr("bullmq.worker.create_backend", _pg_create_backend)
     monkeypatch.setattr("bullmq.flow_producer.create_backend", _pg_create_backend)
+    monkeypatch.setattr("bullmq.queue_events.create_backend", _pg_create_backend)
+    monkeypatch.setattr("bullmq.queue_events_producer.create_backend", _pg_create_backend)
+    monkeypatch.setattr("bullmq.queue_registry.create_backend", _pg_create_backend)
     yield
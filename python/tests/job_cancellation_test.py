@@ -16,11 +16,14 @@ import asyncio
 import os
 import unittest
 from asyncio import Future
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import redis.asyncio as redis
 
 from bullmq import AbortController, AbortError, AbortSignal, Job, Queue, Worker
+from bullmq.backends import RedisBackend
 
 
 prefix = os.environ.get("BULLMQ_TEST_PREFIX") or "bull"
@@ -127,6 +130,39 @@ class TestJobCancellation(unittest.IsolatedAsyncioTestCase):
         await worker.close(force=True)
         await queue.close()
 
+    async def test_queue_cancel_job_reaches_the_worker(self):
+        queue = Queue(self.queueName, {"prefix": prefix})
+        await queue.add("cancellable", {"foo": "bar"})
+
+        started = Future()
+
+        async def process(job: Job, token: str, signal: AbortSignal):
+            started.set_result(job.id)
+            await asyncio.wait_for(signal.wait(), timeout=5.0)
+            raise AbortError(signal.reason)
+
+        worker = Worker(self.queueName, process, {"prefix": prefix})
+
+        failed = Future()
+        worker.on(
+            "failed",
+            lambda job, err: failed.done() or failed.set_result(err),
+        )
+
+        job_id = await asyncio.wait_for(started, timeout=5.0)
+        # Give the worker's subscription a moment to be established
+        await asyncio.sleep(0.1)
+
+        await queue.cancelJob(job_id, "cancelled remotely")
+
+        err = await asyncio.wait_for(failed, timeout=2.0)
+        self.assertIsInstance(err, AbortError)
+        self.assertEqual(str(err), "cancelled remotely")
+
+        await worker.close(force=True)
+        self.assertTrue(worker.cancellationListener.done())
+        await queue.close()
+
     async def test_cancel_unknown_job_returns_false(self):
         queue = Queue(self.queueName, {"prefix": prefix})
 
@@ -223,3 +259,32 @@ class TestJobCancellation(unittest.IsolatedAsyncioTestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestRedisClusterCancellations(unittest.IsolatedAsyncioTestCase):
+    async def test_subscribes_on_the_primary_serving_the_channel(self):
+        primary = SimpleNamespace(connection_class=object, connection_kwargs={"host": "primary"})
+        client = SimpleNamespace(get_node_from_key=MagicMock(return_value=primary))
+        # Skips __init__, which loads the Lua commands.
+        backend = RedisBackend.__new__(RedisBackend)
+        backend.scripts = SimpleNamespace(toKey=lambda type: f"bull:queue:{type}")
+        backend.connection = SimpleNamespace(conn=client)
+        pubsub = MagicMock(subscribe=AsyncMock(), aclose=AsyncMock())
+
+        async def listen():
+            yield {"type": "message", "data": '{"jobId": "1", "reason": "stop"}'}
+
+        pubsub.listen = listen
+        node_client = MagicMock(aclose=AsyncMock())
+        node_client.pubsub.return_value = pubsub
+
+        with patch("bullmq.backends.redis_backend.Redis.from_pool", return_value=node_client), patch(
+            "bullmq.backends.redis_backend.ConnectionPool"
+        ) as pool:
+            requests = [request async for request in backend.listenCancellations()]
+
+        self.assertEqual(requests, [("1", "stop")])
+        client.get_node_from_key.assert_called_once_with("bull:queue:cancel")
+        pool.assert_called_once_with(connection_class=object, host="primary")
+        pubsub.subscribe.assert_awaited_once_with("bull:queue:cancel")
+        node_client.aclose.assert_awaited_once()
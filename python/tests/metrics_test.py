@@ -0,0 +1,35 @@
+import unittest
+
+from bullmq import MetricsTime, downsample_metrics
+
+
+class TestDownsampleMetrics(unittest.TestCase):
+    def test_hourly_buckets_are_aligned_to_the_clock(self):
+        # The newest point covers 10:29, so the first bucket holds 30 minutes.
+        prev_ts = (10 * 60 + 30) * 60000
+        metrics = {
+            "meta": {"count": 120, "prevTS": prev_ts, "prevCount": 0},
+            "data": [1] * 120,
+            "count": 120,
+        }
+
+        result = downsample_metrics(metrics, MetricsTime.ONE_HOUR)
+
+        self.assertEqual(result["data"], [30, 60, 30])
+        self.assertEqual(result["count"], 3)
+        self.assertEqual(result["meta"], metrics["meta"])
+
+    def test_without_prev_ts_points_are_grouped_in_runs(self):
+        metrics = {"meta": {"count": 0, "prevTS": 0, "prevCount": 0}, "data": [1, 2, 3, 4, 5], "count": 5}
+
+        result = downsample_metrics(metrics, 2)
+
+        self.assertEqual(result["data"], [3, 7, 5])
+
+    def test_minutes_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            downsample_metrics({"data": []}, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,41 @@
+import asyncio
 import unittest
 import time
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import psycopg
+from psycopg.pq import TransactionStatus
 
 from bullmq.backends.postgres_backend import _row_to_job_map
 from bullmq.backends.postgres_backend import PostgresBackend
 from bullmq.backends.postgres_connection import (
+    CANCEL_CHANNEL,
+    JOB_CHANNEL,
+    CallerConnection,
+    NotificationHub,
     PostgresConnection,
     quote_schema_name,
     run_migrations,
+    set_schema_durability,
 )
-from bullmq.job import Job
+from bullmq.backends.postgres_storage import (
+    JOB_COUNTER_SHARDS,
+    create_job_counters,
+    durability_option,
+    event_partition_options,
+    maintain_event_partitions,
+    partition_event_table,
+    set_durability,
+    storage_layout,
+    tune_job_table,
+)
+from bullmq.job import DecodedJobData, Job
+from bullmq.postgres import sql_loader
 
 
 class TestPostgresBackendJobMapping(unittest.TestCase):
-    def test_row_to_job_map_json_encodes_plain_strings(self):
+    def test_row_to_job_map_passes_decoded_jsonb_through(self):
         mapped = _row_to_job_map(
             {
                 "name": "job",
@@ -32,10 +51,11 @@ class TestPostgresBackendJobMapping(unittest.TestCase):
             }
         )
 
-        self.assertEqual(mapped["data"], '"foo"')
-        self.assertEqual(mapped["opts"], '"bar"')
-        self.assertEqual(mapped["progress"], '"baz"')
-        self.assertEqual(mapped["returnvalue"], '"done"')
+        self.assertIsInstance(mapped, DecodedJobData)
+        self.assertEqual(mapped["data"], "foo")
+        self.assertEqual(mapped["opts"], "bar")
+        self.assertEqual(mapped["progress"], "baz")
+        self.assertEqual(mapped["returnvalue"], "done")
 
     def test_job_from_json_round_trips_plain_string_fields(self):
         mapped = _row_to_job_map(
@@ -60,6 +80,38 @@ class TestPostgresBackendJobMapping(unittest.TestCase):
         self.assertEqual(job.progress, "baz")
         self.assertEqual(job.returnvalue, "done")
 
+    def test_job_from_json_keeps_decoded_objects(self):
+        data = {"nested": {"list": [1, 2]}}
+        mapped = _row_to_job_map(
+            {
+                "name": "job",
+                "data": data,
+                "opts": {"attempts": 3, "fpof": True},
+                "progress": {"pct": 50},
+                "attempts_made": 1,
+                "attempts_started": 1,
+                "stalled_count": 0,
+                "priority": 0,
+                "stacktrace": ["trace"],
+                "return_value": None,
+                "parent_id": "p1",
+                "parent_queue": "bull:parent",
+                "parent_key": "bull:parent:p1",
+            }
+        )
+
+        queue = SimpleNamespace(backend=None, qualifiedName="bull:test")
+        job = Job.fromJSON(queue, mapped, "1")
+
+        self.assertIs(job.data, data)
+        self.assertEqual(job.opts["attempts"], 3)
+        self.assertTrue(job.opts["failParentOnFailure"])
+        self.assertEqual(job.progress, {"pct": 50})
+        self.assertEqual(job.stacktrace, ["trace"])
+        self.assertIsNone(job.returnvalue)
+        self.assertEqual(job.attemptsMade, 1)
+        self.assertEqual(job.parent, {"id": "p1", "queueKey": "bull:parent"})
+
     def test_client_name_includes_schema_namespace(self):
         connection = SimpleNamespace(schema="tenant_a")
         backend = PostgresBackend("queue", connection)
@@ -132,173 +184,761 @@ class TestPostgresConnection(unittest.IsolatedAsyncioTestCase):
         ):
             quote_schema_name("bad-name")
 
-    async def test_ensure_job_channel_listens_once_per_connection(self):
-        listen_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        connection = PostgresConnection()
+    async def test_maintain_storage_is_a_no_op_without_partitioned_events(self):
+        connection = PostgresConnection({})
+        connection._checkout = MagicMock()
+
+        self.assertFalse(await connection.maintain_storage())
+        connection._checkout.assert_not_called()
+
+    async def test_maintain_storage_is_throttled(self):
+        connection = PostgresConnection({"eventPartitions": {"retention": 1000}})
+        connection._checkout = MagicMock(return_value=_CursorContext("conn"))
 
         with patch(
+            "bullmq.backends.postgres_connection.maintain_schema_storage",
+            AsyncMock(return_value=True),
+        ) as maintain:
+            self.assertTrue(await connection.maintain_storage())
+            self.assertFalse(await connection.maintain_storage())
+
+        maintain.assert_awaited_once_with(
+            "conn",
+            "bullmq",
+            {"interval": 86_400_000, "retention": 1000, "premake": 3},
+        )
+
+    async def test_connecting_partitions_events_but_never_maintains_storage(self):
+        fake_pool = _fake_pool_factory([_FakePooledConnection()])
+        migration_conn = SimpleNamespace(close=AsyncMock())
+
+        with patch("bullmq.backends.postgres_connection._CURRENT_SCHEMAS", set()), patch(
+            "bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool
+        ), patch(
+            "bullmq.backends.postgres_connection.probe_schema_version",
+            AsyncMock(return_value=sql_loader.latest_migration_version()),
+        ), patch(
             "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
-            AsyncMock(return_value=listen_conn),
-        ):
-            first = await connection.ensure_job_channel()
-            second = await connection.ensure_job_channel()
+            AsyncMock(return_value=migration_conn),
+        ), patch(
+            "bullmq.backends.postgres_connection.run_migrations", AsyncMock()
+        ), patch(
+            "bullmq.backends.postgres_connection.apply_storage_layout", AsyncMock()
+        ) as apply, patch(
+            "bullmq.backends.postgres_connection.maintain_schema_storage", AsyncMock()
+        ) as maintain:
+            await PostgresConnection({"eventPartitions": {"retention": 1000}}).wait_until_ready()
+
+        apply.assert_awaited_once_with(
+            migration_conn,
+            "bullmq",
+            {"eventPartitions": {"interval": 86_400_000, "retention": 1000, "premake": 3}},
+        )
+        maintain.assert_not_awaited()
 
-        self.assertIs(first, second)
-        listen_conn.execute.assert_awaited_once_with("LISTEN bullmq_jobs")
 
-    async def test_ensure_job_channel_relistens_after_reconnect(self):
-        first_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        second_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        connect = AsyncMock(side_effect=[first_conn, second_conn])
-        connection = PostgresConnection()
+class _ScriptedCursor:
+    """Records executed SQL (rendered to text) and answers fetches in order."""
 
-        with patch(
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+
+    async def execute(self, query, params=None):
+        if not isinstance(query, str):
+            query = query.as_string(None)
+        self.executed.append(query)
+
+    async def fetchone(self):
+        return self.results.pop(0)
+
+    async def fetchall(self):
+        return self.results.pop(0)
+
+
+class TestEventPartitions(unittest.IsolatedAsyncioTestCase):
+    DAY = 86_400_000
+
+    def test_partition_options(self):
+        self.assertEqual(
+            event_partition_options(None),
+            {"interval": self.DAY, "retention": None, "premake": 3},
+        )
+        self.assertEqual(
+            event_partition_options({"retention": 7200000, "premake": 1}),
+            {"interval": self.DAY, "retention": 7200000, "premake": 1},
+        )
+        with self.assertRaises(ValueError):
+            event_partition_options({"retention": -1})
+
+    def test_partitioning_is_opt_in(self):
+        self.assertEqual(storage_layout({}), {})
+        self.assertEqual(
+            storage_layout({"eventPartitions": True}),
+            {"eventPartitions": {"interval": self.DAY, "retention": None, "premake": 3}},
+        )
+
+    async def test_partitioned_table_is_left_alone(self):
+        cursor = _ScriptedCursor([("p", False)])
+
+        self.assertFalse(await partition_event_table(cursor, event_partition_options(True)))
+        self.assertEqual(len(cursor.executed), 1)
+
+    async def test_existing_rows_become_the_legacy_partition(self):
+        now = 10 * self.DAY + 5
+        cursor = _ScriptedCursor([("r", False), (now,)])
+        options = {"interval": self.DAY, "retention": None, "premake": 1}
+
+        self.assertTrue(await partition_event_table(cursor, options))
+
+        ddl = [statement for statement in cursor.executed[2:] if not statement.startswith("WITH")]
+        self.assertEqual(
+            ddl,
+            [
+                'ALTER TABLE event RENAME TO "event_legacy"',
+                'ALTER TABLE "event_legacy" DROP CONSTRAINT event_pkey',
+                'CREATE TABLE event (LIKE "event_legacy" INCLUDING DEFAULTS, '
+                "PRIMARY KEY (queue, id, created_at_ms)) PARTITION BY RANGE (created_at_ms)",
+                'ALTER TABLE event ATTACH PARTITION "event_legacy" '
+                f"FOR VALUES FROM (MINVALUE) TO ({11 * self.DAY})",
+                'CREATE TABLE "event_default" PARTITION OF event DEFAULT',
+                f'CREATE TABLE "event_p{11 * self.DAY}" (LIKE event INCLUDING DEFAULTS)',
+                f'ALTER TABLE event ATTACH PARTITION "event_p{11 * self.DAY}" '
+                f"FOR VALUES FROM ({11 * self.DAY}) TO ({12 * self.DAY})",
+            ],
+        )
+
+    async def test_maintenance_creates_upcoming_and_drops_expired_partitions(self):
+        now = 10 * self.DAY + 5
+        cursor = _ScriptedCursor([
+            [
+                ("event_legacy", f"FOR VALUES FROM (MINVALUE) TO ('{8 * self.DAY}')"),
+                (f"event_p{8 * self.DAY}", f"FOR VALUES FROM ('{8 * self.DAY}') TO ('{9 * self.DAY}')"),
+                (f"event_p{9 * self.DAY}", f"FOR VALUES FROM ('{9 * self.DAY}') TO ('{10 * self.DAY}')"),
+                ("event_default", "DEFAULT"),
+            ]
+        ])
+        options = {"interval": self.DAY, "retention": self.DAY, "premake": 1}
+
+        created, dropped = await maintain_event_partitions(cursor, options, now)
+
+        self.assertEqual(created, [f"event_p{10 * self.DAY}", f"event_p{11 * self.DAY}"])
+        self.assertEqual(dropped, ["event_legacy", f"event_p{8 * self.DAY}"])
+        self.assertIn(
+            f'ALTER TABLE event ATTACH PARTITION "event_p{11 * self.DAY}" '
+            f"FOR VALUES FROM ({11 * self.DAY}) TO ({12 * self.DAY})",
+            cursor.executed,
+        )
+        self.assertIn('DROP TABLE "event_legacy"', cursor.executed)
+
+
+class _FakePooledConnection:
+    def __init__(self):
+        self.execute = AsyncMock()
+        self.errors = []
+        self.cursor_executes = []
+        self.prepares = []
+        self.pipelines = 0
+        self.transactions = 0
+        self.autocommit = False
+        self.info = SimpleNamespace(transaction_status=TransactionStatus.INTRANS)
+
+    def cursor(self):
+        return _FakePooledCursor(self)
+
+    def pipeline(self):
+        self.pipelines += 1
+        return _CursorContext(None)
+
+    def transaction(self):
+        self.transactions += 1
+        return _CursorContext(None)
+
+
+class _FakePooledCursor:
+    description = None
+    rowcount = 1
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def execute(self, query, params, prepare=None):
+        self._conn.cursor_executes.append((query, params))
+        self._conn.prepares.append(prepare)
+        if self._conn.errors:
+            raise self._conn.errors.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+def _fake_pool_factory(conns):
+    created = []
+
+    class _FakePool:
+        def __init__(self, conninfo, **kwargs):
+            self.conninfo = conninfo
+            self.kwargs = kwargs
+            self.open = AsyncMock()
+            self.close = AsyncMock()
+            self._conns = list(conns)
+            self._next = 0
+            created.append(self)
+
+        def connection(self):
+            conn = self._conns[self._next % len(self._conns)]
+            self._next += 1
+            return _CursorContext(conn)
+
+    _FakePool.created = created
+    return _FakePool
+
+
+class TestMigrationFastPath(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = patch("bullmq.backends.postgres_connection._CURRENT_SCHEMAS", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_current_schema_skips_the_migration_transaction(self):
+        fake_pool = _fake_pool_factory([_FakePooledConnection()])
+        latest = sql_loader.latest_migration_version()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool), patch(
+            "bullmq.backends.postgres_connection.probe_schema_version",
+            AsyncMock(return_value=latest),
+        ) as probe, patch("bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect") as connect:
+            await PostgresConnection({"schema": "tenant_a"}).wait_until_ready()
+            await PostgresConnection({"schema": "tenant_a"}).wait_until_ready()
+
+        probe.assert_awaited_once()
+        connect.assert_not_called()
+
+    async def test_pending_migration_takes_the_locked_path(self):
+        fake_pool = _fake_pool_factory([_FakePooledConnection()])
+        migration_conn = SimpleNamespace(close=AsyncMock())
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool), patch(
+            "bullmq.backends.postgres_connection.probe_schema_version", AsyncMock(return_value=0)
+        ), patch(
             "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
-            connect,
+            AsyncMock(return_value=migration_conn),
+        ), patch(
+            "bullmq.backends.postgres_connection.run_migrations", AsyncMock()
+        ) as migrate:
+            await PostgresConnection({"schema": "tenant_a"}).wait_until_ready()
+
+        migrate.assert_awaited_once_with(migration_conn, "tenant_a", skip_version_check=True)
+        migration_conn.close.assert_awaited_once()
+
+    async def test_dropped_schema_is_migrated_again_and_retried(self):
+        conn = _FakePooledConnection()
+        conn.errors.append(psycopg.errors.UndefinedFunction("function add_job does not exist"))
+        fake_pool = _fake_pool_factory([conn])
+        connection = PostgresConnection()
+        connection._migrate = AsyncMock()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool), patch(
+            "bullmq.backends.postgres_connection.probe_schema_version", AsyncMock(return_value=0)
         ):
-            await connection.ensure_job_channel()
-            first_conn.closed = True
-            await connection.ensure_job_channel()
+            await connection.run("SELECT $1", ["a"])
 
-        self.assertEqual(connect.await_count, 2)
-        first_conn.execute.assert_awaited_once_with("LISTEN bullmq_jobs")
-        second_conn.execute.assert_awaited_once_with("LISTEN bullmq_jobs")
+        self.assertEqual(connection._migrate.await_count, 2)
+        self.assertEqual(len(conn.cursor_executes), 2)
 
-    async def test_reset_job_channel_forces_new_listen_connection(self):
-        first_conn = SimpleNamespace(closed=False, execute=AsyncMock(), close=AsyncMock())
-        second_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        connect = AsyncMock(side_effect=[first_conn, second_conn])
+    async def test_missing_object_in_a_current_schema_is_raised(self):
+        conn = _FakePooledConnection()
+        conn.errors.append(psycopg.errors.UndefinedTable("relation jobs does not exist"))
+        fake_pool = _fake_pool_factory([conn])
         connection = PostgresConnection()
+        connection._migrate = AsyncMock()
 
-        with patch(
-            "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
-            connect,
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool), patch(
+            "bullmq.backends.postgres_connection.probe_schema_version",
+            AsyncMock(return_value=sql_loader.latest_migration_version()),
         ):
-            await connection.ensure_job_channel()
-            await connection.reset_job_channel()
-            await connection.ensure_job_channel()
+            with self.assertRaises(psycopg.errors.UndefinedTable):
+                await connection.run("SELECT * FROM jobs", [])
 
-        first_conn.close.assert_awaited_once()
-        self.assertEqual(connect.await_count, 2)
-        second_conn.execute.assert_awaited_once_with("LISTEN bullmq_jobs")
+        connection._migrate.assert_awaited_once()
+        self.assertEqual(len(conn.cursor_executes), 1)
+
+
+class TestPostgresConnectionPool(unittest.IsolatedAsyncioTestCase):
+    async def test_pool_is_configured_from_options(self):
+        fake_pool = _fake_pool_factory([_FakePooledConnection()])
+        connection = PostgresConnection(
+            {"schema": "tenant_a", "pool": {"minSize": 2, "maxSize": 8, "maxIdle": 30}}
+        )
+        connection.wait_until_ready = AsyncMock()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
+            await connection.run("SELECT 1", [])
 
-    async def test_listen_connection_applies_last_application_name_when_created(self):
-        main_cursor = SimpleNamespace(execute=AsyncMock())
-        main_conn = SimpleNamespace(
-            closed=False,
-            cursor=lambda: _CursorContext(main_cursor),
+        (pool,) = fake_pool.created
+        self.assertEqual(pool.kwargs["min_size"], 2)
+        self.assertEqual(pool.kwargs["max_size"], 8)
+        self.assertEqual(pool.kwargs["max_idle"], 30)
+        self.assertEqual(
+            pool.kwargs["kwargs"],
+            {"autocommit": True, "options": '-c search_path="tenant_a"'},
         )
-        listen_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        connect = AsyncMock(side_effect=[main_conn, listen_conn])
+        pool.open.assert_awaited_once()
+
+    async def test_pool_is_shared_by_for_queue_backends(self):
+        conn = _FakePooledConnection()
+        fake_pool = _fake_pool_factory([conn])
         connection = PostgresConnection()
         connection.wait_until_ready = AsyncMock()
+        backend = PostgresBackend("queue", connection)
+        child = backend.forQueue("child")
 
-        with patch(
-            "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
-            connect,
-        ):
-            self.assertIsNone(connection._listen_conn)
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
+            await backend.connection.run("SELECT $1", ["a"])
+            await child.connection.run("SELECT $1", ["b"])
+            await child.close()
+            await backend.close()
+
+        (pool,) = fake_pool.created
+        self.assertEqual(conn.cursor_executes, [("SELECT %s", ["a"]), ("SELECT %s", ["b"])])
+        pool.close.assert_awaited_once()
+
+    async def test_run_command_executes_cached_prepared_statement(self):
+        conn = _FakePooledConnection()
+        fake_pool = _fake_pool_factory([conn])
+        connection = PostgresConnection()
+        connection.wait_until_ready = AsyncMock()
+        translated = ("SELECT %s, %s", (1, 0))
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool), patch(
+            "bullmq.backends.postgres_connection.sql_loader.load_pyformat_command",
+            return_value=translated,
+        ) as load:
+            await connection.run_command("some_command", ["a", "b"])
+
+        load.assert_called_once_with("some_command")
+        self.assertEqual(conn.cursor_executes, [("SELECT %s, %s", ["b", "a"])])
+        self.assertEqual(conn.prepares, [True])
+
+    async def test_prepared_statements_can_be_disabled(self):
+        conn = _FakePooledConnection()
+        fake_pool = _fake_pool_factory([conn])
+        connection = PostgresConnection({"prepareStatements": False})
+        connection.wait_until_ready = AsyncMock()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
+            await connection.run_command("get_counts", ["queue", ["waiting"]])
+            await connection.run("SELECT $1", ["a"])
+
+        self.assertEqual(conn.prepares, [False, False])
+
+    async def test_run_pipeline_sends_commands_in_one_pipeline(self):
+        conn = _FakePooledConnection()
+        fake_pool = _fake_pool_factory([conn])
+        connection = PostgresConnection()
+        connection.wait_until_ready = AsyncMock()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
+            results = await connection.run_pipeline(
+                [
+                    ("add_log", ["queue", "1", "row"]),
+                    ("trim_logs_keep_last", ["queue", "1", 5]),
+                ]
+            )
+
+        self.assertEqual(conn.pipelines, 1)
+        self.assertEqual(len(conn.cursor_executes), 2)
+        self.assertEqual(conn.cursor_executes[1][1], ["queue", "1", "queue", "1", 5])
+        self.assertEqual([r.rowcount for r in results], [1, 1])
+
+    async def test_application_name_reaches_every_pooled_connection(self):
+        first, second = _FakePooledConnection(), _FakePooledConnection()
+        fake_pool = _fake_pool_factory([first, second])
+        connection = PostgresConnection()
+        connection.wait_until_ready = AsyncMock()
+
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
             await connection.set_application_name("tenant_a:queue:w:1")
-            self.assertIsNone(connection._listen_conn)
-            await connection.listen_connection()
+            await connection.run("SELECT 1", [])
+            await connection.run("SELECT 1", [])
+            await connection.run("SELECT 1", [])
 
-        main_cursor.execute.assert_awaited_once_with(
-            "SELECT set_config('application_name', %s, false)",
-            ("tenant_a:queue:w:1",),
-        )
-        connection.wait_until_ready.assert_awaited_once()
-        listen_conn.execute.assert_awaited_once_with(
+        set_name = call(
             "SELECT set_config('application_name', %s, false)",
             ("tenant_a:queue:w:1",),
         )
+        self.assertEqual(first.execute.await_args_list, [set_name])
+        self.assertEqual(second.execute.await_args_list, [set_name])
 
-    async def test_set_application_name_updates_existing_listen_connection(self):
-        main_cursor = SimpleNamespace(execute=AsyncMock())
-        main_conn = SimpleNamespace(
-            closed=False,
-            cursor=lambda: _CursorContext(main_cursor),
-        )
-        listen_conn = SimpleNamespace(closed=False, execute=AsyncMock())
-        connect = AsyncMock(side_effect=[listen_conn, main_conn])
+    async def test_no_pool_is_opened_once_closed(self):
+        fake_pool = _fake_pool_factory([_FakePooledConnection()])
         connection = PostgresConnection()
         connection.wait_until_ready = AsyncMock()
 
-        with patch(
-            "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
-            connect,
-        ):
-            await connection.listen_connection()
-            self.assertIsNotNone(connection._listen_conn)
-            listen_conn.execute.assert_not_awaited()
-            await connection.set_application_name("tenant_a:queue:w:2")
+        with patch("bullmq.backends.postgres_connection.AsyncConnectionPool", fake_pool):
+            await connection.close()
+            # A worker closed before its run loop started names itself late.
+            await connection.set_application_name("tenant_a:queue:w:1")
+            with self.assertRaises(psycopg.OperationalError):
+                await connection.run("SELECT 1", [])
 
-        main_cursor.execute.assert_awaited_once_with(
-            "SELECT set_config('application_name', %s, false)",
-            ("tenant_a:queue:w:2",),
+        self.assertEqual(fake_pool.created, [])
+
+
+class TestHotJobUpdates(unittest.IsolatedAsyncioTestCase):
+    def test_storage_layout_keeps_only_requested_options(self):
+        self.assertEqual(storage_layout({}), {})
+        self.assertEqual(storage_layout({"hotJobUpdates": False}), {})
+        self.assertEqual(
+            storage_layout({"hotJobUpdates": True}), {"hotJobUpdates": {"fillfactor": 80}}
         )
-        connection.wait_until_ready.assert_awaited_once()
-        listen_conn.execute.assert_awaited_once_with(
-            "SELECT set_config('application_name', %s, false)",
-            ("tenant_a:queue:w:2",),
+        with self.assertRaises(ValueError):
+            storage_layout({"hotJobUpdates": {"fillfactor": 5}})
+
+    async def test_sets_fillfactor_and_drops_the_lock_expiry_index(self):
+        cursor = _ScriptedCursor([(False,), (True,)])
+
+        self.assertTrue(await tune_job_table(cursor, {"fillfactor": 70}))
+
+        self.assertEqual(
+            cursor.executed[1:],
+            [
+                "ALTER TABLE job SET (fillfactor = 70)",
+                "SELECT to_regclass('job_active_idx') IS NOT NULL",
+                "CREATE INDEX IF NOT EXISTS job_active_queue_idx ON job (queue) WHERE state = 'active'",
+                "DROP INDEX job_active_idx",
+            ],
         )
 
+    async def test_tuned_table_is_left_alone(self):
+        cursor = _ScriptedCursor([(True,), (False,)])
+
+        self.assertFalse(await tune_job_table(cursor, {"fillfactor": 80}))
+        self.assertEqual(len(cursor.executed), 2)
+
+
+class TestDurability(unittest.IsolatedAsyncioTestCase):
+    def test_durability_option_is_validated(self):
+        self.assertEqual(durability_option("unlogged"), "unlogged")
+        with self.assertRaises(ValueError):
+            durability_option("ephemeral")
+
+    def test_durability_is_not_a_connection_option(self):
+        self.assertEqual(storage_layout({"durability": "unlogged"}), {})
+
+    async def test_set_schema_durability_runs_under_the_migration_lock(self):
+        cursor = _ScriptedCursor([[], [], [], [], [("job",)]])
+        conn = MagicMock()
+        conn.transaction = MagicMock(return_value=_CursorContext(None))
+        conn.cursor = MagicMock(return_value=_CursorContext(cursor))
+
+        switched = await set_schema_durability(conn, "tenant_a")
+
+        self.assertEqual(switched, ["job"])
+        self.assertEqual(cursor.executed[0], "SELECT pg_advisory_xact_lock(%s, hashtext(%s))")
+        self.assertEqual(cursor.executed[1], 'SET LOCAL search_path TO "tenant_a"')
+        self.assertEqual(cursor.executed[-1], 'ALTER TABLE "job" SET UNLOGGED')
+
+    async def test_unlogged_switches_referencing_tables_before_job(self):
+        cursor = _ScriptedCursor([
+            [],
+            [("job_log",)],
+            [],
+            [("event_p1",), ("event_default",)],
+            [("job",)],
+        ])
+
+        switched = await set_durability(cursor, "unlogged")
+
+        self.assertEqual(switched, ["job_log", "event_p1", "event_default", "job"])
+        self.assertEqual(
+            [q for q in cursor.executed if q.startswith("ALTER")],
+            [
+                'ALTER TABLE "job_log" SET UNLOGGED',
+                'ALTER TABLE "event_p1" SET UNLOGGED',
+                'ALTER TABLE "event_default" SET UNLOGGED',
+                'ALTER TABLE "job" SET UNLOGGED',
+            ],
+        )
 
-class _FailingNotifiesConnection:
-    def __init__(self):
-        self.closed = False
+    async def test_logged_switches_job_first(self):
+        cursor = _ScriptedCursor([[("job",)], [], [], [("job_log",)], []])
 
-    def notifies(self, timeout=None, stop_after=None):
-        class _Iter:
-            def __aiter__(self):
-                return self
+        self.assertEqual(await set_durability(cursor, "logged"), ["job", "job_log"])
 
-            async def __anext__(self):
-                raise psycopg.OperationalError("listen connection dropped")
+    async def test_new_event_partitions_follow_unlogged_durability(self):
+        cursor = _ScriptedCursor([[("event_default", "DEFAULT")]])
+        options = {"interval": 1000, "retention": None, "premake": 0}
 
-        return _Iter()
+        created, _ = await maintain_event_partitions(cursor, options, 5500, unlogged=True)
+
+        self.assertEqual(created, ["event_p5000"])
+        self.assertIn('CREATE UNLOGGED TABLE "event_p5000" (LIKE event INCLUDING DEFAULTS)', cursor.executed)
+
+
+class TestJobCounters(unittest.IsolatedAsyncioTestCase):
+    def test_counters_are_opt_in(self):
+        self.assertEqual(storage_layout({"jobCounters": True}), {"jobCounters": True})
+        self.assertEqual(storage_layout({}), {})
+
+    async def test_creates_the_counters_once(self):
+        cursor = _ScriptedCursor([(True,)])
+
+        self.assertTrue(await create_job_counters(cursor))
+
+        executed = "\n".join(cursor.executed)
+        self.assertIn("CREATE TABLE job_counter", executed)
+        self.assertIn("CREATE TRIGGER job_counter_update", executed)
+        # Shards are bounded, never one per backend pid.
+        self.assertIn(f"pg_backend_pid() % {JOB_COUNTER_SHARDS}", executed)
+        self.assertNotIn("LOCK TABLE", executed)
+
+        cursor = _ScriptedCursor([(False,)])
+        self.assertFalse(await create_job_counters(cursor))
+        self.assertEqual(len(cursor.executed), 1)
+
+    def test_shared_count_commands_count_jobs(self):
+        for command in ("get_counts", "get_counts_for_queues", "get_counts_per_priority"):
+            self.assertNotIn("job_counter", sql_loader.load_command(command))
+
+    async def test_backend_reads_counts_from_counters(self):
+        connection = SimpleNamespace(schema="bullmq", storage_layout={"jobCounters": True})
+        backend = PostgresBackend("queue", connection)
+        backend._run = AsyncMock(
+            return_value=SimpleNamespace(first_map=lambda: {"active": 2, "waiting": 3}, maps=lambda: [])
+        )
 
+        self.assertEqual(await backend.getCounts(["active", "wait"]), [2, 3])
+        backend._run.assert_awaited_with("get_counter_counts", ["queue"])
 
-class _IdleNotifiesConnection:
+        await backend.getCountsPerPriority([1])
+        backend._run.assert_awaited_with("get_counter_counts_per_priority", ["queue", [1]])
+
+        await backend.getCountsForQueues(["queue"], ["active"])
+        backend._run.assert_awaited_with("get_counter_counts_for_queues", [["queue"]])
+
+    async def test_backend_counts_jobs_without_counters(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(
+            return_value=SimpleNamespace(first_map=lambda: {"active": 2}, maps=lambda: [])
+        )
+
+        await backend.getCounts(["active"])
+        backend._run.assert_awaited_with("get_counts", ["queue"])
+
+
+class _FakeListenConnection:
     def __init__(self):
         self.closed = False
+        self.execute = AsyncMock()
+        self._incoming = asyncio.Queue()
+
+    def send(self, channel, payload):
+        self._incoming.put_nowait(SimpleNamespace(channel=channel, payload=payload))
+
+    def drop(self):
+        self._incoming.put_nowait(psycopg.OperationalError("listen connection dropped"))
 
     def notifies(self, timeout=None, stop_after=None):
         async def _iter():
-            if False:
-                yield
+            while True:
+                item = await self._incoming.get()
+                if isinstance(item, Exception):
+                    self.closed = True
+                    raise item
+                yield item
 
         return _iter()
 
+    async def close(self):
+        self.closed = True
 
-class _FakeWaitConnection:
-    def __init__(self):
-        self.schema = "bullmq"
-        self.ensure_job_channel = AsyncMock(
-            side_effect=[_FailingNotifiesConnection(), _IdleNotifiesConnection()]
+
+class TestNotificationHub(unittest.IsolatedAsyncioTestCase):
+    def _patch_connect(self, *conns):
+        return patch(
+            "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
+            AsyncMock(side_effect=list(conns)),
         )
-        self.reset_job_channel = AsyncMock()
+
+    async def test_kept_payloads_are_handed_over_once(self):
+        listen_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+
+        with self._patch_connect(listen_conn):
+            collecting = await connection.subscribe(CANCEL_CHANNEL, keep_payloads=True)
+            latched = await connection.subscribe(CANCEL_CHANNEL)
+
+        listen_conn.send(CANCEL_CHANNEL, "a")
+        listen_conn.send(CANCEL_CHANNEL, "b")
+
+        self.assertTrue(await collecting.wait(1))
+        self.assertEqual(collecting.take_payloads(), ["a", "b"])
+        self.assertEqual(collecting.take_payloads(), [])
+        self.assertEqual(latched.take_payloads(), [])
+        await connection.close()
+
+    async def test_connections_share_one_listen_session(self):
+        listen_conn = _FakeListenConnection()
+        first = PostgresConnection({"connection": "dbname=test"})
+        second = PostgresConnection({"connection": "dbname=test"})
+
+        with self._patch_connect(listen_conn) as connect:
+            await first.subscribe(JOB_CHANNEL, "a")
+            await second.subscribe(JOB_CHANNEL, "b")
+
+        connect.assert_awaited_once()
+        listen_conn.execute.assert_awaited_once()
+        self.assertIs(first._hub, second._hub)
+        await first.close()
+        await second.close()
+
+    async def test_schemas_get_separate_hubs(self):
+        first = PostgresConnection({"connection": "dbname=test", "schema": "tenant_a"})
+        second = PostgresConnection({"connection": "dbname=test", "schema": "tenant_b"})
+
+        with self._patch_connect(_FakeListenConnection(), _FakeListenConnection()) as connect:
+            await first.subscribe(JOB_CHANNEL, "queue")
+            await second.subscribe(JOB_CHANNEL, "queue")
+
+        self.assertEqual(connect.await_count, 2)
+        self.assertIsNot(first._hub, second._hub)
+        await first.close()
+        await second.close()
+
+    async def test_notifications_wake_matching_subscriptions_only(self):
+        listen_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+
+        with self._patch_connect(listen_conn):
+            mine = await connection.subscribe(JOB_CHANNEL, "queue")
+            other = await connection.subscribe(JOB_CHANNEL, "other")
+            any_queue = await connection.subscribe(JOB_CHANNEL)
+
+        listen_conn.send(JOB_CHANNEL, "queue")
+
+        self.assertTrue(await mine.wait(1))
+        self.assertTrue(await any_queue.wait(1))
+        self.assertFalse(await other.wait(0.01))
+        await connection.close()
+
+    async def test_notification_is_latched_until_the_next_wait(self):
+        listen_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+
+        with self._patch_connect(listen_conn):
+            subscription = await connection.subscribe(JOB_CHANNEL, "queue")
+
+        listen_conn.send(JOB_CHANNEL, "queue")
+        listen_conn.send(JOB_CHANNEL, "queue")
+        await asyncio.sleep(0)
+
+        self.assertTrue(await subscription.wait(0.01))
+        self.assertFalse(await subscription.wait(0.01))
+        await connection.close()
+
+    async def test_reconnects_resubscribes_and_wakes_waiters(self):
+        first_conn = _FakeListenConnection()
+        second_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+
+        with self._patch_connect(first_conn, second_conn), patch(
+            "bullmq.backends.postgres_connection.LISTEN_RECONNECT_DELAY", 0
+        ):
+            subscription = await connection.subscribe(JOB_CHANNEL, "queue")
+            first_conn.drop()
+
+            self.assertTrue(await subscription.wait(1))
+
+        first_conn.execute.assert_awaited_once()
+        second_conn.execute.assert_awaited_once()
+        second_conn.send(JOB_CHANNEL, "queue")
+        self.assertTrue(await subscription.wait(1))
+        await connection.close()
+
+    async def test_last_close_shuts_the_hub_down(self):
+        listen_conn = _FakeListenConnection()
+        first = PostgresConnection()
+        second = PostgresConnection()
+
+        with self._patch_connect(listen_conn):
+            await first.subscribe(JOB_CHANNEL, "a")
+            await second.subscribe(JOB_CHANNEL, "b")
+
+        await first.close()
+        self.assertFalse(listen_conn.closed)
+        await second.close()
+        self.assertTrue(listen_conn.closed)
+        self.assertEqual(NotificationHub._hubs.get(asyncio.get_running_loop()), {})
+
+    async def test_set_application_name_leaves_the_shared_session_alone(self):
+        pooled_conn = _FakePooledConnection()
+        listen_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+        connection.wait_until_ready = AsyncMock()
+
+        with self._patch_connect(listen_conn), patch(
+            "bullmq.backends.postgres_connection.AsyncConnectionPool",
+            _fake_pool_factory([pooled_conn]),
+        ):
+            await connection.subscribe(JOB_CHANNEL, "queue")
+            await connection.set_application_name("tenant_a:queue:w:2")
+
+        pooled_conn.execute.assert_awaited_once_with(
+            "SELECT set_config('application_name', %s, false)",
+            ("tenant_a:queue:w:2",),
+        )
+        listen_conn.execute.assert_awaited_once()
+        await connection.close()
+
+
+
+class _FakeSubscription:
+    def __init__(self, wakes=()):
+        self._wakes = list(wakes)
+        self.waits = 0
+
+    async def wait(self, timeout):
+        self.waits += 1
+        if self._wakes:
+            return self._wakes.pop(0)
+        await asyncio.sleep(timeout)
+        return False
+
+
+def _waiting_backend(subscription):
+    connection = SimpleNamespace(
+        schema="bullmq",
+        subscribe=AsyncMock(return_value=subscription),
+        unsubscribe=MagicMock(),
+        close=AsyncMock(),
+    )
+    return PostgresBackend("queue", connection)
 
 
 class TestPostgresBackendWaitForJob(unittest.IsolatedAsyncioTestCase):
-    async def test_wait_for_job_reconnects_listen_channel_after_psycopg_error(self):
-        connection = _FakeWaitConnection()
-        backend = PostgresBackend("queue", connection)
-        backend._has_waiting_job = AsyncMock(side_effect=[False, False, True])
-        backend._next_delay_ms = AsyncMock(return_value=None)
+    async def test_wait_for_job_subscribes_to_its_queue_once(self):
+        subscription = _FakeSubscription()
+        backend = _waiting_backend(subscription)
+        backend._has_waiting_job = AsyncMock(return_value=True)
 
-        marker = await backend.waitForJob(0.2)
+        await backend.waitForJob(1)
+        await backend.waitForJob(1)
+        await backend.close()
 
-        self.assertEqual(marker, ["bullmq_jobs", "queue", 0])
-        connection.reset_job_channel.assert_awaited_once()
-        self.assertEqual(connection.ensure_job_channel.await_count, 2)
+        backend.connection.subscribe.assert_awaited_once_with("bullmq_jobs", "queue")
+        backend.connection.unsubscribe.assert_called_once_with(subscription)
 
     async def test_wait_for_job_returns_future_marker_when_only_delayed_jobs_exist(self):
-        connection = SimpleNamespace(
-            schema="bullmq",
-            ensure_job_channel=AsyncMock(return_value=_IdleNotifiesConnection()),
-            reset_job_channel=AsyncMock(),
-        )
-        backend = PostgresBackend("queue", connection)
+        backend = _waiting_backend(_FakeSubscription())
         backend._has_waiting_job = AsyncMock(return_value=False)
         backend._next_delay_ms = AsyncMock(side_effect=[500, 500])
 
@@ -314,6 +954,285 @@ class TestPostgresBackendWaitForJob(unittest.IsolatedAsyncioTestCase):
         self.assertLessEqual(marker[2], expected_max)
         self.assertEqual(backend._next_delay_ms.await_count, 2)
 
+    async def test_wait_for_job_probes_when_woken(self):
+        backend = _waiting_backend(_FakeSubscription([True, True]))
+        backend._has_waiting_job = AsyncMock(side_effect=[False, False, True])
+        backend._next_delay_ms = AsyncMock(return_value=None)
+
+        marker = await backend.waitForJob(5)
+
+        self.assertEqual(marker, ["bullmq_jobs", "queue", 0])
+        self.assertEqual(backend._has_waiting_job.await_count, 3)
+
+    async def test_wait_for_job_does_not_poll_while_idle(self):
+        backend = _waiting_backend(_FakeSubscription())
+        backend._has_waiting_job = AsyncMock(return_value=False)
+        backend._next_delay_ms = AsyncMock(return_value=None)
+
+        marker = await backend.waitForJob(0.05)
+
+        self.assertIsNone(marker)
+        backend._has_waiting_job.assert_awaited_once()
+
+
+class TestPostgresBackendWaitAndClaim(unittest.IsolatedAsyncioTestCase):
+    async def test_claimed_job_skips_the_no_job_signal(self):
+        backend = _waiting_backend(_FakeSubscription())
+        claimed = SimpleNamespace(maps=lambda: [{"id": 7, "name": "job"}])
+        backend._run = AsyncMock(return_value=claimed)
+        backend._has_waiting_job = AsyncMock()
+
+        job_data, job_id, limit_until, delay_until = await backend.waitAndClaim(
+            "token", {"lockDuration": 1000}, 5
+        )
+
+        self.assertEqual(job_data["name"], "job")
+        self.assertEqual((job_id, limit_until, delay_until), ("7", 0, 0))
+        (command, params), _ = backend._run.await_args
+        self.assertEqual(command, "move_to_active")
+        self.assertEqual(params[:3], ["queue", "token", 1000])
+        backend._run.assert_awaited_once()
+        backend._has_waiting_job.assert_not_awaited()
+
+    async def test_empty_claim_reads_the_no_job_signal(self):
+        backend = _waiting_backend(_FakeSubscription())
+        empty = SimpleNamespace(maps=lambda: [])
+        signal = SimpleNamespace(first_map=lambda: {"rate_limit_ttl": 250, "next_delay": None})
+        backend._run = AsyncMock(side_effect=[empty, signal])
+
+        result = await backend.waitAndClaim("token", {}, 5)
+
+        self.assertEqual(result[:3], [None, "", 250])
+        self.assertEqual(
+            [c.args[0] for c in backend._run.await_args_list], ["move_to_active", "next_signal"]
+        )
+
+    async def test_losing_the_race_goes_back_to_waiting(self):
+        subscription = _FakeSubscription([True, True])
+        backend = _waiting_backend(subscription)
+        job = [{"name": "job"}, "1", 0, 0]
+        backend.moveToActive = AsyncMock(side_effect=[[None, "", 0, 0], [None, "", 0, 0], job])
+        backend._has_waiting_job = AsyncMock()
+
+        result = await backend.waitAndClaim("token", {}, 5)
+
+        self.assertIs(result, job)
+        self.assertEqual(backend.moveToActive.await_count, 3)
+        self.assertEqual(subscription.waits, 2)
+        backend._has_waiting_job.assert_not_awaited()
+
+    async def test_returns_rate_limit_without_waiting(self):
+        subscription = _FakeSubscription()
+        backend = _waiting_backend(subscription)
+        backend.moveToActive = AsyncMock(return_value=[None, "", 250, 0])
+
+        result = await backend.waitAndClaim("token", {}, 5)
+
+        self.assertEqual(result, [None, "", 250, 0])
+        self.assertEqual(subscription.waits, 0)
+
+    async def test_returns_next_delay_when_the_wait_times_out(self):
+        backend = _waiting_backend(_FakeSubscription())
+        next_delay = int(time.time() * 1000) + 60000
+        backend.moveToActive = AsyncMock(return_value=[None, "", 0, next_delay])
+
+        result = await backend.waitAndClaim("token", {}, 0.05)
+
+        self.assertEqual(result, [None, "", 0, next_delay])
+        self.assertEqual(backend.moveToActive.await_count, 2)
+
+
+class TestPostgresBackendEvents(unittest.IsolatedAsyncioTestCase):
+    def _result(self, rows):
+        return SimpleNamespace(first_map=lambda: rows[0] if rows else None, maps=lambda: rows)
+
+    async def test_read_events_returns_stream_shaped_entries(self):
+        subscription = _FakeSubscription()
+        backend = _waiting_backend(subscription)
+        backend._run = AsyncMock(
+            return_value=self._result(
+                [
+                    {"id": 4, "event": "completed", "data": {"jobId": "1", "returnvalue": "{\"a\":1}"}},
+                    {"id": 5, "event": "delayed", "data": {"jobId": "2", "delay": 1700}},
+                ]
+            )
+        )
+
+        data = await backend.readEvents("3", 1000)
+
+        self.assertEqual(
+            data,
+            [
+                (
+                    "events",
+                    [
+                        ("4", {"event": "completed", "jobId": "1", "returnvalue": "{\"a\":1}"}),
+                        ("5", {"event": "delayed", "jobId": "2", "delay": "1700"}),
+                    ],
+                )
+            ],
+        )
+        backend._run.assert_awaited_once_with("read_events", ["queue", 3, 100])
+        backend.connection.subscribe.assert_awaited_once_with("bullmq_events", "queue")
+        self.assertEqual(subscription.waits, 0)
+
+    async def test_read_events_waits_for_a_notification_then_reads_again(self):
+        subscription = _FakeSubscription([True])
+        backend = _waiting_backend(subscription)
+        backend._run = AsyncMock(
+            side_effect=[
+                self._result([]),
+                self._result([{"id": 8, "event": "added", "data": {"jobId": "3"}}]),
+            ]
+        )
+
+        data = await backend.readEvents("7", 1000)
+
+        self.assertEqual(data, [("events", [("8", {"event": "added", "jobId": "3"})])])
+        self.assertEqual(subscription.waits, 1)
+
+    async def test_dollar_cursor_survives_timed_out_reads(self):
+        backend = _waiting_backend(_FakeSubscription())
+        backend._run = AsyncMock(
+            side_effect=[
+                self._result([{"max": 10}]),
+                self._result([]),
+                self._result([]),
+                self._result([]),
+                self._result([{"id": 11, "event": "added", "data": {}}]),
+            ]
+        )
+
+        self.assertIsNone(await backend.readEvents("$", 1))
+        data = await backend.readEvents("$", 1)
+
+        self.assertEqual(data, [("events", [("11", {"event": "added"})])])
+        self.assertEqual(
+            [c.args for c in backend._run.await_args_list],
+            [
+                ("read_events_max", ["queue"]),
+                ("read_events", ["queue", 10, 100]),
+                ("read_events", ["queue", 10, 100]),
+                ("read_events", ["queue", 10, 100]),
+                ("read_events", ["queue", 10, 100]),
+            ],
+        )
+
+    async def test_publish_event_stores_the_other_fields_as_data(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(return_value=self._result([{"id": 12}]))
+
+        event_id = await backend.publishEvent({"event": "custom", "foo": "bar"}, 1000)
+
+        self.assertEqual(event_id, "12")
+        backend._run.assert_awaited_once_with("publish_event", ["queue", "custom", '{"foo":"bar"}'])
+
+
+class TestPostgresBackendEventRetention(unittest.IsolatedAsyncioTestCase):
+    def _deleted(self, count):
+        return SimpleNamespace(rowcount=count)
+
+    def _cutoff(self, *ids):
+        return SimpleNamespace(rows=[(event_id,) for event_id in ids])
+
+    async def test_trim_events_deletes_in_bounded_batches(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(side_effect=[
+            self._cutoff(4242), self._deleted(1000), self._deleted(1000), self._deleted(5),
+        ])
+
+        deleted = await backend.trimEvents(10)
+
+        self.assertEqual(deleted, 2005)
+        self.assertEqual(backend._run.await_count, 4)
+        self.assertEqual(
+            backend._run.await_args_list[0].args, ("get_event_trim_cutoff", ["queue", 10])
+        )
+        backend._run.assert_awaited_with("trim_events", ["queue", 4242, None, 1000])
+
+    async def test_trim_events_skips_the_batches_when_nothing_is_out_of_retention(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(return_value=self._cutoff())
+
+        self.assertEqual(await backend.trimEvents(10), 0)
+        backend._run.assert_awaited_once_with("get_event_trim_cutoff", ["queue", 10])
+
+    async def test_trim_events_turns_max_age_into_a_cutoff(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(side_effect=[self._cutoff(), self._deleted(0)])
+
+        before = int(time.time() * 1000)
+        await backend.trimEvents(None, 60000)
+
+        _, params = backend._run.await_args.args
+        self.assertIsNone(params[1])
+        self.assertGreaterEqual(params[2], before - 60000)
+        self.assertLessEqual(params[2], int(time.time() * 1000) - 60000)
+
+    async def test_adding_jobs_trims_in_the_background_with_the_queue_retention(self):
+        backend = PostgresBackend(
+            "queue",
+            SimpleNamespace(schema="bullmq", close=AsyncMock(), maintain_storage=AsyncMock()),
+            event_retention={"maxLen": 500},
+        )
+        backend.trimEvents = AsyncMock(return_value=0)
+
+        backend._trim_events_soon()
+        await backend._trim_task
+        backend._trim_events_soon()
+        await backend.close()
+
+        backend.trimEvents.assert_awaited_once_with(500, None)
+        backend.connection.maintain_storage.assert_awaited_once()
+
+    async def test_automatic_trims_are_time_based(self):
+        backend = PostgresBackend(
+            "queue", SimpleNamespace(schema="bullmq", maintain_storage=AsyncMock())
+        )
+        backend.trimEvents = AsyncMock(return_value=0)
+
+        with patch("bullmq.backends.postgres_backend.time.monotonic", return_value=100.0):
+            backend._trim_events_soon()
+            await backend._trim_task
+        with patch("bullmq.backends.postgres_backend.time.monotonic", return_value=109.0):
+            backend._trim_events_soon()
+        self.assertTrue(backend._trim_task.done())
+        with patch("bullmq.backends.postgres_backend.time.monotonic", return_value=111.0):
+            backend._trim_events_soon()
+            await backend._trim_task
+
+        self.assertEqual(backend.trimEvents.await_count, 2)
+
+    async def test_failed_automatic_trim_is_logged(self):
+        backend = PostgresBackend(
+            "queue", SimpleNamespace(schema="bullmq", maintain_storage=AsyncMock())
+        )
+        backend.trimEvents = AsyncMock(side_effect=psycopg.errors.InsufficientPrivilege("denied"))
+
+        with self.assertLogs("bullmq.backends.postgres_backend", "WARNING") as logs:
+            backend._trim_events_soon()
+            await backend._trim_task
+
+        self.assertIn("could not trim the events of queue queue", logs.output[0])
+
+    def test_for_queue_keeps_the_event_retention(self):
+        backend = PostgresBackend(
+            "queue", SimpleNamespace(schema="bullmq"), event_retention={"maxLen": 500}
+        )
+
+        sibling = backend.forQueue("other")
+
+        self.assertEqual(sibling.event_retention, {"maxLen": 500})
+
+    async def test_caller_connections_never_trim(self):
+        backend = PostgresBackend(
+            "queue", SimpleNamespace(schema="bullmq", storage_layout={})
+        ).withConnection(SimpleNamespace())
+
+        backend._trim_events_soon()
+
+        self.assertIsNone(backend._trim_task)
+
 
 class TestPostgresBackendLockExtension(unittest.IsolatedAsyncioTestCase):
     async def test_extend_locks_batches_jobs_in_one_command(self):
@@ -334,3 +1253,313 @@ class TestPostgresBackendLockExtension(unittest.IsolatedAsyncioTestCase):
             "extend_locks",
             ["queue", ["job-1", "job-2"], ["token-1", "token-2"], 5000, 123],
         )
+
+
+class TestPostgresBackendGetJobsByIds(unittest.IsolatedAsyncioTestCase):
+    async def test_fetches_all_ids_in_one_command_and_keeps_input_order(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        rows = [
+            {"id": "3", "name": "c", "data": {}, "opts": {}},
+            {"id": "1", "name": "a", "data": {}, "opts": {}},
+        ]
+        backend._run = AsyncMock(return_value=SimpleNamespace(maps=lambda: rows))
+
+        jobs = await backend.getJobsByIds(["1", "2", "3"])
+
+        backend._run.assert_awaited_once_with(
+            "get_jobs_data", ["queue", ["1", "2", "3"]]
+        )
+        self.assertEqual([job and job["name"] for job in jobs], ["a", None, "c"])
+
+    async def test_empty_ids_skip_the_round_trip(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock()
+
+        self.assertEqual(await backend.getJobsByIds([]), [])
+        backend._run.assert_not_awaited()
+
+
+class TestPostgresBackendCountsForQueues(unittest.IsolatedAsyncioTestCase):
+    async def test_one_grouped_query_aligned_with_the_names(self):
+        backend = PostgresBackend("", SimpleNamespace(schema="bullmq"))
+        rows = [
+            {"queue": "b", "active": 1, "waiting": 4, "paused": "1"},
+            {"queue": "a", "active": 2, "waiting": 3, "paused": None},
+        ]
+        backend._run = AsyncMock(return_value=SimpleNamespace(maps=lambda: rows))
+
+        counts = await backend.getCountsForQueues(["a", "b", "c"], ["active", "waiting", "paused"])
+
+        backend._run.assert_awaited_once_with("get_counts_for_queues", [["a", "b", "c"]])
+        self.assertEqual(counts, [[2, 3, 0], [1, 0, 4], [0, 0, 0]])
+
+
+class TestPostgresBackendListQueues(unittest.IsolatedAsyncioTestCase):
+    async def test_pages_through_the_queue_names_by_keyset(self):
+        backend = PostgresBackend("", SimpleNamespace(schema="bullmq"))
+        pages = [[{"queue": "a"}, {"queue": "b"}], [{"queue": "c"}]]
+        backend._run = AsyncMock(
+            side_effect=[SimpleNamespace(maps=lambda rows=rows: rows) for rows in pages]
+        )
+
+        names = [name async for name in backend.listQueues(page_size=2)]
+
+        self.assertEqual(names, ["a", "b", "c"])
+        self.assertEqual(
+            backend._run.await_args_list,
+            [call("list_queues", ["", 2]), call("list_queues", ["b", 2])],
+        )
+
+
+class TestPostgresBackendHeartbeats(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_upserts_the_record_with_its_expiry(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock()
+
+        with patch("bullmq.backends.postgres_backend._now_ms", return_value=1000):
+            await backend.publishHeartbeat("w1", {"id": "w1", "active": 2}, 300)
+
+        backend._run.assert_awaited_once_with(
+            "worker_heartbeat",
+            ["queue", "w1", 1300, '{"id":"w1","active":2,"expiresAt":1300}', 1000],
+        )
+
+    async def test_reads_the_live_records(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        rows = [{"info": {"id": "w1"}}, {"info": {"id": "w2"}}]
+        backend._run = AsyncMock(return_value=SimpleNamespace(maps=lambda: rows))
+
+        with patch("bullmq.backends.postgres_backend._now_ms", return_value=1000):
+            self.assertEqual(await backend.getHeartbeats(), [{"id": "w1"}, {"id": "w2"}])
+
+        backend._run.assert_awaited_once_with("get_worker_heartbeats", ["queue", 1000])
+
+    async def test_no_registry_table_means_no_heartbeats(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(
+            side_effect=psycopg.errors.UndefinedTable('relation "worker_heartbeat" does not exist')
+        )
+
+        self.assertEqual(await backend.getHeartbeats(), [])
+
+    def test_heartbeat_interval_enables_the_registry_layout(self):
+        self.assertEqual(storage_layout({"heartbeatInterval": 5000}), {"workerRegistry": True})
+        self.assertEqual(storage_layout({"workerRegistry": True}), {"workerRegistry": True})
+        self.assertEqual(storage_layout({}), {})
+
+
+class TestPostgresBackendCancellation(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_notifies_with_the_queue_job_and_reason(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock()
+
+        await backend.publishCancellation("7", "stop")
+
+        backend._run.assert_awaited_once_with("cancel_job", ["queue", "7", "stop"])
+
+    async def test_listen_yields_the_requests_for_this_queue(self):
+        listen_conn = _FakeListenConnection()
+        connection = PostgresConnection()
+        backend = PostgresBackend("queue", connection)
+
+        with patch(
+            "bullmq.backends.postgres_connection.psycopg.AsyncConnection.connect",
+            AsyncMock(return_value=listen_conn),
+        ):
+            requests = backend.listenCancellations()
+            first = asyncio.ensure_future(requests.__anext__())
+            while not connection._subscriptions:
+                await asyncio.sleep(0)
+
+        listen_conn.send(CANCEL_CHANNEL, '{"queue":"other","jobId":"1","reason":null}')
+        listen_conn.send(CANCEL_CHANNEL, '{"queue":"queue","jobId":"2","reason":"stop"}')
+
+        self.assertEqual(await asyncio.wait_for(first, 1), ("2", "stop"))
+        await requests.aclose()
+        self.assertFalse(connection._subscriptions)
+        await connection.close()
+
+
+class TestPostgresBackendGetMetrics(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_meta_sliced_data_and_stored_points(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        row = {"total": "42", "data": [3, 0, 5], "prev_ts": "1700000000000", "prev_count": "40", "points": "10"}
+        backend._run = AsyncMock(return_value=SimpleNamespace(first_map=lambda: row))
+
+        result = await backend.getMetrics("completed", 0, 2)
+
+        backend._run.assert_awaited_once_with("get_metrics", ["queue", "completed", 0, 2])
+        self.assertEqual(result, [[42, 1700000000000, 40], [3, 0, 5], 10])
+
+    async def test_missing_metrics_are_empty(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(return_value=SimpleNamespace(first_map=lambda: None))
+
+        self.assertEqual(await backend.getMetrics("failed"), [[0, 0, 0], [], 0])
+
+
+class TestPostgresBackendPipelines(unittest.IsolatedAsyncioTestCase):
+    def _result(self, rows=None):
+        return SimpleNamespace(first_map=lambda: rows[0] if rows else None, maps=lambda: rows or [])
+
+    async def test_add_log_with_keep_logs_pipelines_the_trim(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock()
+        backend._run_pipeline = AsyncMock(return_value=[self._result([{"idx": 7}]), self._result()])
+
+        count = await backend.addLog("1", "row", keep_logs=3)
+
+        self.assertEqual(count, 3)
+        backend._run.assert_not_awaited()
+        backend._run_pipeline.assert_awaited_once_with(
+            [
+                ("add_log", ["queue", "1", "row"]),
+                ("trim_logs_keep_last", ["queue", "1", 3]),
+            ]
+        )
+
+    async def test_move_to_completed_buffers_metrics_when_enabled(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq", close=AsyncMock()))
+        backend._run = AsyncMock(return_value=self._result())
+        backend._trim_events_soon = MagicMock()
+        backend._run_pipeline = AsyncMock()
+        queue = SimpleNamespace(opts={"metrics": {"maxDataPoints": 10}})
+
+        first = await backend.moveToCompleted(
+            SimpleNamespace(id="1", queue=queue), "done", False, "token", fetch_next=False
+        )
+        await backend.moveToCompleted(
+            SimpleNamespace(id="2", queue=queue), "done", False, "token", fetch_next=False
+        )
+        self.assertEqual(backend._run.await_count, 2)
+        await backend.close()
+
+        backend._run_pipeline.assert_not_awaited()
+        self.assertEqual(backend._run.await_count, 3)
+        backend._run.assert_awaited_with(
+            "collect_metrics_batch", ["queue", "completed", 10, first["finishedOn"], 2]
+        )
+
+    async def test_metrics_of_a_new_minute_flush_the_previous_bucket(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq", close=AsyncMock()))
+        backend._run = AsyncMock()
+
+        backend._metrics.record("completed", 60_000, 5)
+        backend._metrics.record("completed", 119_999, 5)
+        backend._metrics.record("failed", 119_000, 5)
+        backend._metrics.record("completed", 120_000, 5)
+        await backend.close()
+
+        self.assertEqual(
+            backend._run.await_args_list,
+            [
+                call("collect_metrics_batch", ["queue", "completed", 5, 60_000, 2]),
+                call("collect_metrics_batch", ["queue", "failed", 5, 119_000, 1]),
+                call("collect_metrics_batch", ["queue", "completed", 5, 120_000, 1]),
+            ],
+        )
+
+    async def test_failed_metrics_flush_is_logged_and_discarded(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq", close=AsyncMock()))
+        backend._run = AsyncMock(side_effect=psycopg.OperationalError("connection lost"))
+
+        backend._metrics.record("completed", 60_000, 5)
+        with self.assertLogs("bullmq.backends.postgres_backend", "WARNING") as logs:
+            await backend.close()
+
+        self.assertIn("dropped the completed metrics of 1 job(s) of queue queue", logs.output[0])
+        self.assertEqual(backend._metrics._pending, {})
+
+    async def test_move_to_completed_skips_pipeline_without_metrics(self):
+        backend = PostgresBackend("queue", SimpleNamespace(schema="bullmq"))
+        backend._run = AsyncMock(return_value=self._result())
+        backend._run_pipeline = AsyncMock()
+        backend._trim_events_soon = MagicMock()
+        job = SimpleNamespace(id="1", queue=SimpleNamespace(opts={}))
+
+        await backend.moveToCompleted(job, "done", False, "token", fetch_next=False)
+
+        backend._run_pipeline.assert_not_awaited()
+        self.assertEqual(backend._run.await_args.args[0], "move_to_completed")
+        backend._trim_events_soon.assert_called_once()
+
+    async def test_ingest_jobs_copies_rows_into_staging(self):
+        connection = SimpleNamespace(schema="bullmq", copy_and_run=AsyncMock())
+        backend = PostgresBackend("queue", connection)
+        backend._trim_events_soon = MagicMock()
+        queue = SimpleNamespace(name="queue", backend=backend, qualifiedName="queue")
+        jobs = [
+            Job(queue, "a", {"n": 1}, {"timestamp": 10}),
+            Job(queue, "b", {"n": 2}, {"jobId": "custom", "delay": 5, "timestamp": 10}),
+        ]
+
+        await backend.ingestJobs(jobs)
+
+        setup, copy, types, rows, command, params = connection.copy_and_run.await_args.args
+        rows = list(rows)
+        self.assertEqual((setup, copy, command, params), (
+            "create_bulk_stage", "copy_bulk_stage", "add_jobs_staged", ["queue"],
+        ))
+        self.assertEqual(len(types), len(rows[0]))
+        self.assertEqual([row[:3] for row in rows], [(0, "", "a"), (1, "custom", "b")])
+        self.assertEqual(rows[0][3].obj, {"n": 1})
+        self.assertEqual(rows[1][6], 5)
+        backend._trim_events_soon.assert_called_once()
+
+    async def test_ingest_jobs_routes_dependent_jobs_to_add_jobs(self):
+        connection = SimpleNamespace(schema="bullmq", copy_and_run=AsyncMock())
+        backend = PostgresBackend("queue", connection)
+        backend.addJobs = AsyncMock()
+        queue = SimpleNamespace(name="queue", backend=backend, qualifiedName="queue")
+        jobs = [Job(queue, "a", {}, {"deduplication": {"id": "d"}})]
+
+        await backend.ingestJobs(jobs)
+
+        backend.addJobs.assert_awaited_once_with(jobs)
+        connection.copy_and_run.assert_not_awaited()
+
+
+class TestCallerConnection(unittest.IsolatedAsyncioTestCase):
+    async def test_add_job_runs_on_the_callers_connection(self):
+        caller = _FakePooledConnection()
+        owner = PostgresConnection({"schema": "tenant_a"})
+        owner.wait_until_ready = AsyncMock()
+        backend = PostgresBackend("queue", owner).withConnection(caller)
+
+        self.assertIsInstance(backend.connection, CallerConnection)
+        self.assertFalse(backend.owns_connection)
+
+        await backend.connection.run_command("get_counts", ["queue", ["waiting"]])
+        await backend.close()
+
+        owner.wait_until_ready.assert_awaited_once()
+        self.assertEqual(caller.pipelines, 1)
+        self.assertEqual(len(caller.cursor_executes), 1)
+        push, pop = caller.execute.await_args_list
+        self.assertIn("set_config('search_path'", push.args[0])
+        self.assertEqual(push.args[1], ('"tenant_a"',))
+        self.assertIn("bullmq.caller_search_path", pop.args[0])
+        self.assertEqual(caller.transactions, 0)
+        self.assertEqual(caller.prepares, [False])
+
+    async def test_opens_a_transaction_on_an_idle_autocommit_connection(self):
+        caller = _FakePooledConnection()
+        caller.autocommit = True
+        caller.info.transaction_status = TransactionStatus.IDLE
+        owner = PostgresConnection({"schema": "tenant_a"})
+        owner.wait_until_ready = AsyncMock()
+        backend = PostgresBackend("queue", owner).withConnection(caller)
+
+        await backend.connection.run_command("get_counts", ["queue", ["waiting"]])
+
+        self.assertEqual(caller.transactions, 1)
+        self.assertEqual(caller.prepares, [False])
+
+    async def test_accepts_a_transaction(self):
+        conn = _FakePooledConnection()
+        transaction = psycopg.AsyncTransaction.__new__(psycopg.AsyncTransaction)
+        transaction._conn = conn
+
+        caller = CallerConnection(transaction, PostgresConnection())
+
+        self.assertIs(caller.conn, conn)
@@ -1,3 +1,5 @@
+import json
+import time
 import unittest
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
@@ -102,3 +104,26 @@ class TestQueueClusterGetters(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(workers_count, 3)
 
         await queue.close()
+
+    async def test_get_workers_reads_the_registry_when_enabled(self):
+        queue = Queue("test-queue", {"prefix": "bull", "workerRegistry": True})
+        now = int(time.time() * 1000)
+        records = {
+            "w1": json.dumps({"id": "w1", "name": "test-queue", "active": 2, "expiresAt": now + 30000}),
+            "w2": json.dumps({"id": "w2", "name": "test-queue", "active": 0, "expiresAt": now - 1}),
+        }
+        client = SimpleNamespace(
+            hgetall=AsyncMock(return_value=records),
+            hdel=AsyncMock(),
+            client_list=AsyncMock(),
+        )
+        _install_client(queue, client)
+
+        workers = await queue.get_workers()
+
+        self.assertEqual([w["id"] for w in workers], ["w1"])
+        self.assertEqual(workers[0]["active"], 2)
+        client.hdel.assert_not_awaited()
+        client.client_list.assert_not_awaited()
+
+        await queue.close()
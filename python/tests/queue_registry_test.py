@@ -0,0 +1,182 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from bullmq import QueueRegistry
+from bullmq.backends import RedisBackend
+
+
+def _scanning_node(pages):
+    """A fake node client answering SCAN with the given (cursor, keys) pages."""
+    replies = iter(pages)
+
+    async def execute_command(*args):
+        assert args[0] == "SCAN"
+        return next(replies)
+
+    return SimpleNamespace(execute_command=AsyncMock(side_effect=execute_command))
+
+
+def _redis_backend(client, prefix="bull"):
+    # Skips __init__, which loads the Lua commands; listQueues only needs the
+    # prefix and the raw client.
+    backend = RedisBackend.__new__(RedisBackend)
+    backend.prefix = prefix
+    backend.connection = SimpleNamespace(conn=client)
+    return backend
+
+
+class TestQueueRegistry(unittest.IsolatedAsyncioTestCase):
+    def _registry(self, cache_ttl=0):
+        with patch("bullmq.queue_registry.create_backend", return_value=AsyncMock()):
+            registry = QueueRegistry({}, cache_ttl=cache_ttl)
+        registry.backend.getCountsForQueues.return_value = [[1, 2], [3, None]]
+        return registry
+
+    async def test_counts_every_queue_in_one_call(self):
+        registry = self._registry()
+
+        counts = await registry.getJobCountsForQueues(["a", "b", "a"], "active")
+
+        registry.backend.getCountsForQueues.assert_awaited_once_with(["a", "b"], ["active"])
+        self.assertEqual(counts["a"], {"active": 1})
+        self.assertEqual(counts["b"], {"active": 3})
+
+    async def test_concurrent_identical_requests_share_one_fetch(self):
+        registry = self._registry()
+        release = asyncio.Event()
+
+        async def fetch(names, types):
+            await release.wait()
+            return [[1], [2]]
+
+        registry.backend.getCountsForQueues.side_effect = fetch
+        pending = [
+            asyncio.ensure_future(registry.getJobCountsForQueues(["a", "b"], "failed"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+
+        self.assertEqual(registry.backend.getCountsForQueues.await_count, 1)
+        self.assertTrue(all(r == {"a": {"failed": 1}, "b": {"failed": 2}} for r in results))
+
+    async def test_snapshots_are_reused_within_the_ttl(self):
+        registry = self._registry(cache_ttl=60_000)
+
+        await registry.getJobCountsForQueues(["a", "b"], "active")
+        await registry.getJobCountsForQueues(["a", "b"], "active")
+        self.assertEqual(registry.backend.getCountsForQueues.await_count, 1)
+
+        registry.clearCache()
+        await registry.getJobCountsForQueues(["a", "b"], "active")
+        self.assertEqual(registry.backend.getCountsForQueues.await_count, 2)
+
+    async def test_without_ttl_every_request_fetches(self):
+        registry = self._registry()
+
+        await registry.getJobCountsForQueues(["a", "b"], "active")
+        await registry.getJobCountsForQueues(["a", "b"], "active")
+
+        self.assertEqual(registry.backend.getCountsForQueues.await_count, 2)
+
+    async def test_failures_are_not_cached(self):
+        registry = self._registry(cache_ttl=60_000)
+        registry.backend.getCountsForQueues.side_effect = [RuntimeError("down"), [[1], [2]]]
+
+        with self.assertRaises(RuntimeError):
+            await registry.getJobCountsForQueues(["a", "b"], "active")
+        counts = await registry.getJobCountsForQueues(["a", "b"], "active")
+
+        self.assertEqual(counts["b"], {"active": 2})
+
+    async def test_every_caller_gets_its_own_copy(self):
+        registry = self._registry(cache_ttl=60_000)
+
+        first = await registry.getJobCountsForQueues(["a", "b"], "active")
+        first["a"]["active"] = 99
+        first.pop("b")
+        second = await registry.getJobCountsForQueues(["a", "b"], "active")
+
+        self.assertEqual(second, {"a": {"active": 1}, "b": {"active": 3}})
+
+    async def test_expired_and_oldest_snapshots_are_evicted(self):
+        registry = self._registry(cache_ttl=60_000)
+        registry.backend.getCountsForQueues.side_effect = lambda names, types: [[1] for _ in names]
+
+        with patch("bullmq.queue_registry._CACHE_MAX_ENTRIES", 2):
+            for name in ("a", "b", "c"):
+                await registry.getJobCountsForQueues([name], "active")
+            self.assertEqual([key[0] for key in registry._cache], [("b",), ("c",)])
+
+            with patch("bullmq.queue_registry.time.monotonic", return_value=time.monotonic() + 61):
+                await registry.getJobCountsForQueues(["d"], "active")
+            self.assertEqual([key[0] for key in registry._cache], [("d",)])
+
+    async def test_list_queues_streams_the_backend_names(self):
+        registry = self._registry()
+
+        async def names(prefix):
+            for name in ("a", "b"):
+                yield name
+
+        registry.backend.listQueues = names
+
+        self.assertEqual([name async for name in registry.listQueues()], ["a", "b"])
+
+
+class TestRedisListQueues(unittest.IsolatedAsyncioTestCase):
+    async def test_scans_meta_keys_until_the_cursor_wraps(self):
+        node = _scanning_node([
+            (7, ["bull:a:meta", b"bull:b:c:meta"]),
+            (0, ["bull:a:meta", "bull:d:meta"]),
+        ])
+
+        names = [name async for name in _redis_backend(node).listQueues(page_size=50)]
+
+        self.assertEqual(names, ["a", "b:c", "d"])
+        node.execute_command.assert_any_await("SCAN", 0, "MATCH", "bull:*:meta", "COUNT", 50)
+        node.execute_command.assert_any_await("SCAN", 7, "MATCH", "bull:*:meta", "COUNT", 50)
+
+    async def test_cluster_scans_every_primary(self):
+        primary1 = _scanning_node([(0, ["{t}:a:meta"])])
+        primary2 = _scanning_node([(0, ["{t}:b:meta"])])
+        replica = _scanning_node([(0, ["{t}:a:meta"])])
+        cluster = SimpleNamespace(
+            is_cluster=True,
+            nodes=lambda: [
+                SimpleNamespace(client=primary1, server_type="primary"),
+                SimpleNamespace(client=replica, server_type="replica"),
+                SimpleNamespace(client=primary2, server_type="primary"),
+            ],
+        )
+
+        names = [name async for name in _redis_backend(cluster, "{t}").listQueues()]
+
+        self.assertEqual(sorted(names), ["a", "b"])
+        primary1.execute_command.assert_awaited_once_with(
+            "SCAN", 0, "MATCH", "{t}:*:meta", "COUNT", 1000
+        )
+        replica.execute_command.assert_not_awaited()
+
+    async def test_scan_errors_are_raised_to_the_consumer(self):
+        node = SimpleNamespace(execute_command=AsyncMock(side_effect=ConnectionError("gone")))
+
+        with self.assertRaises(ConnectionError):
+            [name async for name in _redis_backend(node).listQueues()]
+
+    async def test_prefix_glob_characters_are_escaped(self):
+        node = _scanning_node([(0, [])])
+
+        [name async for name in _redis_backend(node).listQueues("team[1]")]
+
+        node.execute_command.assert_awaited_once_with(
+            "SCAN", 0, "MATCH", "team\\[1\\]:*:meta", "COUNT", 1000
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -89,6 +89,42 @@ class TestQueue(unittest.IsolatedAsyncioTestCase):
 
         await queue.close()
 
+    async def test_get_jobs_by_ids(self):
+        queue_name = f"__test_queue__{uuid4().hex}"
+        queue = Queue(queue_name, {"prefix": prefix})
+        job1 = await queue.add("test-job", {"foo": "bar"}, {})
+        job2 = await queue.add("test-job", {"foo": "baz"}, {})
+
+        jobs = await queue.getJobsByIds([job2.id, "missing", job1.id])
+
+        self.assertEqual(len(jobs), 3)
+        self.assertEqual(jobs[0].id, job2.id)
+        self.assertEqual(jobs[0].data, {"foo": "baz"})
+        self.assertIsNone(jobs[1])
+        self.assertEqual(jobs[2].id, job1.id)
+        self.assertEqual(jobs[2].data, {"foo": "bar"})
+        await queue.close()
+
+    async def test_add_with_batching(self):
+        queue = Queue(queueName, {"prefix": prefix, "addBatching": {"maxJobs": 10, "maxDelay": 5}})
+
+        jobs = await asyncio.gather(
+            *(queue.add("test-job", {"idx": idx}) for idx in range(3))
+        )
+
+        self.assertEqual(len({job.id for job in jobs}), 3)
+        fetched = await queue.getJobsByIds([job.id for job in jobs])
+        self.assertEqual([job.data["idx"] for job in fetched], [0, 1, 2])
+        await queue.close()
+
+    async def test_add_on_caller_connection_requires_postgres(self):
+        queue = Queue(queueName, {"prefix": prefix})
+
+        with self.assertRaises(NotImplementedError):
+            await queue.add("test-job", {"foo": "bar"}, connection=object())
+
+        await queue.close()
+
     async def test_get_job_state(self):
         queue = Queue(queueName, {"prefix": prefix})
         job = await queue.add("test-job", {"foo": "bar"}, {})
@@ -35,3 +35,28 @@ class TestSqlLoader(unittest.TestCase):
                 resolved = sql_loader._resolve_sql_root()
 
         self.assertEqual(resolved, module_dir)
+
+    def test_to_pyformat_strips_comments_and_escapes_percent(self):
+        query, order = sql_loader.to_pyformat(
+            "-- Params: $1 queue, $2 pattern\nSELECT $1 LIKE $2 || '%'"
+        )
+
+        self.assertEqual(query, "\nSELECT %s LIKE %s || '%%'")
+        self.assertIsNone(order)
+
+    def test_to_pyformat_records_reordered_and_repeated_params(self):
+        query, order = sql_loader.to_pyformat("SELECT $2, $1, $2")
+
+        self.assertEqual(query, "SELECT %s, %s, %s")
+        self.assertEqual(order, (1, 0, 1))
+
+    def test_load_pyformat_command_caches_translation(self):
+        with patch.dict(sql_loader._pyformat_cache, clear=True), patch.object(
+            sql_loader, "load_command", return_value="SELECT $1"
+        ) as load:
+            first = sql_loader.load_pyformat_command("cmd")
+            second = sql_loader.load_pyformat_command("cmd")
+
+        self.assertIs(first, second)
+        self.assertEqual(first, ("SELECT %s", None))
+        load.assert_called_once_with("cmd")
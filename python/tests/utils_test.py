@@ -0,0 +1,40 @@
+import asyncio
+import unittest
+
+from bullmq.utils import send_in_chunks
+
+
+class TestSendInChunks(unittest.IsolatedAsyncioTestCase):
+    async def test_results_are_aligned_and_failures_stay_in_their_chunk(self):
+        async def send(chunk):
+            if 3 in chunk:
+                raise ValueError("boom")
+            return [item * 10 for item in chunk]
+
+        results = await send_in_chunks(list(range(6)), 2, 2, send)
+
+        self.assertEqual(results[:2], [0, 10])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertIs(results[2], results[3])
+        self.assertEqual(results[4:], [40, 50])
+
+    async def test_limits_chunks_in_flight(self):
+        inflight = 0
+        peak = 0
+
+        async def send(chunk):
+            nonlocal inflight, peak
+            inflight += 1
+            peak = max(peak, inflight)
+            await asyncio.sleep(0.01)
+            inflight -= 1
+            return chunk
+
+        results = await send_in_chunks(list(range(10)), 1, 3, send)
+
+        self.assertEqual(results, list(range(10)))
+        self.assertEqual(peak, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
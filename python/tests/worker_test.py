@@ -56,6 +56,40 @@ class TestWorker(unittest.IsolatedAsyncioTestCase):
         await worker.close()
         await queue.close()
 
+    async def test_heartbeats_register_the_worker(self):
+        queue = Queue(queueName, {"prefix": prefix, "workerRegistry": True})
+        await queue.add("test-job", {})
+
+        async def process(job: Job, token: str):
+            return "done"
+
+        worker = Worker(queueName, process, {"prefix": prefix, "name": "w1", "heartbeatInterval": 100})
+
+        processing = Future()
+        worker.on("completed", lambda job, result: processing.set_result(None))
+        await processing
+        await asyncio.sleep(0.25)
+
+        workers = await queue.get_workers()
+        self.assertEqual(len(workers), 1)
+        self.assertEqual(workers[0]["id"], worker.id)
+        self.assertEqual(workers[0]["workerName"], "w1")
+        self.assertEqual(workers[0]["completed"], 1)
+
+        await worker.close()
+        self.assertEqual(await queue.backend.getHeartbeats(), [])
+        await queue.close()
+
+    async def test_no_heartbeats_without_a_registry(self):
+        # No connection enabled workerRegistry, so on Postgres the
+        # worker_heartbeat table does not exist.
+        queue = Queue(queueName, {"prefix": prefix})
+        await queue.add("test-job", {})
+
+        self.assertEqual(await queue.backend.getHeartbeats(), [])
+
+        await queue.close()
+
     async def test_manual_process_jobs(self):
         queue = Queue(queueName, {"prefix": prefix})
         data = {"foo": "bar"}
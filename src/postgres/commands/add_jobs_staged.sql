@@ -0,0 +1,70 @@
+-- Move one COPY'd chunk of INDEPENDENT jobs (no parents, no dedup) from the
+-- session's bulk staging table into `job` with one set-based statement,
+-- mirroring add_jobs_bulk: blank ids come from the per-queue sequence, one
+-- job_seq value is reserved per row in input order (negated for LIFO), ON
+-- CONFLICT skips existing and in-chunk duplicate ids, and only inserted jobs
+-- get their 'added' + 'waiting'/'delayed' events and the wakeup NOTIFY.
+-- Params: $1 queue. Returns the number of inserted jobs.
+WITH prepared AS (
+  SELECT ord,
+         COALESCE(NULLIF(id, ''), next_job_id($1)) AS id,
+         name, data, opts, priority, delay_ms, added_at_ms, max_attempts,
+         scheduler_id, lifo
+    FROM bullmq_bulk_stage
+),
+reserved AS (
+  SELECT ord, nextval('job_seq') AS s FROM prepared
+),
+rr AS (SELECT s, row_number() OVER (ORDER BY s) AS rn FROM reserved),
+rp AS (SELECT prepared.*, row_number() OVER (ORDER BY ord) AS rn FROM prepared),
+final AS (
+  SELECT rp.ord, rp.id, rp.name, rp.data, rp.opts, rp.priority, rp.delay_ms,
+         rp.added_at_ms, rp.max_attempts, rp.scheduler_id,
+         CASE WHEN rp.lifo THEN -rr.s ELSE rr.s END AS seq,
+         CASE WHEN rp.delay_ms > 0 THEN 'delayed'::job_state
+              ELSE 'waiting'::job_state END AS state,
+         CASE WHEN rp.delay_ms > 0 THEN rp.added_at_ms + rp.delay_ms
+              ELSE NULL END AS process_at
+    FROM rp JOIN rr ON rp.rn = rr.rn
+),
+ins AS (
+  INSERT INTO job (
+    queue, id, seq, name, state, data, opts, priority, delay_ms, max_attempts,
+    added_at_ms, process_at_ms, scheduler_id, pending_deps
+  )
+  SELECT $1, id, seq, name, state, data, opts, priority, delay_ms, max_attempts,
+         added_at_ms, process_at, scheduler_id, 0
+    FROM final
+   ORDER BY ord
+  ON CONFLICT (queue, id) DO NOTHING
+  RETURNING id, name, state, process_at_ms
+),
+inserted AS (
+  SELECT i.id, i.name, i.state, i.process_at_ms, MIN(f.ord) AS ord
+    FROM ins i
+    JOIN final f USING (id)
+   GROUP BY i.id, i.name, i.state, i.process_at_ms
+),
+events AS (
+  INSERT INTO event (queue, event, data, created_at_ms)
+  SELECT $1, ev, dat, (extract(epoch FROM clock_timestamp()) * 1000)::bigint
+    FROM (
+      SELECT ord * 2 AS o, 'added' AS ev,
+             jsonb_build_object('jobId', id, 'name', name) AS dat
+        FROM inserted
+      UNION ALL
+      SELECT ord * 2 + 1,
+             CASE WHEN state = 'waiting' THEN 'waiting' ELSE 'delayed' END,
+             CASE WHEN state = 'waiting'
+                  THEN jsonb_build_object('jobId', id)
+                  ELSE jsonb_build_object('jobId', id, 'delay', process_at_ms) END
+        FROM inserted
+    ) q
+   ORDER BY o
+),
+wakeup AS (
+  SELECT pg_notify('bullmq_jobs', $1)
+   WHERE EXISTS (SELECT 1 FROM ins)
+)
+SELECT (SELECT count(*) FROM ins)::bigint AS inserted,
+       (SELECT count(*) FROM wakeup)::int AS notified;
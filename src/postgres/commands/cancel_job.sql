@@ -0,0 +1,8 @@
+-- Ask the workers of a queue to cancel an active job (delivered on commit to
+-- every session LISTENing on `bullmq_cancel`). Workers match the queue and job
+-- id themselves; the job row is not touched.
+-- Params: $1 queue, $2 job id, $3 reason (nullable).
+SELECT pg_notify(
+  'bullmq_cancel',
+  json_build_object('queue', $1::text, 'jobId', $2::text, 'reason', $3::text)::text
+);
@@ -0,0 +1,36 @@
+-- Record `count` jobs finished within one minute into the queue/kind metrics
+-- in a single upsert, with the same result as `count` collect_metrics calls
+-- for those jobs. Params: $1 queue, $2 kind ('completed' | 'failed'),
+-- $3 maxDataPoints, $4 finish timestamp of the first of the jobs (epoch ms),
+-- $5 count.
+--
+-- Only the first job of a new minute closes the previous data point, and it
+-- sees the count from before the batch (`m.count` below): the data point is
+-- `m.count - m.prev_count`, preceded by zeros for the minutes skipped since.
+-- A fresh row only establishes the baseline, like the first collect_metrics.
+INSERT INTO metrics AS m (queue, kind, count, prev_ts, prev_count, data)
+VALUES ($1, $2, $5::bigint, $4::bigint, 0, '{}')
+ON CONFLICT (queue, kind) DO UPDATE SET
+  count = m.count + EXCLUDED.count,
+  prev_ts = CASE
+    WHEN m.prev_ts IS NULL
+      OR LEAST($4::bigint / 60000 - m.prev_ts / 60000, $3::integer) > 0
+    THEN $4::bigint
+    ELSE m.prev_ts
+  END,
+  prev_count = CASE
+    WHEN m.prev_ts IS NULL THEN 0
+    WHEN LEAST($4::bigint / 60000 - m.prev_ts / 60000, $3::integer) > 0 THEN m.count
+    ELSE m.prev_count
+  END,
+  data = CASE
+    WHEN m.prev_ts IS NULL
+      OR LEAST($4::bigint / 60000 - m.prev_ts / 60000, $3::integer) <= 0
+    THEN m.data
+    ELSE (
+      array_fill(0::bigint,
+        ARRAY[(LEAST($4::bigint / 60000 - m.prev_ts / 60000, $3::integer) - 1)::int])
+      || ARRAY[m.count - m.prev_count]
+      || m.data
+    )[1 : $3::integer]
+  END;
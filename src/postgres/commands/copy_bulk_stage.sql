@@ -0,0 +1,5 @@
+-- Stream one chunk of jobs into the session's bulk staging table.
+COPY bullmq_bulk_stage (
+  ord, id, name, data, opts, priority, delay_ms, added_at_ms, max_attempts,
+  scheduler_id, lifo
+) FROM STDIN (FORMAT binary);
@@ -0,0 +1,16 @@
+-- Session-local staging table for streamed bulk ingestion (COPY target).
+-- Rows vanish at commit, so each chunk is COPY'd and moved into `job` in one
+-- transaction on the same connection. Run unprepared (utility statement).
+CREATE TEMP TABLE IF NOT EXISTS bullmq_bulk_stage (
+  ord           bigint  NOT NULL,
+  id            text    NOT NULL,
+  name          text    NOT NULL,
+  data          jsonb   NOT NULL,
+  opts          jsonb   NOT NULL,
+  priority      integer NOT NULL,
+  delay_ms      bigint  NOT NULL,
+  added_at_ms   bigint  NOT NULL,
+  max_attempts  integer NOT NULL,
+  scheduler_id  text,
+  lifo          boolean NOT NULL
+) ON COMMIT DELETE ROWS;
@@ -0,0 +1,14 @@
+-- Job counts by state for a queue, summed from the `job_counter` rows that
+-- the Python `jobCounters` storage layout keeps up to date (same columns as
+-- get_counts). Param: $1 queue.
+SELECT
+  COALESCE(SUM(n) FILTER (WHERE state = 'active'), 0)::bigint                    AS active,
+  COALESCE(SUM(n) FILTER (WHERE state = 'completed'), 0)::bigint                 AS completed,
+  COALESCE(SUM(n) FILTER (WHERE state = 'failed'), 0)::bigint                    AS failed,
+  COALESCE(SUM(n) FILTER (WHERE state = 'delayed'), 0)::bigint                   AS delayed,
+  COALESCE(SUM(n) FILTER (WHERE state = 'waiting' AND priority = 0), 0)::bigint  AS waiting,
+  COALESCE(SUM(n) FILTER (WHERE state = 'waiting' AND priority > 0), 0)::bigint  AS prioritized,
+  COALESCE(SUM(n) FILTER (WHERE state = 'waiting-children'), 0)::bigint          AS "waiting-children",
+  (SELECT value FROM meta WHERE queue = $1 AND field = 'paused') AS paused
+FROM job_counter
+WHERE queue = $1;
@@ -0,0 +1,17 @@
+-- Job counts by state for several queues at once, summed from the
+-- `job_counter` rows of the Python `jobCounters` storage layout (same columns
+-- as get_counts_for_queues). Param: $1 queue names (text[]).
+SELECT
+  q.queue,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'active'), 0)::bigint                      AS active,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'completed'), 0)::bigint                   AS completed,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'failed'), 0)::bigint                      AS failed,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'delayed'), 0)::bigint                     AS delayed,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'waiting' AND c.priority = 0), 0)::bigint  AS waiting,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'waiting' AND c.priority > 0), 0)::bigint  AS prioritized,
+  COALESCE(SUM(c.n) FILTER (WHERE c.state = 'waiting-children'), 0)::bigint            AS "waiting-children",
+  (SELECT value FROM meta
+    WHERE meta.queue = q.queue AND field = 'paused')                                   AS paused
+FROM unnest($1::text[]) AS q(queue)
+LEFT JOIN job_counter c ON c.queue = q.queue
+GROUP BY q.queue;
@@ -0,0 +1,11 @@
+-- Waiting-job counts per priority, summed from the `job_counter` rows of the
+-- Python `jobCounters` storage layout (same result as get_counts_per_priority).
+-- Params: $1 queue, $2 priorities (bigint[]).
+SELECT COALESCE(SUM(c.n), 0)::bigint AS cnt
+FROM unnest($2::bigint[]) WITH ORDINALITY AS pr(priority, ord)
+LEFT JOIN job_counter c
+  ON c.queue = $1
+ AND c.state = 'waiting'
+ AND c.priority = pr.priority
+GROUP BY pr.ord
+ORDER BY pr.ord;
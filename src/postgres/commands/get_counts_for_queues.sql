@@ -0,0 +1,16 @@
+-- Job counts by state for several queues at once: one row per queue with the
+-- columns of get_counts plus `queue`. Param: $1 queue names (text[]).
+SELECT
+  q.queue,
+  COUNT(*) FILTER (WHERE j.state = 'active')                     AS active,
+  COUNT(*) FILTER (WHERE j.state = 'completed')                  AS completed,
+  COUNT(*) FILTER (WHERE j.state = 'failed')                     AS failed,
+  COUNT(*) FILTER (WHERE j.state = 'delayed')                    AS delayed,
+  COUNT(*) FILTER (WHERE j.state = 'waiting' AND j.priority = 0) AS waiting,
+  COUNT(*) FILTER (WHERE j.state = 'waiting' AND j.priority > 0) AS prioritized,
+  COUNT(*) FILTER (WHERE j.state = 'waiting-children')           AS "waiting-children",
+  (SELECT value FROM meta
+    WHERE meta.queue = q.queue AND field = 'paused')             AS paused
+FROM unnest($1::text[]) AS q(queue)
+LEFT JOIN job j ON j.queue = q.queue
+GROUP BY q.queue;
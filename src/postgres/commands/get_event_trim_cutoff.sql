@@ -0,0 +1,20 @@
+-- The id at or below which a queue's events fall outside its length
+-- retention: the id `max length` rows back from the newest, since `event.id`
+-- comes from a sequence shared by every queue. Computed once per trim, before
+-- the `trim_events` batches. Params: $1 queue, $2 max length (NULL: the queue's
+-- `opts.maxLenEvents` meta field, else 10000, where a stored 0 disables length
+-- trimming like in publish_event). No row: nothing to trim by length.
+WITH lim AS (
+  SELECT CASE
+           WHEN $2::bigint IS NOT NULL THEN $2::bigint
+           ELSE NULLIF(COALESCE(
+             (SELECT value::bigint FROM meta
+               WHERE queue = $1 AND field = 'opts.maxLenEvents'),
+             10000), 0)
+         END AS max_len
+)
+SELECT id FROM event
+ WHERE queue = $1 AND (SELECT max_len FROM lim) IS NOT NULL
+ ORDER BY id DESC
+OFFSET GREATEST(COALESCE((SELECT max_len FROM lim), 0), 0)
+ LIMIT 1;
@@ -0,0 +1,3 @@
+-- Many jobs' full rows in one round-trip (missing ids are simply absent; the
+-- caller re-aligns the rows with its input). Params: $1 queue, $2 ids (text[]).
+SELECT * FROM job WHERE queue = $1 AND id = ANY($2::text[]);
@@ -1,6 +1,8 @@
 -- Metrics for a queue/kind: the cumulative meta `count` and the per-minute data
 -- points (newest first), sliced to [start, end] with Redis LRANGE semantics
 -- (index 0 is the newest point; a negative end means "to the oldest").
+-- `prev_ts`/`prev_count` are the meta baseline of the newest point and
+-- `points` the number of stored points (the HMGET / LLEN of getMetrics-2.lua).
 -- Params: $1 queue, $2 kind ('completed' | 'failed'), $3 start, $4 end.
 SELECT
   COALESCE((SELECT count FROM metrics
@@ -11,4 +13,10 @@ SELECT
              ELSE data[($3 + 1) : ($4 + 1)]
            END
       FROM metrics WHERE queue = $1 AND kind = $2
-  ), ARRAY[]::bigint[]) AS data;
+  ), ARRAY[]::bigint[]) AS data,
+  COALESCE((SELECT prev_ts FROM metrics
+             WHERE queue = $1 AND kind = $2), 0)::bigint AS prev_ts,
+  COALESCE((SELECT prev_count FROM metrics
+             WHERE queue = $1 AND kind = $2), 0)::bigint AS prev_count,
+  COALESCE((SELECT cardinality(data) FROM metrics
+             WHERE queue = $1 AND kind = $2), 0)::bigint AS points;
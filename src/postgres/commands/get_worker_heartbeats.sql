@@ -0,0 +1,5 @@
+-- The live heartbeat records of a queue's workers, by worker id.
+-- Params: $1 queue, $2 now (epoch ms).
+SELECT info FROM worker_heartbeat
+ WHERE queue = $1 AND expires_at_ms > $2
+ ORDER BY id;
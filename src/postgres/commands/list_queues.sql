@@ -0,0 +1,7 @@
+-- One page of the queue names in the schema (every queue has `meta` rows),
+-- in name order after a keyset cursor, walking the (queue, field) primary key.
+-- Params: $1 last name of the previous page ('' for the first), $2 page size.
+SELECT DISTINCT queue FROM meta
+ WHERE queue > $1
+ ORDER BY queue
+ LIMIT $2;
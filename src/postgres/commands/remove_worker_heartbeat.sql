@@ -0,0 +1,2 @@
+-- Remove a closing worker's heartbeat record. Params: $1 queue, $2 worker id.
+DELETE FROM worker_heartbeat WHERE queue = $1 AND id = $2;
@@ -0,0 +1,18 @@
+-- Delete one bounded batch of a queue's oldest events that fall outside its
+-- retention. Params: $1 queue, $2 id cutoff from get_event_trim_cutoff (events
+-- at or below it go; NULL: no length limit), $3 created_at_ms cutoff (older
+-- events go; NULL: no age limit), $4 batch size.
+--
+-- Only the `$4` oldest rows are visited, in primary-key order, so one call is
+-- O(batch) whatever the table size; the caller repeats while a full batch was
+-- deleted, with the same cutoffs.
+WITH oldest AS (
+  SELECT id, created_at_ms FROM event
+   WHERE queue = $1
+   ORDER BY id
+   LIMIT $4::integer
+)
+DELETE FROM event e
+ USING oldest o
+ WHERE e.queue = $1 AND e.id = o.id
+   AND (o.id <= $2::bigint OR o.created_at_ms < $3::bigint);
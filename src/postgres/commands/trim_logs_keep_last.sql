@@ -0,0 +1,5 @@
+-- Keep only a job's newest logs (run right after add_log, e.g. in the same
+-- pipeline). Params: $1 queue, $2 job_id, $3 keep (count of newest to keep).
+DELETE FROM job_log
+ WHERE queue = $1 AND job_id = $2
+   AND idx <= (SELECT MAX(idx) FROM job_log WHERE queue = $1 AND job_id = $2) - $3;
@@ -0,0 +1,12 @@
+-- Publish (or refresh) a worker's heartbeat record and drop the queue's
+-- expired ones. Needs the Python `workerRegistry` storage layout.
+-- Params: $1 queue, $2 worker id, $3 expiry (epoch ms), $4 info (jsonb),
+-- $5 now (epoch ms).
+WITH expired AS (
+  DELETE FROM worker_heartbeat
+   WHERE queue = $1 AND expires_at_ms <= $5 AND id <> $2
+)
+INSERT INTO worker_heartbeat (queue, id, expires_at_ms, info)
+VALUES ($1, $2, $3, $4::jsonb)
+ON CONFLICT (queue, id) DO UPDATE
+  SET expires_at_ms = EXCLUDED.expires_at_ms, info = EXCLUDED.info;
@@ -1828,16 +1828,27 @@ export class PostgresQueueBackend
     start = 0,
     end = -1,
   ): Promise<[string[], string[], number]> {
-    const { rows } = await this.run<{ total: string; data: string[] }>(
-      'get_metrics',
-      [this.queueName, type, start, end],
-    );
-    const total = rows[0]?.total ?? '0';
-    const data = (rows[0]?.data ?? []).map(String);
-    // [meta, data, count] mirrors getMetrics-1.lua: meta = [count, prevTS,
-    // prevCount] (only the cumulative count is tracked here), data = the sliced
-    // per-minute points, count = number of points returned.
-    return [[total, '0', '0'], data, data.length];
+    const { rows } = await this.run<{
+      total: string;
+      data: string[];
+      prev_ts: string;
+      prev_count: string;
+      points: string;
+    }>('get_metrics', [this.queueName, type, start, end]);
+    const row = rows[0];
+    const data = (row?.data ?? []).map(String);
+    // [meta, data, count] mirrors getMetrics-2.lua: meta = [count, prevTS,
+    // prevCount], data = the sliced per-minute points, count = number of
+    // stored points.
+    return [
+      [
+        String(row?.total ?? '0'),
+        String(row?.prev_ts ?? '0'),
+        String(row?.prev_count ?? '0'),
+      ],
+      data,
+      Number(row?.points ?? data.length),
+    ];
   }
 
   async getClientList(): Promise<string[]> {